@@ -0,0 +1,12 @@
+"""airspeed velocity (asv) benchmarks for GeoCAT-ncomp.
+
+Run the suite against the current checkout with::
+
+    asv run --python=same --quick      # smoke test, one sample each
+    asv continuous master HEAD         # compare a branch against master
+
+Every benchmark class has a ``time_*`` method for wall clock time and a
+``peakmem_*`` method for the peak resident memory of the process, and is
+parametrized over problem size, dtype and the fraction of missing values.
+Inputs come from :mod:`geocat.ncomp.benchmarks.synthetic`.
+"""
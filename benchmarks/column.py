@@ -0,0 +1,56 @@
+import geocat.ncomp
+from geocat.ncomp.benchmarks import synthetic
+
+
+class DpresPlevel:
+    """dpres_plevel for a (time, lat, lon) surface pressure."""
+
+    # name: (ntime, nlat, nlon)
+    sizes = {
+        "scalar": (),
+        "1deg": (12, 181, 360),
+        "0.25deg": (4, 721, 1440),
+    }
+
+    params = (list(sizes), [17, 37], ["float32", "float64"], [0.0, 0.1])
+    param_names = ["size", "nlev", "dtype", "missing_fraction"]
+    timeout = 300
+
+    def setup(self, size, nlev, dtype, missing_fraction):
+        if size == "scalar" and missing_fraction:
+            raise NotImplementedError("a scalar psfc cannot be partly missing")
+        self.plev, self.psfc, self.ptop = synthetic.pressure_inputs(
+            nlev,
+            self.sizes[size],
+            dtype=dtype,
+            missing_fraction=missing_fraction)
+
+    def time_dpres_plevel(self, size, nlev, dtype, missing_fraction):
+        geocat.ncomp.dpres_plevel(self.plev, self.psfc, self.ptop)
+
+    def peakmem_dpres_plevel(self, size, nlev, dtype, missing_fraction):
+        geocat.ncomp.dpres_plevel(self.plev, self.psfc, self.ptop)
+
+
+class MocGlobeAtl:
+    """moc_globe_atl on POP-like ocean grids."""
+
+    # name: (nyaux, kdepth, nlat, nlon)
+    sizes = {
+        "gx3v7": (211, 60, 116, 100),
+        "gx1v6": (395, 60, 384, 320),
+    }
+
+    params = (list(sizes), ["float32", "float64"], [0.0, 0.3])
+    param_names = ["size", "dtype", "missing_fraction"]
+    timeout = 600
+
+    def setup(self, size, dtype, missing_fraction):
+        self.inputs = synthetic.pop_moc_inputs(
+            *self.sizes[size], dtype=dtype, missing_fraction=missing_fraction)
+
+    def time_moc_globe_atl(self, size, dtype, missing_fraction):
+        geocat.ncomp.moc_globe_atl(**self.inputs)
+
+    def peakmem_moc_globe_atl(self, size, dtype, missing_fraction):
+        geocat.ncomp.moc_globe_atl(**self.inputs)
@@ -0,0 +1,107 @@
+import numpy as np
+
+import geocat.ncomp
+from geocat.ncomp.benchmarks import synthetic
+
+# name: (ny, nx) of a 12 km WRF-like domain
+WRF_SIZES = {
+    "100x120": (100, 120),
+    "250x300": (250, 300),
+    "500x600": (500, 600),
+}
+
+
+def _rectilinear_cover(lat2d, lon2d, nlat, nlon):
+    """Returns a rectilinear grid spanning the curvilinear domain."""
+    lat1d = np.linspace(lat2d.min(), lat2d.max(), nlat)
+    lon1d = np.linspace(lon2d.min(), lon2d.max(), nlon)
+    return lat1d, lon1d
+
+
+class Rcm2Rgrid:
+    """rcm2rgrid from a WRF-like grid to a rectilinear grid of equal size."""
+
+    params = (list(WRF_SIZES), ["float32", "float64"], [0.0, 0.1])
+    param_names = ["size", "dtype", "missing_fraction"]
+    timeout = 600
+
+    def setup(self, size, dtype, missing_fraction):
+        ny, nx = WRF_SIZES[size]
+        self.lat2d, self.lon2d = synthetic.curvilinear_grid(ny, nx)
+        self.lat1d, self.lon1d = _rectilinear_cover(self.lat2d, self.lon2d, ny,
+                                                    nx)
+        self.fi = synthetic.rectilinear_field(self.lat2d[:, 0],
+                                              self.lon2d[0, :], (3,),
+                                              dtype=dtype,
+                                              missing_fraction=missing_fraction)
+
+    def time_rcm2rgrid(self, size, dtype, missing_fraction):
+        geocat.ncomp.rcm2rgrid(self.lat2d, self.lon2d, self.fi, self.lat1d,
+                               self.lon1d)
+
+    def peakmem_rcm2rgrid(self, size, dtype, missing_fraction):
+        geocat.ncomp.rcm2rgrid(self.lat2d, self.lon2d, self.fi, self.lat1d,
+                               self.lon1d)
+
+
+class Rgrid2Rcm:
+    """rgrid2rcm from a regional rectilinear grid to a WRF-like grid."""
+
+    params = (list(WRF_SIZES), ["float32", "float64"], [0.0, 0.1])
+    param_names = ["size", "dtype", "missing_fraction"]
+    timeout = 600
+
+    def setup(self, size, dtype, missing_fraction):
+        ny, nx = WRF_SIZES[size]
+        self.lat2d, self.lon2d = synthetic.curvilinear_grid(ny, nx)
+        self.lat1d, self.lon1d = _rectilinear_cover(self.lat2d, self.lon2d, ny,
+                                                    nx)
+        self.fi = synthetic.rectilinear_field(self.lat1d,
+                                              self.lon1d, (3,),
+                                              dtype=dtype,
+                                              missing_fraction=missing_fraction)
+
+    def time_rgrid2rcm(self, size, dtype, missing_fraction):
+        geocat.ncomp.rgrid2rcm(self.lat1d, self.lon1d, self.fi, self.lat2d,
+                               self.lon2d)
+
+    def peakmem_rgrid2rcm(self, size, dtype, missing_fraction):
+        geocat.ncomp.rgrid2rcm(self.lat1d, self.lon1d, self.fi, self.lat2d,
+                               self.lon2d)
+
+
+class Rcm2Points:
+    """rcm2points from a 250x300 WRF-like grid to scattered stations."""
+
+    params = ([1000, 10000, 100000], [0, 2], ["float32", "float64"], [0.0, 0.1])
+    param_names = ["npts", "opt", "dtype", "missing_fraction"]
+    timeout = 600
+
+    def setup(self, npts, opt, dtype, missing_fraction):
+        self.lat2d, self.lon2d = synthetic.curvilinear_grid(250, 300)
+        self.fi = synthetic.rectilinear_field(self.lat2d[:, 0],
+                                              self.lon2d[0, :], (3,),
+                                              dtype=dtype,
+                                              missing_fraction=missing_fraction)
+        # keep the stations inside the domain
+        self.lat1d, self.lon1d = synthetic.scattered_points(
+            npts,
+            lat_bounds=(self.lat2d[:, 150].min() + 1,
+                        self.lat2d[:, 150].max() - 1),
+            lon_bounds=(self.lon2d[125].min() + 1, self.lon2d[125].max() - 1))
+
+    def time_rcm2points(self, npts, opt, dtype, missing_fraction):
+        geocat.ncomp.rcm2points(self.lat2d,
+                                self.lon2d,
+                                self.fi,
+                                self.lat1d,
+                                self.lon1d,
+                                opt=opt)
+
+    def peakmem_rcm2points(self, npts, opt, dtype, missing_fraction):
+        geocat.ncomp.rcm2points(self.lat2d,
+                                self.lon2d,
+                                self.fi,
+                                self.lat1d,
+                                self.lon1d,
+                                opt=opt)
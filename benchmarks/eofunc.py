@@ -0,0 +1,48 @@
+import geocat.ncomp
+from geocat.ncomp.benchmarks import synthetic
+
+# name: (nlat, nlon, ntime)
+SIZES = {
+    "small": (36, 72, 120),
+    "medium": (73, 144, 480),
+    "large": (91, 180, 1200),
+}
+
+
+class Eofunc:
+    """eofunc of monthly anomalies."""
+
+    params = (list(SIZES), ["float32", "float64"], [0.0, 0.1])
+    param_names = ["size", "dtype", "missing_fraction"]
+    timeout = 600
+
+    def setup(self, size, dtype, missing_fraction):
+        self.data = synthetic.eof_inputs(*SIZES[size],
+                                         dtype=dtype,
+                                         missing_fraction=missing_fraction)
+
+    def time_eofunc(self, size, dtype, missing_fraction):
+        geocat.ncomp.eofunc(self.data, 3)
+
+    def peakmem_eofunc(self, size, dtype, missing_fraction):
+        geocat.ncomp.eofunc(self.data, 3)
+
+
+class EofuncTs:
+    """eofunc_ts of monthly anomalies onto precomputed EOFs."""
+
+    params = (list(SIZES), ["float32", "float64"], [0.0, 0.1])
+    param_names = ["size", "dtype", "missing_fraction"]
+    timeout = 600
+
+    def setup(self, size, dtype, missing_fraction):
+        self.data = synthetic.eof_inputs(*SIZES[size],
+                                         dtype=dtype,
+                                         missing_fraction=missing_fraction)
+        self.evec = geocat.ncomp.eofunc(self.data, 3).data
+
+    def time_eofunc_ts(self, size, dtype, missing_fraction):
+        geocat.ncomp.eofunc_ts(self.data, self.evec)
+
+    def peakmem_eofunc_ts(self, size, dtype, missing_fraction):
+        geocat.ncomp.eofunc_ts(self.data, self.evec)
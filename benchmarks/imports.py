@@ -0,0 +1,16 @@
+class Import:
+    """Import time of the package, each measured in a fresh interpreter."""
+
+    timeout = 120
+
+    def timeraw_import_package(self):
+        return "import geocat.ncomp"
+
+    def timeraw_import_eofunc(self):
+        return "from geocat.ncomp import eofunc"
+
+    def timeraw_import_linint2(self):
+        return "from geocat.ncomp import linint2"
+
+    def timeraw_import_all(self):
+        return "from geocat.ncomp import *"
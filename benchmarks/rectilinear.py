@@ -0,0 +1,111 @@
+import xarray as xr
+
+import geocat.ncomp
+from geocat.ncomp.benchmarks import synthetic
+
+
+class Linint2:
+    """linint2 from a global grid to a grid of twice the resolution."""
+
+    # name: (leading dims, input nlat, input nlon)
+    sizes = {
+        "2deg": ((12,), 91, 180),
+        "1deg": ((12, 4), 181, 360),
+        "0.25deg": ((4,), 721, 1440),
+    }
+
+    params = (list(sizes), ["float32", "float64"], [0.0, 0.01, 0.1])
+    param_names = ["size", "dtype", "missing_fraction"]
+    timeout = 300
+
+    def setup(self, size, dtype, missing_fraction):
+        leading, nlat, nlon = self.sizes[size]
+        self.yi, self.xi = synthetic.rectilinear_grid(nlat, nlon)
+        self.yo, self.xo = synthetic.rectilinear_grid(2 * nlat - 1, 2 * nlon)
+        self.fi = synthetic.rectilinear_field(self.yi,
+                                              self.xi,
+                                              leading,
+                                              dtype=dtype,
+                                              missing_fraction=missing_fraction)
+
+    def time_linint2(self, size, dtype, missing_fraction):
+        geocat.ncomp.linint2(self.fi,
+                             self.xo,
+                             self.yo,
+                             1,
+                             xi=self.xi,
+                             yi=self.yi)
+
+    def peakmem_linint2(self, size, dtype, missing_fraction):
+        geocat.ncomp.linint2(self.fi,
+                             self.xo,
+                             self.yo,
+                             1,
+                             xi=self.xi,
+                             yi=self.yi)
+
+
+class Linint2Dask:
+    """linint2 on a dask array chunked along the leftmost dimension."""
+
+    params = ([1, 4, 12], [0.0, 0.1])
+    param_names = ["leftmost_chunk", "missing_fraction"]
+    timeout = 300
+
+    def setup(self, leftmost_chunk, missing_fraction):
+        yi, xi = synthetic.rectilinear_grid(181, 360)
+        self.yo, self.xo = synthetic.rectilinear_grid(361, 720)
+        fi = synthetic.rectilinear_field(yi,
+                                         xi, (12, 4),
+                                         missing_fraction=missing_fraction)
+        self.fi = xr.DataArray(fi,
+                               dims=["time", "level", "lat", "lon"],
+                               coords={
+                                   "lat": yi,
+                                   "lon": xi
+                               }).chunk({
+                                   "time": leftmost_chunk,
+                                   "level": 4,
+                                   "lat": 181,
+                                   "lon": 360
+                               })
+
+    def time_linint2_dask(self, leftmost_chunk, missing_fraction):
+        geocat.ncomp.linint2(self.fi, self.xo, self.yo, 1).compute()
+
+    def peakmem_linint2_dask(self, leftmost_chunk, missing_fraction):
+        geocat.ncomp.linint2(self.fi, self.xo, self.yo, 1).compute()
+
+
+class Linint2Points:
+    """linint2_points from a 0.5 degree global grid to scattered stations."""
+
+    params = ([1000, 100000, 1000000], ["float32", "float64"], [0.0, 0.1])
+    param_names = ["npts", "dtype", "missing_fraction"]
+    timeout = 300
+
+    def setup(self, npts, dtype, missing_fraction):
+        self.yi, self.xi = synthetic.rectilinear_grid(361, 720)
+        self.fi = synthetic.rectilinear_field(self.yi,
+                                              self.xi, (4,),
+                                              dtype=dtype,
+                                              missing_fraction=missing_fraction)
+        self.yo, self.xo = synthetic.scattered_points(npts,
+                                                      lat_bounds=(-89.5, 89.5),
+                                                      lon_bounds=(0.0, 359.0))
+
+    def time_linint2_points(self, npts, dtype, missing_fraction):
+        geocat.ncomp.linint2_points(self.fi,
+                                    self.xo,
+                                    self.yo,
+                                    0,
+                                    xi=self.xi,
+                                    yi=self.yi)
+
+    def peakmem_linint2_points(self, npts, dtype, missing_fraction):
+        geocat.ncomp.linint2_points(self.fi,
+                                    self.xo,
+                                    self.yo,
+                                    0,
+                                    xi=self.xi,
+                                    yi=self.yi)
@@ -0,0 +1,67 @@
+import numpy as np
+
+import geocat.ncomp
+from geocat.ncomp.benchmarks import synthetic
+
+
+class Triple2Grid:
+    """triple2grid of scattered observations onto a 1 degree grid."""
+
+    params = ([1000, 10000, 100000], [0, 1], ["float32", "float64"], [0.0, 0.1])
+    param_names = ["npts", "method", "dtype", "missing_fraction"]
+    timeout = 300
+
+    def setup(self, npts, method, dtype, missing_fraction):
+        self.y, self.x = synthetic.scattered_points(npts,
+                                                    lat_bounds=(-89.0, 89.0),
+                                                    lon_bounds=(0.0, 359.0))
+        self.ygrid, self.xgrid = synthetic.rectilinear_grid(181, 360)
+        values = np.cos(np.deg2rad(self.y)) * np.sin(np.deg2rad(self.x))
+        self.data = synthetic.add_missing(
+            values.reshape((1, npts)).astype(dtype), missing_fraction)
+
+    def time_triple2grid(self, npts, method, dtype, missing_fraction):
+        geocat.ncomp.triple2grid(self.x,
+                                 self.y,
+                                 self.data,
+                                 self.xgrid,
+                                 self.ygrid,
+                                 method=method)
+
+    def peakmem_triple2grid(self, npts, method, dtype, missing_fraction):
+        geocat.ncomp.triple2grid(self.x,
+                                 self.y,
+                                 self.data,
+                                 self.xgrid,
+                                 self.ygrid,
+                                 method=method)
+
+
+class Grid2Triple:
+    """grid2triple of a global grid."""
+
+    # name: (nlat, nlon)
+    sizes = {
+        "1deg": (181, 360),
+        "0.25deg": (721, 1440),
+        "0.1deg": (1801, 3600),
+    }
+
+    params = (list(sizes), ["float32", "float64"], [0.0, 0.1, 0.5])
+    param_names = ["size", "dtype", "missing_fraction"]
+    timeout = 300
+
+    def setup(self, size, dtype, missing_fraction):
+        self.y, self.x = synthetic.rectilinear_grid(*self.sizes[size])
+        self.x = self.x.astype(dtype)
+        self.y = self.y.astype(dtype)
+        self.z = synthetic.rectilinear_field(self.y,
+                                             self.x,
+                                             dtype=dtype,
+                                             missing_fraction=missing_fraction)
+
+    def time_grid2triple(self, size, dtype, missing_fraction):
+        geocat.ncomp.grid2triple(self.x, self.y, self.z)
+
+    def peakmem_grid2triple(self, size, dtype, missing_fraction):
+        geocat.ncomp.grid2triple(self.x, self.y, self.z)
@@ -36,11 +36,12 @@ setup(
     package_dir={
         '': 'src',
         'geocat': 'src/geocat',
-        'geocat.ncomp': 'src/geocat/ncomp'
+        'geocat.ncomp': 'src/geocat/ncomp',
+        'geocat.ncomp.benchmarks': 'src/geocat/ncomp/benchmarks'
     },
     package_data={'geocat': ['__init__.pxd', 'ncomp/*.pxd']},
     namespace_packages=['geocat'],
-    packages=["geocat", "geocat.ncomp"],
+    packages=["geocat", "geocat.ncomp", "geocat.ncomp.benchmarks"],
     version=__version__,
     install_requires=[
         'numpy',
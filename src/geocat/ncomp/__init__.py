@@ -1,16 +1,91 @@
-from . import _ncomp
-# The following imports allow for the function name to be used directly under the package namespace, skipping the module name.
+import builtins
+import importlib
+import sys
+import types
+
+# The following names allow for the functions to be used directly under the package namespace, skipping the module name.
 # This is done to maintain backwards compatibily from when the functions were defined in geocat/ncomp/__init__.py
-from .dpres_plevel import dpres_plevel
-from .eofunc import (eofunc, eofunc_ts)
+# The modules (and with them xarray, dask and the compiled _ncomp extension) are only imported on first access.
 from .errors import (Error, AttributeError, ChunkError, CoordinateError,
-                     DimensionError, MetaError)
-from .grid2triple import grid2triple
-from .linint2 import linint2
-from .linint2points import linint2_points
-from .moc_globe_alt import moc_globe_atl
-from .rcm2points import rcm2points
-from .rcm2rgrid import rcm2rgrid
-from .rgrid2rcm import rgrid2rcm
-from .triple2grid import triple2grid
+                     DimensionError, MetaError, NcompError, NcompWarning)
 from .version import __version__
+
+# public name: module that defines it
+_lazy_attributes = {
+    "CurvilinearGrid": ".grids",
+    "PointSet": ".grids",
+    "RectilinearGrid": ".grids",
+    "StationInterpolator": ".stations",
+    "available_engines": ".engine",
+    "dpres_plevel": ".dpres_plevel",
+    "eofunc": ".eofunc",
+    "eofunc_ts": ".eofunc",
+    "get_default_engine": ".engine",
+    "grid2triple": ".grid2triple",
+    "linint2": ".linint2",
+    "linint2_dataset": ".dataset",
+    "linint2_multi": ".linint2",
+    "linint2_points": ".linint2points",
+    "linint2_points_trajectory": ".trajectory",
+    "linint2_pyramid": ".linint2",
+    "moc_globe_atl": ".moc_globe_alt",
+    "rcm2points": ".rcm2points",
+    "rcm2points_trajectory": ".trajectory",
+    "rcm2rgrid": ".rcm2rgrid",
+    "rcm2rgrid_dataset": ".dataset",
+    "register_engine": ".engine",
+    "rgrid2rcm": ".rgrid2rcm",
+    "rgrid2rcm_dataset": ".dataset",
+    "set_default_engine": ".engine",
+    "triple2grid": ".triple2grid",
+}
+
+__all__ = sorted(
+    list(_lazy_attributes) + [
+        "Error", "AttributeError", "ChunkError", "CoordinateError",
+        "DimensionError", "MetaError", "NcompError", "NcompWarning",
+        "__version__"
+    ])
+
+
+class _Package(types.ModuleType):
+    """The type of this package, keeping its public functions bound.
+
+    Importing a submodule sets it as an attribute of the package, which for
+    the submodules named like their function, e.g. .linint2, would replace
+    the function. The function of such a submodule is bound instead.
+    """
+
+    def __setattr__(self, name, value):
+        if (isinstance(value, types.ModuleType) and
+                _lazy_attributes.get(name) == "." + name):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
+
+
+def __getattr__(name):
+    if name == "_ncomp":
+        return importlib.import_module("._ncomp", __name__)
+    try:
+        module_name = _lazy_attributes[name]
+    except KeyError:
+        # the package's own AttributeError shadows the builtin one here
+        raise builtins.AttributeError("module '{}' has no attribute "
+                                      "'{}'".format(__name__, name)) from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes) | {"_ncomp"})
+
+
+if sys.version_info < (3, 7):
+    # module level __getattr__ (PEP 562) is not available, import eagerly
+    for _name in _lazy_attributes:
+        __getattr__(_name)
+    from . import _ncomp
@@ -0,0 +1,111 @@
+"""Spherical and quadrilateral geometry shared by the NumPy interpolators."""
+
+import numpy as np
+
+
+def unit_vectors(lat, lon):
+    """Cartesian unit vectors, stacked on a new last axis, of points given by
+    their latitudes and longitudes in degrees."""
+    lat = np.deg2rad(lat)
+    lon = np.deg2rad(lon)
+    return np.stack(
+        (np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)),
+        axis=-1)
+
+
+def wrap_longitude(dlon):
+    """Wraps longitude differences to [-180, 180)."""
+    return (dlon + 180.0) % 360.0 - 180.0
+
+
+def inverse_bilinear(p00, p10, p01, p11, q, iterations=8):
+    """Solves p00 + u a + v b + u v c = q for the local coordinates (u, v)
+    of q in the quadrilaterals with the given corners (arrays of (x, y)),
+    with a = p10 - p00, b = p01 - p00 and c = p11 - p10 - p01 + p00."""
+    a = p10 - p00
+    b = p01 - p00
+    c = p11 - p10 - p01 + p00
+    r0 = q - p00
+    u = np.full(q.shape[:-1], 0.5)
+    v = np.full(q.shape[:-1], 0.5)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(iterations):
+            rx = u * a[..., 0] + v * b[..., 0] + u * v * c[..., 0] - r0[..., 0]
+            ry = u * a[..., 1] + v * b[..., 1] + u * v * c[..., 1] - r0[..., 1]
+            j00 = a[..., 0] + v * c[..., 0]
+            j01 = b[..., 0] + u * c[..., 0]
+            j10 = a[..., 1] + v * c[..., 1]
+            j11 = b[..., 1] + u * c[..., 1]
+            det = j00 * j11 - j01 * j10
+            u = u - (j11 * rx - j01 * ry) / det
+            v = v - (j00 * ry - j10 * rx) / det
+    return u, v
+
+
+def quad_coordinates(lat_nodes, lon_nodes, lat, lon):
+    """Local coordinates (u, v) of the points (`lat`, `lon`) in the
+    quadrilaterals whose corners, in the order (0, 0), (1, 0), (0, 1) and
+    (1, 1), are on the last axis of `lat_nodes` and `lon_nodes`.
+
+    Longitudes are unwrapped around the first corner, so the quadrilaterals
+    and points may use different longitude conventions.
+    """
+
+    def local(k):
+        return np.stack((wrap_longitude(lon_nodes[..., k] - lon_nodes[..., 0]),
+                         lat_nodes[..., k] - lat_nodes[..., 0]),
+                        axis=-1)
+
+    q = np.stack(
+        (wrap_longitude(lon - lon_nodes[..., 0]), lat - lat_nodes[..., 0]),
+        axis=-1)
+    return inverse_bilinear(local(0), local(1), local(2), local(3), q)
+
+
+def inside_quad(u, v, tol=1e-9):
+    return (u >= -tol) & (u <= 1 + tol) & (v >= -tol) & (v <= 1 + tol)
+
+
+def bilinear_weights(u, v):
+    """Weights of the corners (0, 0), (1, 0), (0, 1) and (1, 1)."""
+    u = np.clip(u, 0.0, 1.0)
+    v = np.clip(v, 0.0, 1.0)
+    return np.stack(((1 - u) * (1 - v), u * (1 - v), (1 - u) * v, u * v),
+                    axis=-1)
+
+
+def idw_weights(lat_nodes, lon_nodes, lat, lon):
+    """Inverse squared great circle distance weights of the nodes on the last
+    axis of `lat_nodes` and `lon_nodes` for the points (`lat`, `lon`).
+
+    A node at the location of its point gets a weight large enough to make
+    the interpolated value that of the node, unless it is missing.
+    """
+    dots = np.einsum("...k,...nk->...n", unit_vectors(lat, lon),
+                     unit_vectors(lat_nodes, lon_nodes))
+    dist = np.maximum(np.arccos(np.clip(dots, -1.0, 1.0)), 1e-12)
+    return 1.0 / dist**2
+
+
+def apply_weights(fi, nodes, weights, msg=None):
+    """Combines the values of `fi` at the flat grid indices `nodes` (of shape
+    (npoints, ncorners)) with `weights`, renormalized over the non-missing
+    values, for every leftmost index of `fi`.
+
+    Returns an array of shape fi.shape[:-2] + (npoints,), missing (NaN) where
+    the points have no valid weighted value.
+    """
+    flat = fi.reshape(fi.shape[:-2] + (-1,))
+    total = np.zeros(fi.shape[:-2] + (nodes.shape[0],))
+    wsum = np.zeros(fi.shape[:-2] + (nodes.shape[0],))
+    # one corner at a time, so that memory stays proportional to the output
+    for k in range(nodes.shape[1]):
+        values = flat[..., nodes[:, k]].astype(np.float64)
+        if msg is not None and not np.isnan(msg):
+            values[values == msg] = np.nan
+        valid = ~np.isnan(values)
+        w = np.where(valid, weights[:, k], 0.0)
+        total += np.where(valid, values, 0.0) * w
+        wsum += w
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(wsum > 0, total / wsum, np.nan)
@@ -11,11 +11,7 @@ cimport numpy as np
 import functools
 import warnings
 
-class NcompWarning(Warning):
-    pass
-
-class NcompError(Exception):
-    pass
+from .errors import NcompError, NcompWarning
 
 def carrayify(f):
     """
@@ -284,6 +280,37 @@ def _linint2(np.ndarray xi_np, np.ndarray yi_np, np.ndarray fi_np, np.ndarray xo
 
     """
 
+    missing_inds_fi = None
+
+    if msg is None or np.isnan(msg): # if no missing value specified, assume NaNs
+        missing_inds_fi = np.isnan(fi_np)
+        msg = get_default_fill(fi_np)
+    else:
+        missing_inds_fi = (fi_np == msg)
+
+    has_missing = missing_inds_fi.any()
+    if has_missing:
+        fi_np[missing_inds_fi] = msg
+
+    try:
+        return _linint2_call(xi_np, yi_np, fi_np, xo_np, yo_np, icycx, msg, has_missing)
+    finally:
+        if has_missing:
+            fi_np[missing_inds_fi] = np.nan
+
+@carrayify
+def _linint2_filled(np.ndarray xi_np, np.ndarray yi_np, np.ndarray fi_np, np.ndarray xo_np, np.ndarray yo_np, int icycx, msg):
+    """_linint2_filled(xi, yi, fi, xo, yo, icycx, msg)
+
+    :func:`_linint2` for an fi whose missing values are already set to
+    `msg`, which must not be NaN, e.g. an fi prepared once for several
+    target grids. fi is neither scanned for missing values nor modified, so
+    concurrent calls can share it.
+    """
+    return _linint2_call(xi_np, yi_np, fi_np, xo_np, yo_np, icycx, msg, True)
+
+cdef _linint2_call(np.ndarray xi_np, np.ndarray yi_np, np.ndarray fi_np, np.ndarray xo_np, np.ndarray yo_np, int icycx, msg, has_missing):
+    # calls libncomp.linint2 on fi_np, whose missing values are msg
     xi = Array.from_np(xi_np)
     yi = Array.from_np(yi_np)
     fi = Array.from_np(fi_np)
@@ -298,19 +325,9 @@ def _linint2(np.ndarray xi_np, np.ndarray yi_np, np.ndarray fi_np, np.ndarray xo
         fo_dtype = np.float32
     cdef np.ndarray fo_np = np.zeros(tuple([fi.shape[i] for i in range(fi.ndim - 2)] + [yo.shape[0], xo.shape[0]]), dtype=fo_dtype)
 
-    missing_inds_fi = None
-
-    if msg is None or np.isnan(msg): # if no missing value specified, assume NaNs
-        missing_inds_fi = np.isnan(fi.numpy)
-        msg = get_default_fill(fi.numpy)
-    else:
-        missing_inds_fi = (fi.numpy == msg)
-
     set_ncomp_msg(&(fi.ncomp.msg), msg) # always set missing on fi.ncomp
-
-    if missing_inds_fi.any():
+    if has_missing:
         fi.ncomp.has_missing = 1
-        fi.numpy[missing_inds_fi] = msg
 
     fo = Array.from_np(fo_np)
 
@@ -327,9 +344,6 @@ def _linint2(np.ndarray xi_np, np.ndarray yi_np, np.ndarray fi_np, np.ndarray xo
         warnings.warn("linint2: {}: xi, yi, xo, and yo must be monotonically increasing".format(ier),
                       NcompWarning)
 
-    if missing_inds_fi is not None and missing_inds_fi.any():
-        fi.numpy[missing_inds_fi] = np.nan
-
     if fo.type == libncomp.NCOMP_DOUBLE:
         fo_msg = fo.ncomp.msg.msg_double
     else:
@@ -463,26 +477,33 @@ def _eofunc(np.ndarray np_input, int neval, opt={}, **kwargs):
     # allocate output ncomp_array and ncomp_attributes
     cdef libncomp.ncomp_array* ncomp_output = NULL
     cdef libncomp.ncomp_attributes attrs_output
+    attrs_output.nAttribute = 0
+    attrs_output.attribute_array = NULL
 
     cdef int ier
-    with nogil:
-        ier = libncomp.eofunc(input.ncomp, neval, attrs, &ncomp_output, &attrs_output)
+    try:
+        with nogil:
+            ier = libncomp.eofunc(input.ncomp, neval, attrs, &ncomp_output, &attrs_output)
 
-    if ier != 0:
-        raise NcompError(f"An error occurred while calling libncomp.eofunc with error code: {ier}")
+        if ier != 0:
+            raise NcompError(f"An error occurred while calling libncomp.eofunc with error code: {ier}")
 
-    # convert ncomp_output to np.ndarray
-    output = Array.from_ncomp(ncomp_output)
+        # convert ncomp_output to np.ndarray
+        output = Array.from_ncomp(ncomp_output)
 
-    # making sure that output missing values is NaN
-    output_missing_value = output.ncomp.msg.msg_double \
-            if output.ncomp.type == libncomp.NCOMP_DOUBLE \
-            else output.ncomp.msg.msg_float
+        # making sure that output missing values is NaN
+        output_missing_value = output.ncomp.msg.msg_double \
+                if output.ncomp.type == libncomp.NCOMP_DOUBLE \
+                else output.ncomp.msg.msg_float
 
-    output.numpy[output.numpy == output_missing_value] = np.nan
+        output.numpy[output.numpy == output_missing_value] = np.nan
 
-    # convert attrs_output to dict
-    np_attrs_dict = ncomp_attributes_to_dict(attrs_output)
+        # convert attrs_output to dict; the attribute data now belongs to numpy
+        np_attrs_dict = ncomp_attributes_to_dict(attrs_output)
+    finally:
+        # both attribute structs are freed also when libncomp fails
+        free_ncomp_attributes(attrs)
+        free_ncomp_attribute_array(&attrs_output)
 
     # Reversing the changed values
     reverse_missing_values_adjustments(input.numpy, missing_mask, kwargs)
@@ -501,26 +522,33 @@ def _eofunc_n(np.ndarray np_input, int neval, int t_dim, opt={}, **kwargs):
     # allocate output ncomp_array and ncomp_attributes
     cdef libncomp.ncomp_array* ncomp_output = NULL
     cdef libncomp.ncomp_attributes attrs_output
+    attrs_output.nAttribute = 0
+    attrs_output.attribute_array = NULL
 
     cdef int ier
-    with nogil:
-        ier = libncomp.eofunc_n(input.ncomp, neval, t_dim, attrs, &ncomp_output, &attrs_output)
+    try:
+        with nogil:
+            ier = libncomp.eofunc_n(input.ncomp, neval, t_dim, attrs, &ncomp_output, &attrs_output)
 
-    if ier != 0:
-        raise NcompError(f"An error occurred while calling libncomp.eofunc_n with error code: {ier}")
+        if ier != 0:
+            raise NcompError(f"An error occurred while calling libncomp.eofunc_n with error code: {ier}")
 
-    # convert ncomp_output to np.ndarray
-    output = Array.from_ncomp(ncomp_output)
+        # convert ncomp_output to np.ndarray
+        output = Array.from_ncomp(ncomp_output)
 
-    # making sure that output missing values is NaN
-    output_missing_value = output.ncomp.msg.msg_double \
-            if output.ncomp.type == libncomp.NCOMP_DOUBLE \
-            else output.ncomp.msg.msg_float
+        # making sure that output missing values is NaN
+        output_missing_value = output.ncomp.msg.msg_double \
+                if output.ncomp.type == libncomp.NCOMP_DOUBLE \
+                else output.ncomp.msg.msg_float
 
-    output.numpy[output.numpy == output_missing_value] = np.nan
+        output.numpy[output.numpy == output_missing_value] = np.nan
 
-    # convert attrs_output to dict
-    np_attrs_dict = ncomp_attributes_to_dict(attrs_output)
+        # convert attrs_output to dict; the attribute data now belongs to numpy
+        np_attrs_dict = ncomp_attributes_to_dict(attrs_output)
+    finally:
+        # both attribute structs are freed also when libncomp fails
+        free_ncomp_attributes(attrs)
+        free_ncomp_attribute_array(&attrs_output)
 
     # Reversing the changed values
     reverse_missing_values_adjustments(input.numpy, missing_mask, kwargs)
@@ -540,26 +568,33 @@ def _eofunc_ts(np.ndarray np_data, np.ndarray  np_evec, opt={}, **kwargs):
     # allocate output ncomp_array and ncomp_attributes
     cdef libncomp.ncomp_array* ncomp_output = NULL
     cdef libncomp.ncomp_attributes attrs_output
+    attrs_output.nAttribute = 0
+    attrs_output.attribute_array = NULL
 
     cdef int ier
-    with nogil:
-        ier = libncomp.eofunc_ts(data.ncomp, evec.ncomp, attrs, &ncomp_output, &attrs_output)
+    try:
+        with nogil:
+            ier = libncomp.eofunc_ts(data.ncomp, evec.ncomp, attrs, &ncomp_output, &attrs_output)
 
-    if ier != 0:
-        raise NcompError(f"An error occurred while calling libncomp.eofunc_ts with error code: {ier}")
+        if ier != 0:
+            raise NcompError(f"An error occurred while calling libncomp.eofunc_ts with error code: {ier}")
 
-    # convert ncomp_output to np.ndarray
-    output = Array.from_ncomp(ncomp_output)
+        # convert ncomp_output to np.ndarray
+        output = Array.from_ncomp(ncomp_output)
 
-    # making sure that output missing values is NaN
-    output_missing_value = output.ncomp.msg.msg_double \
-            if output.ncomp.type == libncomp.NCOMP_DOUBLE \
-            else output.ncomp.msg.msg_float
+        # making sure that output missing values is NaN
+        output_missing_value = output.ncomp.msg.msg_double \
+                if output.ncomp.type == libncomp.NCOMP_DOUBLE \
+                else output.ncomp.msg.msg_float
 
-    output.numpy[output.numpy == output_missing_value] = np.nan
+        output.numpy[output.numpy == output_missing_value] = np.nan
 
-    # convert attrs_output to dict
-    np_attrs_dict = ncomp_attributes_to_dict(attrs_output)
+        # convert attrs_output to dict; the attribute data now belongs to numpy
+        np_attrs_dict = ncomp_attributes_to_dict(attrs_output)
+    finally:
+        # both attribute structs are freed also when libncomp fails
+        free_ncomp_attributes(attrs)
+        free_ncomp_attribute_array(&attrs_output)
 
     # Reversing the changed values
     reverse_missing_values_adjustments(data.numpy, missing_mask_data, kwargs)
@@ -580,26 +615,33 @@ def _eofunc_ts_n(np.ndarray np_data, np.ndarray  np_evec, int t_dim, opt={}, **k
     # allocate output ncomp_array and ncomp_attributes
     cdef libncomp.ncomp_array* ncomp_output = NULL
     cdef libncomp.ncomp_attributes attrs_output
+    attrs_output.nAttribute = 0
+    attrs_output.attribute_array = NULL
 
     cdef int ier
-    with nogil:
-        ier = libncomp.eofunc_ts_n(data.ncomp, evec.ncomp, attrs, t_dim, &ncomp_output, &attrs_output)
+    try:
+        with nogil:
+            ier = libncomp.eofunc_ts_n(data.ncomp, evec.ncomp, attrs, t_dim, &ncomp_output, &attrs_output)
 
-    if ier != 0:
-        raise NcompError(f"An error occurred while calling libncomp.eofunc_ts_n with error code: {ier}")
+        if ier != 0:
+            raise NcompError(f"An error occurred while calling libncomp.eofunc_ts_n with error code: {ier}")
 
-    # convert ncomp_output to np.ndarray
-    output = Array.from_ncomp(ncomp_output)
+        # convert ncomp_output to np.ndarray
+        output = Array.from_ncomp(ncomp_output)
 
-    # making sure that output missing values is NaN
-    output_missing_value = output.ncomp.msg.msg_double \
-            if output.ncomp.type == libncomp.NCOMP_DOUBLE \
-            else output.ncomp.msg.msg_float
+        # making sure that output missing values is NaN
+        output_missing_value = output.ncomp.msg.msg_double \
+                if output.ncomp.type == libncomp.NCOMP_DOUBLE \
+                else output.ncomp.msg.msg_float
 
-    output.numpy[output.numpy == output_missing_value] = np.nan
+        output.numpy[output.numpy == output_missing_value] = np.nan
 
-    # convert attrs_output to dict
-    np_attrs_dict = ncomp_attributes_to_dict(attrs_output)
+        # convert attrs_output to dict; the attribute data now belongs to numpy
+        np_attrs_dict = ncomp_attributes_to_dict(attrs_output)
+    finally:
+        # both attribute structs are freed also when libncomp fails
+        free_ncomp_attributes(attrs)
+        free_ncomp_attribute_array(&attrs_output)
 
     # Reversing the changed values
     reverse_missing_values_adjustments(data.numpy, missing_mask_data, kwargs)
@@ -618,9 +660,17 @@ cdef libncomp.ncomp_single_attribute* np_to_ncomp_single_attribute(char* name, n
 cdef libncomp.ncomp_attributes* dict_to_ncomp_attributes(d):
     nAttribute = len(d)
     cdef libncomp.ncomp_attributes* out_attrs = libncomp.ncomp_attributes_allocate(nAttribute)
-    for i, k in enumerate(d):
-        v = d[k]
-        out_attrs.attribute_array[i] = np_to_ncomp_single_attribute(k, v)
+    cdef int filled = 0
+    try:
+        for i, k in enumerate(d):
+            v = d[k]
+            out_attrs.attribute_array[i] = np_to_ncomp_single_attribute(k, v)
+            filled += 1
+    except:
+        # only the attributes created so far are valid
+        out_attrs.nAttribute = filled
+        free_ncomp_attributes(out_attrs)
+        raise
     return out_attrs
 
 cdef ncomp_attributes_to_dict(libncomp.ncomp_attributes attrs):
@@ -631,6 +681,30 @@ cdef ncomp_attributes_to_dict(libncomp.ncomp_attributes attrs):
         d[attr.name] = ncomp_to_np_array(attr.value)
     return d
 
+cdef void free_ncomp_attribute_array(libncomp.ncomp_attributes* attrs):
+    # Frees the single attribute structs of attrs and the ncomp_array structs
+    # wrapping their values, but not the values' data, which is either
+    # borrowed from the numpy arrays of an opt dict or owned by the numpy
+    # arrays returned by ncomp_attributes_to_dict. Names are not freed either:
+    # they point into Python bytes objects or libncomp string literals.
+    cdef int i
+    if attrs.attribute_array is NULL:
+        return
+    for i in range(attrs.nAttribute):
+        if attrs.attribute_array[i] is not NULL:
+            if attrs.attribute_array[i].value is not NULL:
+                libncomp.ncomp_array_free(attrs.attribute_array[i].value, 1)
+            free(attrs.attribute_array[i])
+    free(attrs.attribute_array)
+    attrs.attribute_array = NULL
+    attrs.nAttribute = 0
+
+cdef void free_ncomp_attributes(libncomp.ncomp_attributes* attrs):
+    # Frees an ncomp_attributes struct created by dict_to_ncomp_attributes.
+    if attrs is not NULL:
+        free_ncomp_attribute_array(attrs)
+        free(attrs)
+
 
 @carrayify
 def _moc_globe_atl(np.ndarray lat_aux_grid_np, np.ndarray a_wvel_np, np.ndarray a_bolus_np, np.ndarray a_submeso_np, np.ndarray tlat_np, np.ndarray rmlak_np, msg=None):
@@ -1100,7 +1174,7 @@ def _rgrid2rcm(np.ndarray lat1d_np, np.ndarray lon1d_np, np.ndarray fi_np, np.nd
         fo_dtype = np.float64
     else:
         fo_dtype = np.float32
-    cdef np.ndarray fo_np = np.zeros(tuple([fi.shape[i] for i in range(fi.ndim - 2)] + [lat2d.shape[0], lon2d.shape[0]]), dtype=fo_dtype)
+    cdef np.ndarray fo_np = np.zeros(tuple([fi.shape[i] for i in range(fi.ndim - 2)] + [lat2d.shape[0], lat2d.shape[1]]), dtype=fo_dtype)
 
     replace_fi_nans = False
 
@@ -1354,8 +1428,11 @@ def _triple2grid(np.ndarray x_np, np.ndarray y_np, np.ndarray data_np, np.ndarra
     cdef libncomp.ncomp_array* ncomp_output = NULL
 
     cdef int ier
-    with nogil:
-        ier = libncomp.triple2grid(x.ncomp, y.ncomp, data.ncomp, xgrid.ncomp, ygrid.ncomp, &ncomp_output, attrs)
+    try:
+        with nogil:
+            ier = libncomp.triple2grid(x.ncomp, y.ncomp, data.ncomp, xgrid.ncomp, ygrid.ncomp, &ncomp_output, attrs)
+    finally:
+        free_ncomp_attributes(attrs)
     if ier != 0:     # Check errors ier
         raise NcompError(f"An error occurred while calling libncomp.triple2grid with error code: {ier}")
 
@@ -0,0 +1,207 @@
+"""Numba implementations of the GeoCAT-ncomp point interpolation kernels.
+
+The kernels have the same signatures and return the same results as the
+libncomp kernels of the same name in :mod:`geocat.ncomp._ncomp`, and are
+registered as the "numba" engine in :mod:`geocat.ncomp.engine`. They are
+compiled on first use and loop in parallel (:func:`numba.prange`) over the
+output points and the leftmost dimensions of `fi`. Importing this module
+raises ImportError when numba is not installed.
+"""
+
+import warnings
+
+import numpy as np
+from numba import njit, prange
+
+from ._numpy_engine import (_cyclic_extend, _is_increasing, _missing_to_nan,
+                            _output_dtype)
+from .errors import NcompWarning
+
+# tolerance of the exact coordinate matches in rcm2points, as in libncomp
+_EPS = 1e-4
+
+
+def _as_grids(fi):
+    """Reshapes `fi` to (number of 2D grids, ny, nx)."""
+    return np.ascontiguousarray(fi.reshape((-1,) + fi.shape[-2:]))
+
+
+@njit(cache=True)
+def _locate(xi, x):
+    """Index i of the interval xi[i] <= x < xi[i + 1], or -1 if outside."""
+    i = np.searchsorted(xi, x, side="right") - 1
+    if i < 0 or i >= xi.size - 1:
+        return -1
+    return i
+
+
+@njit(parallel=True, cache=True)
+def _linint2_points_kernel(xi, yi, fi, xo, yo):
+    ngrd = fi.shape[0]
+    npts = xo.size
+
+    ix = np.empty(npts, dtype=np.int64)
+    iy = np.empty(npts, dtype=np.int64)
+    for p in prange(npts):
+        ix[p] = _locate(xi, xo[p])
+        iy[p] = _locate(yi, yo[p])
+
+    fo = np.empty((ngrd, npts))
+    for n in prange(ngrd * npts):
+        g = n // npts
+        p = n % npts
+        i = ix[p]
+        j = iy[p]
+        if i < 0 or j < 0:
+            fo[g, p] = np.nan
+            continue
+        wx = (xo[p] - xi[i]) / (xi[i + 1] - xi[i])
+        wy = (yo[p] - yi[j]) / (yi[j + 1] - yi[j])
+        total = 0.0
+        wsum = 0.0
+        for dy in range(2):
+            for dx in range(2):
+                f = fi[g, j + dy, i + dx]
+                if not np.isnan(f):
+                    w = (wy if dy else 1.0 - wy) * (wx if dx else 1.0 - wx)
+                    total += f * w
+                    wsum += w
+        fo[g, p] = total / wsum if wsum > 0.0 else np.nan
+    return fo
+
+
+def _linint2_points(xi, yi, fi, xo, yo, icycx, msg=None):
+    """Numba version of :func:`geocat.ncomp._ncomp._linint2_points`."""
+    xi, yi, xo, yo = (np.asarray(c, dtype=np.float64) for c in (xi, yi, xo, yo))
+
+    fo_dtype = _output_dtype(fi)
+    if not _is_increasing(xi, yi):
+        warnings.warn(
+            "linint2_points: xi and yi must be monotonically increasing",
+            NcompWarning)
+        return np.zeros(fi.shape[:-2] + (xo.size,), dtype=fo_dtype)
+
+    fi = _missing_to_nan(fi, msg)
+    if icycx:
+        xi, fi = _cyclic_extend(xi, fi)
+
+    fo = _linint2_points_kernel(xi, yi, _as_grids(fi), xo, yo)
+    return fo.reshape(fi.shape[:-2] + (xo.size,)).astype(fo_dtype)
+
+
+@njit(cache=True)
+def _gcdist(sin_lat1, cos_lat1, lon1, sin_lat2, cos_lat2, lon2):
+    """Great circle distance in radians between two points, given the sine
+    and cosine of their latitudes and their longitudes in degrees."""
+    c = (sin_lat1 * sin_lat2 + cos_lat1 * cos_lat2 * np.cos(
+        (lon1 - lon2) * (np.pi / 180.0)))
+    return np.arccos(min(1.0, max(-1.0, c)))
+
+
+@njit(cache=True)
+def _find_cell(lat2d, lon2d, row_lat_min, row_lat_max, lat, lon, k):
+    """First (iy, ix), scanning rows south to north, of a block of k x k
+    cells that encloses (lat, lon); (-1, -1) if there is none."""
+    ny, nx = lat2d.shape
+    for iy in range(ny - k):
+        if lat < row_lat_min[iy] or lat > row_lat_max[iy + k]:
+            continue
+        row = lon2d[iy]
+        start = max(0, np.searchsorted(row, lon, side="left") - k)
+        stop = min(nx - k, np.searchsorted(row, lon, side="right"))
+        for ix in range(start, stop):
+            if (row[ix] <= lon <= row[ix + k] and
+                    lat2d[iy, ix] <= lat <= lat2d[iy + k, ix]):
+                return iy, ix
+    return -1, -1
+
+
+@njit(parallel=True, cache=True)
+def _rcm2points_kernel(lat2d, lon2d, fi, lat, lon, k):
+    ngrd = fi.shape[0]
+    ny, nx = lat2d.shape
+    npts = lat.size
+    lat_min, lat_max = lat2d.min(), lat2d.max()
+    lon_min, lon_max = lon2d.min(), lon2d.max()
+    lat_flat = lat2d.ravel()
+    lon_flat = lon2d.ravel()
+    fi_flat = fi.reshape((ngrd, ny * nx))
+    row_lat_min = np.empty(ny)
+    row_lat_max = np.empty(ny)
+    for iy in range(ny):
+        row_lat_min[iy] = lat2d[iy].min()
+        row_lat_max[iy] = lat2d[iy].max()
+    sin_lat2d = np.sin(lat2d * (np.pi / 180.0))
+    cos_lat2d = np.cos(lat2d * (np.pi / 180.0))
+
+    # exact matches (-1 if none), then the enclosing block
+    exact = np.full(npts, -1, dtype=np.int64)
+    cell_y = np.empty(npts, dtype=np.int64)
+    cell_x = np.empty(npts, dtype=np.int64)
+    order = np.argsort(lat_flat)
+    lat_sorted = lat_flat[order]
+    for p in prange(npts):
+        # the first grid point in C order, among those matching the latitude
+        lo = np.searchsorted(lat_sorted, lat[p] - _EPS, side="left")
+        hi = np.searchsorted(lat_sorted, lat[p] + _EPS, side="right")
+        for q in range(lo, hi):
+            m = order[q]
+            if (abs(lon[p] - lon_flat[m]) <= _EPS and
+                (exact[p] < 0 or m < exact[p])):
+                exact[p] = m
+        cell_y[p], cell_x[p] = _find_cell(lat2d, lon2d, row_lat_min,
+                                          row_lat_max, lat[p], lon[p], k)
+
+    fo = np.empty((ngrd, npts))
+    for n in prange(ngrd * npts):
+        g = n // npts
+        p = n % npts
+        if exact[p] >= 0 and not np.isnan(fi_flat[g, exact[p]]):
+            fo[g, p] = fi_flat[g, exact[p]]
+            continue
+
+        # inverse distance squared weighting over the enclosing block, or
+        # over the whole grid for points inside its extent but in no block
+        if cell_y[p] >= 0:
+            y0, x0 = cell_y[p], cell_x[p]
+            y1, x1 = y0 + k + 1, x0 + k + 1
+        elif lat_min <= lat[p] <= lat_max and lon_min <= lon[p] <= lon_max:
+            y0, y1, x0, x1 = 0, ny, 0, nx
+        else:
+            fo[g, p] = np.nan
+            continue
+
+        sin_lat = np.sin(lat[p] * (np.pi / 180.0))
+        cos_lat = np.cos(lat[p] * (np.pi / 180.0))
+        total = 0.0
+        wsum = 0.0
+        for j in range(y0, y1):
+            for i in range(x0, x1):
+                f = fi[g, j, i]
+                if not np.isnan(f):
+                    d = _gcdist(sin_lat, cos_lat, lon[p], sin_lat2d[j, i],
+                                cos_lat2d[j, i], lon2d[j, i])
+                    w = 1.0 / (d * d)
+                    total += f * w
+                    wsum += w
+        fo[g, p] = total / wsum if wsum > 0.0 else np.nan
+    return fo
+
+
+def _rcm2points(lat2d, lon2d, fi, lat1d, lon1d, opt=0, msg=None):
+    """Numba version of :func:`geocat.ncomp._ncomp._rcm2points`.
+
+    Output points within 1e-4 degrees of a grid point take its value. Other
+    points, and those whose matching grid point is missing, are the inverse
+    distance squared weighted mean of the grid points of the first enclosing
+    block of 1 x 1 cells (`opt` 0 or 1) or 2 x 2 cells (`opt` 2), or of all
+    grid points if no block encloses a point within the extent of the grid.
+    """
+    lat2d, lon2d, lat1d, lon1d = (
+        np.asarray(c, dtype=np.float64) for c in (lat2d, lon2d, lat1d, lon1d))
+    fo_dtype = _output_dtype(fi)
+    fi = _missing_to_nan(fi, msg)
+    k = 2 if abs(opt) == 2 else 1
+
+    fo = _rcm2points_kernel(lat2d, lon2d, _as_grids(fi), lat1d, lon1d, k)
+    return fo.reshape(fi.shape[:-2] + (lat1d.size,)).astype(fo_dtype)
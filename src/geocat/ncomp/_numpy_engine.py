@@ -0,0 +1,463 @@
+"""Vectorized NumPy implementations of GeoCAT-ncomp kernels.
+
+Each kernel has the same signature and returns the same result as the
+libncomp kernel of the same name in :mod:`geocat.ncomp._ncomp`, so that they
+can be swapped through :mod:`geocat.ncomp.engine`. Missing values in the
+inputs are NaN unless `msg` is given, and missing values in the outputs are
+always NaN.
+"""
+
+import collections
+import hashlib
+import threading
+import warnings
+
+import numpy as np
+
+from ._geometry import apply_weights, idw_weights
+from ._util import _derived
+from .errors import NcompWarning
+
+# interpolation weights of the most recent rgrid2rcm grid pairs, by the hash
+# of their coordinates, shared by the threads of dask's threaded scheduler
+_RGRID2RCM_CACHE_SIZE = 4
+_rgrid2rcm_cache = collections.OrderedDict()
+_rgrid2rcm_lock = threading.Lock()
+
+
+def _missing_to_nan(a, msg):
+    """Returns `a` as float64 with its missing values set to NaN.
+
+    `a` itself is returned, not a copy, if it is a float64 array and `msg`
+    is None or NaN, so the result must not be modified in place.
+    """
+    if msg is None or np.isnan(msg):
+        return np.asarray(a, dtype=np.float64)
+    out = np.array(a, dtype=np.float64)
+    out[np.asarray(a) == msg] = np.nan
+    return out
+
+
+def _output_dtype(*arrays):
+    """Double if any of `arrays` is double, float otherwise."""
+    if any(np.asarray(a).dtype == np.float64 for a in arrays):
+        return np.float64
+    return np.float32
+
+
+def _is_increasing(*coords):
+    return all(
+        _derived(c, "increasing", lambda c=c: bool(np.all(np.diff(c) > 0)))
+        for c in coords)
+
+
+def _cyclic_extend(xi, fi):
+    """Pads `xi` and the rightmost axis of `fi` by one point on each side,
+    wrapping the values around from the opposite edge."""
+    xi = np.concatenate(
+        ([xi[0] - (xi[1] - xi[0])], xi, [xi[-1] + (xi[-1] - xi[-2])]))
+    fi = np.concatenate((fi[..., -1:], fi, fi[..., :1]), axis=-1)
+    return xi, fi
+
+
+def _uniform_spacing(xi):
+    """Returns the first value and spacing of `xi` if its values are within
+    1% of a spacing from those of an equally spaced array, None otherwise."""
+    return _derived(xi, "uniform", lambda: _equal_spacing(xi))
+
+
+def _equal_spacing(xi):
+    if xi.size < 2:
+        return None
+    dx = (xi[-1] - xi[0]) / (xi.size - 1)
+    if not dx > 0:
+        return None
+    if np.abs(xi - (xi[0] + dx * np.arange(xi.size))).max() > 0.01 * dx:
+        return None
+    return xi[0], dx
+
+
+def _locate(xi, xo):
+    """Index i of the interval xi[i] <= xo < xi[i + 1] of each `xo` in the
+    strictly increasing `xi`, -1 below xi[0] and xi.size - 1 from xi[-1].
+
+    On (nearly) equally spaced `xi` the index is computed arithmetically
+    and then corrected by one step against the actual values of `xi`, which
+    gives the same result as a binary search in O(1) per point.
+    """
+    uniform = _uniform_spacing(xi)
+    if uniform is None:
+        return np.searchsorted(xi, xo, side="right") - 1
+    x0, dx = uniform
+    with np.errstate(invalid="ignore"):
+        i = np.floor((xo - x0) / dx)
+    # NaNs are sorted after xi[-1] by a binary search
+    i = np.clip(np.where(np.isnan(i), xi.size, i), -1,
+                xi.size - 1).astype(np.intp)
+    # xi[i] <= xo, unless i is -1; xo < xi[i + 1], unless i is xi.size - 1
+    inner = (i >= 0) & (xo < xi[np.maximum(i, 0)])
+    i[inner] -= 1
+    inner = (i < xi.size - 1) & (xo >= xi[np.minimum(i + 1, xi.size - 1)])
+    i[inner] += 1
+    return i
+
+
+def _bracket(xi, xo):
+    """Locates `xo` in the strictly increasing `xi`.
+
+    Returns the index i of the left neighbor, with xi[i] <= xo < xi[i + 1],
+    clipped to a valid interval, the weight of the right neighbor, and a mask
+    of the points inside [xi[0], xi[-1]).
+    """
+    i = _locate(xi, xo)
+    inside = (i >= 0) & (i < xi.size - 1)
+    i = np.clip(i, 0, xi.size - 2)
+    w = (xo - xi[i]) / (xi[i + 1] - xi[i])
+    return i, w, inside
+
+
+def _interp_axis(fi, xi, xo, axis):
+    """Linearly interpolates `fi` along `axis` from `xi` to `xo`.
+
+    Output coordinates matching an input coordinate take its value exactly;
+    any other output is missing (NaN) if a neighbor is missing or if it lies
+    outside of `xi`.
+    """
+    i, w, inside = _bracket(xi, xo)
+    exact = np.where(xi[i] == xo, i, i + 1)
+    exact_found = (xi[i] == xo) | (xi[i + 1] == xo)
+
+    shape = [1] * fi.ndim
+    shape[axis] = -1
+    w = w.reshape(shape)
+    f0 = np.take(fi, i, axis=axis)
+    f1 = np.take(fi, i + 1, axis=axis)
+    fo = f0 * (1.0 - w) + f1 * w
+
+    index = [slice(None)] * fi.ndim
+    index[axis] = ~inside
+    fo[tuple(index)] = np.nan
+    index[axis] = exact_found
+    fo[tuple(index)] = np.take(fi, exact[exact_found], axis=axis)
+    return fo
+
+
+def _linint2(xi, yi, fi, xo, yo, icycx, msg=None):
+    """NumPy version of :func:`geocat.ncomp._ncomp._linint2`.
+
+    Only one-dimensional `xi` and `yi` are supported.
+    """
+    xi, yi, xo, yo = (np.asarray(c, dtype=np.float64) for c in (xi, yi, xo, yo))
+    if xi.ndim != 1 or yi.ndim != 1:
+        raise ValueError("linint2: the numpy engine only supports "
+                         "one-dimensional xi and yi")
+
+    fo_dtype = _output_dtype(fi)
+    if not _is_increasing(xi, yi, xo, yo):
+        warnings.warn(
+            "linint2: xi, yi, xo, and yo must be monotonically increasing",
+            NcompWarning)
+        return np.zeros(fi.shape[:-2] + (yo.size, xo.size), dtype=fo_dtype)
+
+    fi = _missing_to_nan(fi, msg)
+    if icycx:
+        xi, fi = _cyclic_extend(xi, fi)
+
+    fo = _interp_axis(fi, xi, xo, axis=-1)
+    fo = _interp_axis(fo, yi, yo, axis=-2)
+    return fo.astype(fo_dtype)
+
+
+def _linint2_points(xi, yi, fi, xo, yo, icycx, msg=None):
+    """NumPy version of :func:`geocat.ncomp._ncomp._linint2_points`.
+
+    Each output point is the bilinear combination of the four surrounding
+    grid points, with the weights renormalized over the non-missing ones.
+    Points outside of [xi[0], xi[-1]) x [yi[0], yi[-1]) are missing.
+
+    The points are located with two binary searches, and only the corners of
+    the distinct grid cells holding points are read from `fi`, once per cell
+    across all of its leftmost dimensions; `fi` itself is never copied.
+    """
+    xi, yi, xo, yo = (np.asarray(c, dtype=np.float64) for c in (xi, yi, xo, yo))
+    fi = np.asarray(fi)
+
+    fo_dtype = _output_dtype(fi)
+    if not _is_increasing(xi, yi):
+        warnings.warn(
+            "linint2_points: xi and yi must be monotonically increasing",
+            NcompWarning)
+        return np.zeros(fi.shape[:-2] + (xo.size,), dtype=fo_dtype)
+
+    nx = xi.size
+    if icycx:
+        # column c of the extended grid is column c - 1 of fi, wrapped around
+        xi = np.concatenate(
+            ([xi[0] - (xi[1] - xi[0])], xi, [xi[-1] + (xi[-1] - xi[-2])]))
+
+    ix, wx, inside_x = _bracket(xi, xo)
+    iy, wy, inside_y = _bracket(yi, yo)
+    inside = inside_x & inside_y
+
+    # distinct cells holding points inside the grid; their corners are read
+    # once and then spread to the points when many points share cells
+    ix = ix[inside]
+    iy = iy[inside]
+    cells, points = np.unique(iy * xi.size + ix, return_inverse=True)
+    dedup = 2 * cells.size <= ix.size
+    if dedup:
+        iy, ix = np.divmod(cells, xi.size)
+
+    corners = []
+    for dy, dx in ((0, 0), (0, 1), (1, 0), (1, 1)):
+        col = ix + dx
+        if icycx:
+            col = (col - 1) % nx
+        corner = _missing_to_nan(fi[..., iy + dy, col], msg)
+        corners.append(corner[..., points] if dedup else corner)
+
+    wx = wx[inside]
+    wy = wy[inside]
+    weights = ((1 - wy) * (1 - wx), (1 - wy) * wx, wy * (1 - wx), wy * wx)
+
+    fo = np.full(fi.shape[:-2] + (xo.size,), np.nan)
+    if not any(np.isnan(c).any() for c in corners):
+        total = corners[0] * weights[0]
+        for c, w in zip(corners[1:], weights[1:]):
+            c *= w
+            total += c
+        fo[..., inside] = total
+    else:
+        total = np.zeros(fi.shape[:-2] + (wx.size,))
+        wsum = np.zeros_like(total)
+        for c, w in zip(corners, weights):
+            valid = ~np.isnan(c)
+            total += np.where(valid, c * w, 0.0)
+            wsum += np.where(valid, w, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fo[..., inside] = np.where(wsum > 0, total / wsum, np.nan)
+    return fo.astype(fo_dtype)
+
+
+def _missing_value(dtype, msg):
+    """The missing value of nearest-neighbor outputs of `dtype`: NaN for
+    floating point types, otherwise `msg`, or if `msg` is None the smallest
+    value of a signed integer `dtype` and the largest of an unsigned one,
+    whose smallest value 0 is usually a valid class."""
+    if np.issubdtype(dtype, np.floating):
+        return np.nan
+    if msg is not None:
+        return msg
+    if np.issubdtype(dtype, np.unsignedinteger):
+        return np.iinfo(dtype).max
+    if np.issubdtype(dtype, np.integer):
+        return np.iinfo(dtype).min
+    raise ValueError("nearest-neighbor interpolation of {} values requires "
+                     "a msg argument".format(np.dtype(dtype)))
+
+
+def _nearest(xi, xo):
+    """Locates `xo` in the strictly increasing `xi` like :func:`_bracket`.
+
+    Returns the index of the nearest neighbor of each `xo`, the right one
+    on ties, and a mask of the points inside [xi[0], xi[-1]].
+    """
+    i, w, inside = _bracket(xi, xo)
+    return i + (w >= 0.5), inside | (xo == xi[-1])
+
+
+def _nearest_columns(xi, xo, icycx):
+    """:func:`_nearest` along the rightmost axis of fi, wrapping the
+    columns around if `icycx`."""
+    nx = xi.size
+    if icycx:
+        xi = np.concatenate(
+            ([xi[0] - (xi[1] - xi[0])], xi, [xi[-1] + (xi[-1] - xi[-2])]))
+    ix, inside = _nearest(xi, xo)
+    if icycx:
+        ix = (ix - 1) % nx
+    return ix, inside
+
+
+def _nearest_values(fo, msg, missing):
+    """Sets the values `msg` of the floating point `fo` to NaN."""
+    if msg is not None and np.issubdtype(fo.dtype, np.floating) and \
+            not np.isnan(msg):
+        fo[fo == msg] = missing
+    return fo
+
+
+def _linint2_nearest(xi, yi, fi, xo, yo, icycx, msg=None):
+    """Nearest-neighbor version of :func:`_linint2`.
+
+    Each output point takes the value of the nearest grid point, found with
+    the same binary searches, and the result has the dtype of `fi`. Points
+    outside of [xi[0], xi[-1]] x [yi[0], yi[-1]] are missing, see
+    :func:`_missing_value`.
+    """
+    xi, yi, xo, yo = (np.asarray(c, dtype=np.float64) for c in (xi, yi, xo, yo))
+    fi = np.asarray(fi)
+    if xi.ndim != 1 or yi.ndim != 1:
+        raise ValueError("linint2: the numpy engine only supports "
+                         "one-dimensional xi and yi")
+
+    if not _is_increasing(xi, yi, xo, yo):
+        warnings.warn(
+            "linint2: xi, yi, xo, and yo must be monotonically increasing",
+            NcompWarning)
+        return np.zeros(fi.shape[:-2] + (yo.size, xo.size), dtype=fi.dtype)
+
+    missing = _missing_value(fi.dtype, msg)
+    ix, inside_x = _nearest_columns(xi, xo, icycx)
+    iy, inside_y = _nearest(yi, yo)
+    fo = np.take(np.take(fi, iy, axis=-2), ix, axis=-1)
+    fo = _nearest_values(fo, msg, missing)
+    fo[..., ~inside_y, :] = missing
+    fo[..., ~inside_x] = missing
+    return fo
+
+
+def _linint2_points_nearest(xi, yi, fi, xo, yo, icycx, msg=None):
+    """Nearest-neighbor version of :func:`_linint2_points`, see
+    :func:`_linint2_nearest`."""
+    xi, yi, xo, yo = (np.asarray(c, dtype=np.float64) for c in (xi, yi, xo, yo))
+    fi = np.asarray(fi)
+
+    if not _is_increasing(xi, yi):
+        warnings.warn(
+            "linint2_points: xi and yi must be monotonically increasing",
+            NcompWarning)
+        return np.zeros(fi.shape[:-2] + (xo.size,), dtype=fi.dtype)
+
+    missing = _missing_value(fi.dtype, msg)
+    ix, inside_x = _nearest_columns(xi, xo, icycx)
+    iy, inside_y = _nearest(yi, yo)
+    fo = _nearest_values(fi[..., iy, ix], msg, missing)
+    fo[..., ~(inside_x & inside_y)] = missing
+    return fo
+
+
+def _coords_key(*coords):
+    """Digest identifying the values and shapes of the arrays `coords`."""
+    h = hashlib.blake2b(digest_size=16)
+    for c in coords:
+        h.update(_derived(c, "digest", lambda c=c: _digest(c)))
+    return h.digest()
+
+
+def _digest(c):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(c.shape).encode())
+    h.update(np.ascontiguousarray(c).tobytes())
+    return h.digest()
+
+
+def _rgrid2rcm_weights(lat1d, lon1d, lat2d, lon2d):
+    """Flat indices of the corners of the cells of the rectilinear grid
+    holding the curvilinear grid points, shape (npoints, 4), and their
+    inverse distance squared weights, zero for points outside the grid."""
+    lat = lat2d.ravel()
+    lon = lon2d.ravel()
+    iy = np.clip(
+        np.searchsorted(lat1d, lat, side="right") - 1, 0, lat1d.size - 2)
+    ix = np.clip(
+        np.searchsorted(lon1d, lon, side="right") - 1, 0, lon1d.size - 2)
+    ll = iy * lon1d.size + ix
+    nodes = np.stack((ll, ll + 1, ll + lon1d.size, ll + lon1d.size + 1),
+                     axis=-1)
+
+    lat_n = np.stack((lat1d[iy], lat1d[iy], lat1d[iy + 1], lat1d[iy + 1]),
+                     axis=-1)
+    lon_n = np.stack((lon1d[ix], lon1d[ix + 1], lon1d[ix], lon1d[ix + 1]),
+                     axis=-1)
+    weights = idw_weights(lat_n, lon_n, lat, lon)
+    inside = ((lat >= lat1d[0]) & (lat <= lat1d[-1]) & (lon >= lon1d[0]) &
+              (lon <= lon1d[-1]))
+    weights[~inside] = 0.0
+    return nodes, weights
+
+
+def _rgrid2rcm(lat1d, lon1d, fi, lat2d, lon2d, msg=None):
+    """NumPy version of :func:`geocat.ncomp._ncomp._rgrid2rcm`.
+
+    Each curvilinear grid point is the inverse distance squared weighted
+    mean of the non-missing corners of the rectilinear cell holding it,
+    found with one binary search per axis; points on a rectilinear grid
+    point take its value unless it is missing. Points outside of the
+    rectilinear grid are missing.
+
+    The corners and weights are computed once for all leftmost dimensions
+    of `fi`, and are kept for the last few grid pairs, so repeated calls
+    with the same coordinates only gather and combine four values per point.
+    """
+    lat1d, lon1d, lat2d, lon2d = (
+        np.asarray(c, dtype=np.float64) for c in (lat1d, lon1d, lat2d, lon2d))
+    fi = np.asarray(fi)
+
+    fo_dtype = _output_dtype(fi)
+    if not _is_increasing(lat1d, lon1d):
+        warnings.warn(
+            "rgrid2rcm: lat1d and lon1d must be monotonically increasing",
+            NcompWarning)
+        return np.zeros(fi.shape[:-2] + lat2d.shape, dtype=fo_dtype)
+
+    key = _coords_key(lat1d, lon1d, lat2d, lon2d)
+    with _rgrid2rcm_lock:
+        cached = _rgrid2rcm_cache.get(key)
+        if cached is None:
+            cached = _rgrid2rcm_weights(lat1d, lon1d, lat2d, lon2d)
+            _rgrid2rcm_cache[key] = cached
+            if len(_rgrid2rcm_cache) > _RGRID2RCM_CACHE_SIZE:
+                _rgrid2rcm_cache.popitem(last=False)
+        else:
+            _rgrid2rcm_cache.move_to_end(key)
+    nodes, weights = cached
+
+    fo = apply_weights(fi, nodes, weights, msg)
+    return fo.reshape(fi.shape[:-2] + lat2d.shape).astype(fo_dtype)
+
+
+def _grid2triple(x, y, z, msg=None):
+    """NumPy version of :func:`geocat.ncomp._ncomp._grid2triple`."""
+    fo_dtype = _output_dtype(x, y, z)
+    xx, yy = np.meshgrid(x, y)
+    z = _missing_to_nan(z, msg)
+    valid = ~np.isnan(z)
+    return np.stack((xx[valid], yy[valid], z[valid])).astype(fo_dtype)
+
+
+def _dpres_plevel(plev, psfc, ptop, msg=None):
+    """NumPy version of :func:`geocat.ncomp._ncomp._dpres_plevel`.
+
+    Levels between `ptop` and the surface pressure get the distance between
+    the midpoints to their neighboring levels as thickness, with `ptop` and
+    the surface pressure as the outermost interfaces. Other levels, and every
+    level of a column whose surface pressure is missing, are missing.
+    """
+    plev = np.asarray(plev, dtype=np.float64)
+    fo_dtype = _output_dtype(psfc)
+    ps = _missing_to_nan(psfc, msg)
+    if ps.size == 1:
+        ps = ps.reshape(())
+
+    # work from the top of the atmosphere down
+    order = np.argsort(plev)
+    p = plev[order]
+    nlev = p.size
+
+    valid = (p >= ptop) & (p <= ps[..., np.newaxis])
+    k = np.arange(nlev)
+    top = np.argmax(valid, axis=-1)[..., np.newaxis]
+    bottom = nlev - 1 - np.argmax(valid[..., ::-1], axis=-1)[..., np.newaxis]
+
+    mid = 0.5 * (p[:-1] + p[1:])
+    upper = np.where(k == top, ptop, np.concatenate(([ptop], mid)))
+    lower = np.where(k == bottom, ps[..., np.newaxis],
+                     np.concatenate((mid, [np.inf])))
+    dp = np.where(valid, lower - upper, np.nan)
+
+    # back to the order of plev, with the level dimension before (lat, lon)
+    dp = dp[..., np.argsort(order)]
+    if dp.ndim > 2:
+        dp = np.moveaxis(dp, -1, -3)
+    return dp.astype(fo_dtype)
@@ -0,0 +1,103 @@
+"""Rasterizing implementation of the rcm2rgrid kernel.
+
+Rather than searching the curvilinear grid for every target point, every
+source cell (the quadrilateral between four neighboring grid points) is
+rasterized onto the rectilinear target grid: the target points within the
+bounding box of the cell are found by binary search on `lat1d` and `lon1d`,
+and those actually inside the cell are assigned to it. Each target point is
+then the inverse distance squared weighted mean of the four corners of its
+cell. This costs O(n_source + n_target) and needs no gap-filling pass, so
+target points in no cell (outside the grid) are always missing.
+"""
+
+import numpy as np
+
+from ._geometry import apply_weights, idw_weights, inside_quad, quad_coordinates
+from ._numpy_engine import _output_dtype
+
+# (cell, target point) candidate pairs tested at a time
+_BLOCK = 2**20
+
+
+def _sorted_ranges(coord, lo, hi):
+    """Order sorting `coord`, and the ranges [start, stop) of positions in the
+    sorted `coord` of the values within [lo, hi]."""
+    order = np.argsort(coord, kind="stable")
+    s = coord[order]
+    return (order, np.searchsorted(s, lo, side="left"),
+            np.searchsorted(s, hi, side="right"))
+
+
+def _cell_of_targets(lat2d, lon2d, lat1d, lon1d):
+    """Flat index of the lower left corner of the first cell, in C order,
+    containing each target point (flattened), or -1 if none does."""
+    ny, nx = lat2d.shape
+    # corners (0, 0), (1, 0), (0, 1), (1, 1) of all cells, shape (ncells, 4)
+    ll = (np.arange(ny - 1)[:, None] * nx + np.arange(nx - 1)).ravel()
+    corners = np.stack((ll, ll + 1, ll + nx, ll + nx + 1), axis=-1)
+    lat_c = lat2d.ravel()[corners]
+    lon_c = lon2d.ravel()[corners]
+
+    lat_order, y0, y1 = _sorted_ranges(lat1d, lat_c.min(axis=1),
+                                       lat_c.max(axis=1))
+    lon_order, x0, x1 = _sorted_ranges(lon1d, lon_c.min(axis=1),
+                                       lon_c.max(axis=1))
+    ny_cell = np.maximum(y1 - y0, 0)
+    nx_cell = np.maximum(x1 - x0, 0)
+    counts = ny_cell * nx_cell
+    # cells with missing coordinates cover no target point
+    counts[~np.isfinite(lat_c).all(axis=1) |
+           ~np.isfinite(lon_c).all(axis=1)] = 0
+
+    cell = np.full(lat1d.size * lon1d.size, -1, dtype=np.int64)
+    ends = np.cumsum(counts)
+    start = 0
+    while start < counts.size:
+        # a block of cells with about _BLOCK candidate pairs in total
+        base = ends[start - 1] if start else 0
+        stop = max(np.searchsorted(ends, base + _BLOCK, side="right"),
+                   start + 1)
+        c = np.repeat(np.arange(start, stop), counts[start:stop])
+        offset = np.arange(c.size) - np.repeat(
+            ends[start:stop] - counts[start:stop] - base, counts[start:stop])
+        ty = lat_order[y0[c] + offset // np.maximum(nx_cell[c], 1)]
+        tx = lon_order[x0[c] + offset % np.maximum(nx_cell[c], 1)]
+
+        u, v = quad_coordinates(lat_c[c], lon_c[c], lat1d[ty], lon1d[tx])
+        inside = inside_quad(u, v)
+        target = (ty * lon1d.size + tx)[inside]
+        # the first cell of the block containing each target point, and of
+        # all blocks, as the blocks are in C order
+        target, first = np.unique(target, return_index=True)
+        new = cell[target] < 0
+        cell[target[new]] = ll[c[inside][first[new]]]
+        start = stop
+    return cell
+
+
+def _rcm2rgrid(lat2d, lon2d, fi, lat1d, lon1d, msg=None):
+    """Rasterizing version of :func:`geocat.ncomp._ncomp._rcm2rgrid`.
+
+    Target points are the inverse distance squared weighted mean of the
+    non-missing corners of the first source cell containing them, and are
+    missing when no cell contains them or all of its corners are missing.
+    Unlike libncomp, missing values are not filled in a second pass.
+    """
+    lat2d, lon2d, lat1d, lon1d = (
+        np.asarray(c, dtype=np.float64) for c in (lat2d, lon2d, lat1d, lon1d))
+    fo_dtype = _output_dtype(fi)
+    ny, nx = lat2d.shape
+
+    cell = _cell_of_targets(lat2d, lon2d, lat1d, lon1d)
+    found = cell >= 0
+    ll = np.where(found, cell, 0)
+    nodes = np.stack((ll, ll + 1, ll + nx, ll + nx + 1), axis=-1)
+
+    lat_t = np.repeat(lat1d, lon1d.size)
+    lon_t = np.tile(lon1d, lat1d.size)
+    weights = idw_weights(lat2d.ravel()[nodes],
+                          lon2d.ravel()[nodes], lat_t, lon_t)
+    weights[~found] = 0.0
+
+    fo = apply_weights(np.asarray(fi), nodes, weights, msg)
+    return fo.reshape(fo.shape[:-1] + (lat1d.size, lon1d.size)).astype(fo_dtype)
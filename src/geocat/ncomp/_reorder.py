@@ -0,0 +1,89 @@
+"""Space-filling curve orderings of output locations.
+
+Interpolating scattered locations in the order given touches `fi` at random,
+so nearly every location reads its neighbors from a cold part of the array.
+Sorting the locations along a Morton (Z-order) or Hilbert curve first makes
+consecutive locations read neighboring parts of `fi`. The result is put back
+in the order given with :func:`unpermute`, so reordering never changes it.
+"""
+
+import numpy as np
+
+REORDER_METHODS = ("morton", "hilbert")
+
+# bits per coordinate of the curve, i.e. a 65536 x 65536 lattice
+_BITS = 16
+
+
+def _quantize(v):
+    """Maps `v` linearly onto the integers 0 .. 2**_BITS - 1, with NaNs at 0."""
+    v = np.asarray(v, dtype=np.float64)
+    finite = np.isfinite(v)
+    if not finite.any():
+        return np.zeros(v.shape, dtype=np.uint64)
+    lo = v[finite].min()
+    span = v[finite].max() - lo
+    scale = (2**_BITS - 1) / span if span > 0 else 0.0
+    q = np.where(finite, (v - lo) * scale, 0.0)
+    return q.astype(np.uint64)
+
+
+def _spread_bits(v):
+    """Inserts a zero bit above each of the low 16 bits of `v`."""
+    v = v & np.uint64(0x0000ffff)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00ff00ff)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0f0f0f0f)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x33333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x55555555)
+    return v
+
+
+def morton_keys(y, x):
+    """Positions of the locations (`y`, `x`) along a Morton curve."""
+    return _spread_bits(
+        _quantize(x)) | (_spread_bits(_quantize(y)) << np.uint64(1))
+
+
+def hilbert_keys(y, x):
+    """Positions of the locations (`y`, `x`) along a Hilbert curve."""
+    x = _quantize(x)
+    y = _quantize(y)
+    n = np.uint64(2**_BITS - 1)
+    d = np.zeros(x.shape, dtype=np.uint64)
+    s = np.uint64(2**(_BITS - 1))
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx.astype(np.uint64)) ^ ry.astype(np.uint64))
+        # rotate the quadrant so that the curve is continuous
+        flip = ~ry & rx
+        x = np.where(flip, n - x, x)
+        y = np.where(flip, n - y, y)
+        x, y = np.where(~ry, y, x), np.where(~ry, x, y)
+        s >>= np.uint64(1)
+    return d
+
+
+def point_order(y, x, method):
+    """Returns the permutation sorting the locations (`y`, `x`) along the
+    space-filling curve `method` ("morton" or "hilbert"), or None if `method`
+    is None."""
+    if method is None:
+        return None
+    if method == "morton":
+        keys = morton_keys(y, x)
+    elif method == "hilbert":
+        keys = hilbert_keys(y, x)
+    else:
+        raise ValueError("reorder must be one of {} or None, not "
+                         "'{}'".format(", ".join(REORDER_METHODS), method))
+    return np.argsort(keys, kind="stable")
+
+
+def unpermute(fo, order):
+    """Undoes `order` along the rightmost dimension of `fo`."""
+    if order is None:
+        return fo
+    out = np.empty_like(fo)
+    out[..., order] = fo
+    return out
@@ -0,0 +1,132 @@
+"""Calling kernels on bounded blocks of the leading dimensions of fi.
+
+The libncomp kernels make a C-contiguous copy of every argument that is not
+C-contiguous, e.g. of fi transposed so that its spatial dimensions are the
+rightmost ones or of a strided view of a memory-mapped file, all at once.
+:func:`staged` calls a kernel on a few leading positions of fi at a time
+instead, copied into one reusable contiguous buffer, so that only one block
+of fi is in memory at any time, and writes the results into one output
+array. :func:`stage` selects it as the `staging` argument of the public
+functions asks.
+"""
+
+import mmap
+
+import numpy as np
+
+from .errors import DimensionError
+
+# bytes of fi per block of leading positions
+STAGE_BYTES = 64 * 2**20
+
+
+def spatial_last(fi, x_dim, y_dim, name):
+    """Returns the :class:`xarray.DataArray` `fi` transposed so that its
+    `y_dim` and `x_dim` dimensions are the two rightmost ones, and the
+    dimensions of `fi` to transpose the result back to, or None if they
+    already are.
+
+    The dimensions are given by name or by index, and default to the second
+    rightmost (y) and rightmost (x) ones. The transposition is a view of the
+    data of `fi`, or a lazy operation on a dask array.
+    """
+    if (x_dim is None and y_dim is None) or fi.ndim < 2:
+        return fi, None
+    dims = list(fi.dims)
+
+    def dim(d, default):
+        if d is None:
+            return default
+        if isinstance(d, (int, np.integer)):
+            if not -len(dims) <= d < len(dims):
+                raise DimensionError(
+                    "ERROR {}: fi has no dimension {} !".format(name, d))
+            return dims[d]
+        if d not in dims:
+            raise DimensionError("ERROR {}: fi has no dimension '{}' "
+                                 "!".format(name, d))
+        return d
+
+    x = dim(x_dim, dims[-1])
+    y = dim(y_dim, dims[-2])
+    if x == y:
+        raise DimensionError(
+            "ERROR {}: x_dim and y_dim must be different dimensions "
+            "!".format(name))
+    if [y, x] == dims[-2:]:
+        return fi, None
+    return fi.transpose(*[d for d in dims if d not in (y, x)], y, x), fi.dims
+
+
+def restore_dims(fo, moved, dims):
+    """Transposes the result `fo` of the transposed `moved` back to the
+    order of the dimensions `dims` given by :func:`spatial_last`."""
+    axes = [list(moved.dims).index(d) for d in dims]
+    return fo.transpose(*[fo.dims[a] for a in axes])
+
+
+def _memory_mapped(a):
+    """True if the numpy array `a` is a view of a memory-mapped file."""
+    while isinstance(a, np.ndarray):
+        if isinstance(a, np.memmap):
+            return True
+        a = a.base
+    return isinstance(a, mmap.mmap)
+
+
+def staged(call, fi, nbytes=STAGE_BYTES):
+    """Returns call(fi), computed on blocks of the leading dimensions of the
+    numpy array `fi` of about `nbytes` bytes each.
+
+    `call` maps an array of shape (n, ny, nx) to one of shape (n, ...). The
+    blocks are taken along the last leading dimension of `fi`, and those
+    that are not C-contiguous are copied into one contiguous buffer reused
+    for every block, which `call` must not keep.
+    """
+    if fi.ndim < 3:
+        return call(fi)
+    lead = fi.shape[:-2]
+    step = nbytes // max(1, fi.itemsize * fi.shape[-2] * fi.shape[-1])
+    # at least one position per block, also if there are none
+    step = max(1, min(step, lead[-1]))
+    fo = None
+    scratch = None
+    for index in np.ndindex(*lead[:-1]):
+        for start in range(0, lead[-1], step):
+            block = index + (slice(start, start + step),)
+            fi_block = fi[block]
+            if not fi_block.flags.c_contiguous:
+                if scratch is None:
+                    scratch = np.empty((step,) + fi.shape[-2:], dtype=fi.dtype)
+                np.copyto(scratch[:fi_block.shape[0]], fi_block)
+                fi_block = scratch[:fi_block.shape[0]]
+            out = call(fi_block)
+            if fo is None:
+                fo = np.empty(lead + out.shape[1:], dtype=out.dtype)
+            fo[block] = out
+    if fo is None:
+        # no leading positions: the kernel gives the output shape
+        return call(fi)
+    return fo
+
+
+def stage(call, fi, staging, name):
+    """Returns call(fi), staged by :func:`staged` as selected by `staging`.
+
+    `staging` is None to stage a non-contiguous or memory-mapped `fi` in
+    blocks of :data:`STAGE_BYTES`, False never to stage, True to always
+    stage, or the size in bytes of the blocks to always stage in.
+    """
+    if staging is None:
+        if not isinstance(fi, np.ndarray) or (fi.flags.c_contiguous and
+                                              not _memory_mapped(fi)):
+            return call(fi)
+        staging = STAGE_BYTES
+    elif staging is False:
+        return call(fi)
+    elif staging is True:
+        staging = STAGE_BYTES
+    elif not isinstance(staging, (int, np.integer)) or staging <= 0:
+        raise ValueError("{}: staging must be None, a bool or a positive "
+                         "number of bytes".format(name))
+    return staged(call, fi, int(staging))
@@ -0,0 +1,298 @@
+"""Spatially tiled dask regridding.
+
+The output grid is split into tiles, and each tile is computed by one call of
+the kernel on the smallest rectangle of the source grid that holds every
+source cell a target point of the tile can fall in, widened by a halo of
+source points. A task therefore only reads its part of `fi`, and neither the
+source nor the target grid has to fit in one worker.
+
+The same windows crop the source grid to the extent of a small target grid
+before any regridding, see :func:`source_crop`, and restrict regridding to
+the tiles holding active cells of a target mask, see :func:`regrid_masked`.
+"""
+
+import functools
+
+import numpy as np
+
+from ._numpy_engine import _is_increasing
+from .errors import ChunkError, DimensionError
+
+# source points added around the rectangle of source cells of a tile
+HALO = 2
+
+# size (y, x) of the output tiles skipped when none of their cells is active
+MASK_TILE = (64, 64)
+
+
+def _tile_bounds(size, chunk):
+    return [
+        (start, min(start + chunk, size)) for start in range(0, size, chunk)
+    ]
+
+
+def output_tiles(fi_chunks, src_shape, dst_shape, out_chunks, name):
+    """Tile sizes (y, x) of the output, from `out_chunks` if given, otherwise
+    with as many tiles per dimension as `fi` has chunks over the source
+    grid. Returns None if the output is a single tile."""
+    if out_chunks is None:
+        ntiles = [len(c) for c in fi_chunks[-2:]]
+        if ntiles == [1, 1]:
+            return None
+        return tuple(-(-n // t) for n, t in zip(dst_shape, ntiles))
+    try:
+        out_chunks = tuple(int(c) for c in out_chunks)
+    except (TypeError, ValueError):
+        out_chunks = ()
+    if len(out_chunks) != 2 or min(out_chunks) < 1:
+        raise ChunkError("{}: out_chunks must be two positive integers, the "
+                         "tile size along y and x".format(name))
+    return out_chunks
+
+
+def curvilinear_bounds(lat2d, lon2d):
+    """Bounds of the curvilinear grid (`lat2d`, `lon2d`) used by
+    :func:`curvilinear_window`: the largest extent in lat and in lon of a
+    cell, and the (lat min, lat max, lon min, lon max) of each row and of
+    each column of the grid."""
+    # a cell containing a point has all of its corners within its own
+    # extent of the point, which is at most the largest extent of a cell
+    dlat = max(np.nanmax(np.abs(np.diff(lat2d, axis=0))),
+               np.nanmax(np.abs(np.diff(lat2d, axis=1))))
+    dlon = max(np.nanmax(np.abs(np.diff(lon2d, axis=0))),
+               np.nanmax(np.abs(np.diff(lon2d, axis=1))))
+    # fmin and fmax skip NaNs, and give NaN for all-NaN rows and columns
+    rows, cols = ((np.fmin.reduce(lat2d,
+                                  axis=axis), np.fmax.reduce(lat2d, axis=axis),
+                   np.fmin.reduce(lon2d,
+                                  axis=axis), np.fmax.reduce(lon2d, axis=axis))
+                  for axis in (1, 0))
+    return dlat, dlon, rows, cols
+
+
+def curvilinear_window(lat2d, lon2d, lat, lon, halo=HALO, bounds=None):
+    """Slices (y, x) of the curvilinear grid (`lat2d`, `lon2d`) holding every
+    cell that can contain a point within the extent of `lat` and `lon`, or
+    None if there is no such cell.
+
+    `bounds` are the :func:`curvilinear_bounds` of the grid, computed here
+    if None. With them, only the grid points in the rows and columns whose
+    ranges overlap the extent are compared to it.
+    """
+    if bounds is None:
+        bounds = curvilinear_bounds(lat2d, lon2d)
+    dlat, dlon, rows, cols = bounds
+    lat_lo, lat_hi = np.min(lat) - 2 * dlat, np.max(lat) + 2 * dlat
+    lon_lo, lon_hi = np.min(lon) - 2 * dlon, np.max(lon) + 2 * dlon
+
+    def overlapping(ranges):
+        lat_min, lat_max, lon_min, lon_max = ranges
+        return np.flatnonzero((lat_max >= lat_lo) & (lat_min <= lat_hi) &
+                              (lon_max >= lon_lo) & (lon_min <= lon_hi))
+
+    rows, cols = overlapping(rows), overlapping(cols)
+    if rows.size == 0 or cols.size == 0:
+        return None
+    y0, y1, x0, x1 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+    lat_sub, lon_sub = lat2d[y0:y1, x0:x1], lon2d[y0:y1, x0:x1]
+    near = ((lat_sub >= lat_lo) & (lat_sub <= lat_hi) & (lon_sub >= lon_lo) &
+            (lon_sub <= lon_hi))
+    rows = y0 + np.flatnonzero(near.any(axis=1))
+    cols = x0 + np.flatnonzero(near.any(axis=0))
+    if rows.size == 0:
+        return None
+    ny, nx = lat2d.shape
+    return (slice(max(rows[0] - halo, 0), min(rows[-1] + 1 + halo, ny)),
+            slice(max(cols[0] - halo, 0), min(cols[-1] + 1 + halo, nx)))
+
+
+def curvilinear_windows(lat2d, lon2d):
+    """:func:`curvilinear_window` with the bounds of the grid (`lat2d`,
+    `lon2d`) computed once, for the many windows of :func:`regrid_tiles`
+    and :func:`regrid_masked`."""
+    return functools.partial(curvilinear_window,
+                             bounds=curvilinear_bounds(lat2d, lon2d))
+
+
+def rectilinear_window(lat1d, lon1d, lat, lon, halo=HALO):
+    """Slices (y, x) of the rectilinear grid (`lat1d`, `lon1d`) holding every
+    cell that contains a point within the extent of `lat` and `lon`, or None
+    if there is no such cell."""
+
+    def window(coord, lo, hi):
+        start = np.searchsorted(coord, lo, side="right") - 1
+        stop = np.searchsorted(coord, hi, side="left") + 1
+        if stop <= 0 or start >= coord.size - 1:
+            return None
+        return slice(max(start - halo, 0), min(stop + halo, coord.size))
+
+    sy = window(lat1d, np.nanmin(lat), np.nanmax(lat))
+    sx = window(lon1d, np.nanmin(lon), np.nanmax(lon))
+    if sy is None or sx is None:
+        return None
+    return sy, sx
+
+
+def source_crop(src, dst, window):
+    """Slices (y, x) of the source grid `src` holding every source cell a
+    point of the target grid `dst` can fall in, widened by a halo of one
+    point. Returns None if that is the whole source grid or no cell, and if
+    a target coordinate is not finite or a rectilinear source grid is not
+    strictly increasing.
+
+    `src` and `dst` are (lat, lon) pairs, and `window` gives the slices for
+    the source grid, as for :func:`regrid_tiles`.
+    """
+    if not all(np.isfinite(c).all() for c in dst):
+        return None
+    if src[0].ndim == 1:
+        if not _is_increasing(*src):
+            return None
+        shape = (src[0].size, src[1].size)
+    else:
+        shape = src[0].shape
+    sy_sx = window(*src, *dst, halo=1)
+    if sy_sx is None or all(
+            s.indices(n)[:2] == (0, n) for s, n in zip(sy_sx, shape)):
+        return None
+    return sy_sx
+
+
+def target_cells(target_mask, shape, name):
+    """Returns the boolean mask of the active cells of an output grid of
+    `shape`, and the flat indices of the active cells in the order of a
+    compact output.
+
+    `target_mask` is either a boolean array of `shape`, whose active cells
+    are compacted in C order, or an array of flat indices of active cells,
+    compacted in their order.
+    """
+    target_mask = np.asarray(target_mask)
+    if target_mask.dtype == bool:
+        if target_mask.shape != tuple(shape):
+            raise DimensionError(
+                "ERROR {}: target_mask must be of the shape of the output "
+                "grid {} !".format(name, tuple(shape)))
+        return target_mask, np.flatnonzero(target_mask)
+    if not np.issubdtype(target_mask.dtype, np.integer):
+        raise TypeError("{}: target_mask must be a boolean array or an "
+                        "array of flat indices of output cells".format(name))
+    cells = target_mask.ravel()
+    size = int(np.prod(shape))
+    if cells.size and (cells.min() < -size or cells.max() >= size):
+        raise DimensionError(
+            "ERROR {}: target_mask has indices out of the output grid {} "
+            "!".format(name, tuple(shape)))
+    cells = np.where(cells < 0, cells + size, cells)
+    mask = np.zeros(shape, dtype=bool)
+    mask.ravel()[cells] = True
+    return mask, cells
+
+
+def compact_cells(fo, cells):
+    """Returns the values of `fo` at the flat indices `cells` of its two
+    rightmost dimensions, which are replaced by one."""
+    return fo.reshape(fo.shape[:-2] + (-1,))[..., cells]
+
+
+def _dst_tile(dst, y0, y1, x0, x1):
+    if dst[0].ndim == 1:
+        return dst[0][y0:y1], dst[1][x0:x1]
+    return dst[0][y0:y1, x0:x1], dst[1][y0:y1, x0:x1]
+
+
+def _src_tile(src, sy, sx):
+    if src[0].ndim == 1:
+        return src[0][sy], src[1][sx]
+    return src[0][sy, sx], src[1][sy, sx]
+
+
+def regrid_masked(kernel,
+                  fi,
+                  src,
+                  dst,
+                  msg,
+                  mask,
+                  window,
+                  dtype,
+                  tiles=MASK_TILE,
+                  missing=np.nan):
+    """Interpolates the numpy array `fi` from the source grid `src` to the
+    active cells of `mask` on the target grid `dst`, with the arguments of
+    :func:`regrid_tiles`.
+
+    The kernel is only called on the output tiles holding active cells, on
+    the part of the source grid they need; every other output cell is
+    `missing`.
+    """
+    fo = None
+    for y0, y1 in _tile_bounds(mask.shape[0], tiles[0]):
+        for x0, x1 in _tile_bounds(mask.shape[1], tiles[1]):
+            if not mask[y0:y1, x0:x1].any():
+                continue
+            lat, lon = _dst_tile(dst, y0, y1, x0, x1)
+            sy_sx = window(*src, lat, lon)
+            if sy_sx is None:
+                continue
+            sy, sx = sy_sx
+            tile = kernel(*_src_tile(src, sy, sx), fi[..., sy, sx], lat, lon,
+                          msg)
+            if fo is None:
+                fo = np.full(fi.shape[:-2] + mask.shape, missing, tile.dtype)
+            fo[..., y0:y1, x0:x1] = tile
+    if fo is None:
+        return np.full(fi.shape[:-2] + mask.shape, missing, dtype)
+    fo[..., ~mask] = missing
+    return fo
+
+
+def regrid_tiles(kernel, fi, src, dst, msg, tiles, window, dtype, mask=None):
+    """Interpolates the dask array `fi` from the source grid `src` to the
+    target grid `dst`, one output tile of shape `tiles` at a time.
+
+    `src` and `dst` are (lat, lon) pairs as passed to `kernel`, which is
+    called as kernel(*src, fi, *dst, msg) on subsets of them. Target grids
+    are either rectilinear (1D lat and lon) or curvilinear (2D), and
+    `window(*src, lat, lon)` gives the source slices needed by the target
+    points (`lat`, `lon`) of a tile. If a boolean `mask` of the target grid
+    is given, tiles without active cells are not computed and every
+    inactive cell is missing (NaN).
+    """
+    import dask.array as da
+
+    rectilinear_dst = dst[0].ndim == 1
+    dst_shape = ((dst[0].size,
+                  dst[1].size) if rectilinear_dst else dst[0].shape)
+    leading = fi.chunks[:-2]
+    rows = []
+    for y0, y1 in _tile_bounds(dst_shape[0], tiles[0]):
+        row = []
+        for x0, x1 in _tile_bounds(dst_shape[1], tiles[1]):
+            lat, lon = _dst_tile(dst, y0, y1, x0, x1)
+            active = mask is None or mask[y0:y1, x0:x1].any()
+            sy_sx = window(*src, lat, lon) if active else None
+            if sy_sx is None:
+                row.append(
+                    da.full(fi.shape[:-2] + (y1 - y0, x1 - x0),
+                            np.nan,
+                            dtype=dtype,
+                            chunks=leading + ((y1 - y0,), (x1 - x0,))))
+                continue
+            sy, sx = sy_sx
+            sub = fi[..., sy, sx].rechunk({fi.ndim - 2: -1, fi.ndim - 1: -1})
+            row.append(
+                da.map_blocks(kernel,
+                              *_src_tile(src, sy, sx),
+                              sub,
+                              lat,
+                              lon,
+                              msg,
+                              chunks=leading + ((y1 - y0,), (x1 - x0,)),
+                              dtype=dtype,
+                              drop_axis=[fi.ndim - 2, fi.ndim - 1],
+                              new_axis=[fi.ndim - 2, fi.ndim - 1]))
+        rows.append(row)
+    fo = da.block(rows)
+    if mask is not None:
+        fo = da.where(mask, fo, np.nan).astype(dtype, copy=False)
+    return fo
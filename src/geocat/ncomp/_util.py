@@ -0,0 +1,97 @@
+import sys
+import weakref
+
+import numpy as np
+
+# derived properties of the read-only coordinate arrays of the grid
+# descriptors, by id of the array, with a weak reference to the array so
+# that another array given the same id later is not taken for it
+_known = {}
+
+
+def _is_dask_array(x):
+    """Returns True if `x` is a :class:`dask.array.Array`.
+
+    dask is not imported to find out: if :mod:`dask.array` has not been
+    imported yet, `x` cannot be one of its arrays.
+    """
+    da = sys.modules.get("dask.array")
+    return da is not None and isinstance(x, da.Array)
+
+
+def _method_kernel(kernel, method):
+    """Name of the kernel interpolating with `method`."""
+    if method == "linear":
+        return kernel
+    if method == "nearest":
+        return kernel + "_nearest"
+    raise ValueError("{}: method must be 'linear' or 'nearest', not "
+                     "'{}'".format(kernel, method))
+
+
+def _know(a):
+    """Registers the read-only array `a`, whose derived properties are then
+    computed once by :func:`_derived` rather than on every call, and returns
+    it."""
+    key = id(a)
+
+    def forget(ref, known=_known):
+        if known.get(key, (None,))[0] is ref:
+            del known[key]
+
+    _known[key] = (weakref.ref(a, forget), {})
+    return a
+
+
+def _derived(a, name, compute):
+    """Returns compute(), the property `name` of the array `a`, which is
+    computed only once if `a` is registered with :func:`_know`."""
+    entry = _known.get(id(a))
+    if entry is None or entry[0]() is not a:
+        return compute()
+    properties = entry[1]
+    if name not in properties:
+        properties[name] = compute()
+    return properties[name]
+
+
+def _negated(c):
+    """Returns -`c`, computed only once and registered with :func:`_know` if
+    `c` is."""
+    entry = _known.get(id(c))
+    if entry is None or entry[0]() is not c:
+        return -np.asarray(c)
+
+    def compute():
+        negated = -c
+        negated.flags.writeable = False
+        return _know(negated)
+
+    return _derived(c, "negated", compute)
+
+
+def _sliced(c, s):
+    """Returns `c`[`s`] for the slice `s` of a one-dimensional `c`; the same
+    view, registered with :func:`_know`, for every call if `c` is
+    registered, so that the properties of a cropped grid are computed once
+    too."""
+    entry = _known.get(id(c))
+    if entry is None or entry[0]() is not c:
+        return c[s]
+    return _derived(c, ("slice",) + s.indices(c.size), lambda: _know(c[s]))
+
+
+def _decreasing(c):
+    """Returns True if `c` is a one-dimensional, strictly decreasing array of
+    at least two values."""
+    return _derived(
+        c, "decreasing", lambda: np.ndim(c) == 1 and np.size(c) > 1 and bool(
+            np.all(np.diff(c) < 0)))
+
+
+def _reverse(fo, flip_y, flip_x):
+    """Returns a view of `fo` with its two rightmost axes reversed as
+    flagged."""
+    if not (flip_y or flip_x):
+        return fo
+    return fo[..., ::-1 if flip_y else 1, ::-1 if flip_x else 1]
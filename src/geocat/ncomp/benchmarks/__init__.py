@@ -0,0 +1,10 @@
+"""Benchmarking utilities for GeoCAT-ncomp.
+
+The :mod:`geocat.ncomp.benchmarks.synthetic` module provides reproducible
+synthetic inputs shaped like the data GeoCAT-ncomp sees in production
+(rectilinear model output, WRF-like curvilinear grids, station lists and
+POP ocean fields). The airspeed velocity (asv) suite under the repository's
+``benchmarks`` folder is built on top of these generators, as is the
+thread and chunk scaling study in :mod:`geocat.ncomp.benchmarks.scaling`
+and the memory soak test in :mod:`geocat.ncomp.benchmarks.soak`.
+"""
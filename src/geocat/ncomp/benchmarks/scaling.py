@@ -0,0 +1,313 @@
+"""Thread and chunk scaling study for GeoCAT-ncomp.
+
+Measures how the dask-enabled functions (:func:`~geocat.ncomp.linint2`,
+:func:`~geocat.ncomp.rcm2rgrid` and :func:`~geocat.ncomp.rgrid2rcm`) scale
+with the number of dask worker threads and the chunk size of the leftmost
+dimension, and how the nogil libncomp kernels scale when the leftmost
+dimension is split across a thread pool.
+
+The study can be run from the command line, e.g.::
+
+    python -m geocat.ncomp.benchmarks.scaling --threads 1 2 4 8 \\
+        --chunks 1 4 16 --output scaling.csv
+
+and writes one record per measurement with the speedup and parallel
+efficiency relative to the single thread run of the same configuration.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from . import synthetic
+
+DASK_FUNCTIONS = ("linint2", "rcm2rgrid", "rgrid2rcm")
+KERNEL_FUNCTIONS = ("linint2", "linint2_points", "rcm2rgrid", "rgrid2rcm",
+                    "rcm2points")
+
+FIELDS = ("function", "mode", "leftmost", "chunk", "threads", "seconds",
+          "speedup", "efficiency")
+
+
+def _linint2_case(leftmost):
+    from .. import _ncomp, linint2
+
+    yi, xi = synthetic.rectilinear_grid(181, 360)
+    yo, xo = synthetic.rectilinear_grid(361, 720)
+    fi = synthetic.rectilinear_field(yi, xi, (leftmost,))
+
+    def kernel(block):
+        return _ncomp._linint2(xi, yi, block, xo, yo, 1, None)
+
+    def wrapper(fi_dask):
+        return linint2(fi_dask, xo, yo, 1, xi=xi, yi=yi).data
+
+    return fi, kernel, wrapper
+
+
+def _linint2_points_case(leftmost):
+    from .. import _ncomp
+
+    yi, xi = synthetic.rectilinear_grid(361, 720)
+    yo, xo = synthetic.scattered_points(100000,
+                                        lat_bounds=(-89.5, 89.5),
+                                        lon_bounds=(0.0, 359.0))
+    fi = synthetic.rectilinear_field(yi, xi, (leftmost,))
+
+    def kernel(block):
+        return _ncomp._linint2_points(xi, yi, block, xo, yo, 0, None)
+
+    return fi, kernel, None
+
+
+def _curvilinear(ny=100, nx=120):
+    lat2d, lon2d = synthetic.curvilinear_grid(ny, nx)
+    lat1d = np.linspace(lat2d.min(), lat2d.max(), ny)
+    lon1d = np.linspace(lon2d.min(), lon2d.max(), nx)
+    return lat2d, lon2d, lat1d, lon1d
+
+
+def _rcm2rgrid_case(leftmost):
+    from .. import _ncomp, rcm2rgrid
+
+    lat2d, lon2d, lat1d, lon1d = _curvilinear()
+    fi = synthetic.rectilinear_field(lat2d[:, 0], lon2d[0, :], (leftmost,))
+
+    def kernel(block):
+        return _ncomp._rcm2rgrid(lat2d, lon2d, block, lat1d, lon1d, None)
+
+    def wrapper(fi_dask):
+        return rcm2rgrid(lat2d, lon2d, fi_dask, lat1d, lon1d).data
+
+    return fi, kernel, wrapper
+
+
+def _rgrid2rcm_case(leftmost):
+    from .. import _ncomp, rgrid2rcm
+
+    lat2d, lon2d, lat1d, lon1d = _curvilinear()
+    fi = synthetic.rectilinear_field(lat1d, lon1d, (leftmost,))
+
+    def kernel(block):
+        return _ncomp._rgrid2rcm(lat1d, lon1d, block, lat2d, lon2d, None)
+
+    def wrapper(fi_dask):
+        return rgrid2rcm(lat1d, lon1d, fi_dask, lat2d, lon2d).data
+
+    return fi, kernel, wrapper
+
+
+def _rcm2points_case(leftmost):
+    from .. import _ncomp
+
+    lat2d, lon2d, _, _ = _curvilinear()
+    fi = synthetic.rectilinear_field(lat2d[:, 0], lon2d[0, :], (leftmost,))
+    lat, lon = synthetic.scattered_points(10000,
+                                          lat_bounds=(lat2d[:, 60].min() + 1,
+                                                      lat2d[:, 60].max() - 1),
+                                          lon_bounds=(lon2d[50].min() + 1,
+                                                      lon2d[50].max() - 1))
+
+    def kernel(block):
+        return _ncomp._rcm2points(lat2d, lon2d, block, lat, lon, 0, None)
+
+    return fi, kernel, None
+
+
+CASES = {
+    "linint2": _linint2_case,
+    "linint2_points": _linint2_points_case,
+    "rcm2rgrid": _rcm2rgrid_case,
+    "rgrid2rcm": _rgrid2rcm_case,
+    "rcm2points": _rcm2points_case,
+}
+
+
+def _best_of(repeat, func):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _time_threaded(kernel, fi, nthreads, repeat):
+    blocks = np.array_split(fi, nthreads, axis=0)
+    with ThreadPoolExecutor(max_workers=nthreads) as pool:
+        return _best_of(repeat, lambda: list(pool.map(kernel, blocks)))
+
+
+def _time_dask(wrapper, fi, chunk, nthreads, repeat):
+    import dask
+    import xarray as xr
+
+    fi_dask = xr.DataArray(fi).chunk({"dim_0": chunk})
+    with dask.config.set(scheduler="threads", num_workers=nthreads):
+        return _best_of(repeat, lambda: wrapper(fi_dask).compute())
+
+
+def _add_speedup(records):
+    baseline = {}
+    for rec in records:
+        key = (rec["function"], rec["mode"], rec["leftmost"], rec["chunk"])
+        if rec["threads"] == 1:
+            baseline[key] = rec["seconds"]
+    for rec in records:
+        key = (rec["function"], rec["mode"], rec["leftmost"], rec["chunk"])
+        base = baseline.get(key)
+        if base is None:
+            rec["speedup"] = rec["efficiency"] = None
+        else:
+            rec["speedup"] = base / rec["seconds"]
+            rec["efficiency"] = rec["speedup"] / rec["threads"]
+    return records
+
+
+def run_scaling(functions=None,
+                threads=None,
+                chunks=None,
+                leftmost=(32,),
+                modes=("dask", "threads"),
+                repeat=3,
+                verbose=False):
+    """Runs the scaling study and returns one record per measurement.
+
+    Args:
+
+        functions (:obj:`list` of :obj:`str`):
+            Names of the functions to study; default is every function
+            supported by the requested `modes`.
+
+        threads (:obj:`list` of :obj:`int`):
+            Thread counts to sweep. A single thread run is always added as
+            the baseline for speedup and efficiency. Default is powers of
+            two up to the number of CPUs.
+
+        chunks (:obj:`list` of :obj:`int`):
+            Chunk sizes of the leftmost dimension to sweep in "dask" mode;
+            default is 1, 4 and a single chunk spanning the dimension.
+
+        leftmost (:obj:`list` of :obj:`int`):
+            Sizes of the leftmost dimension (the number of 2D fields
+            interpolated per call) to sweep.
+
+        modes (:obj:`tuple` of :obj:`str`):
+            "dask" runs the public function on a chunked
+            :class:`xarray.DataArray` with the threaded dask scheduler;
+            "threads" splits the leftmost dimension across a thread pool
+            that calls the libncomp kernel directly.
+
+        repeat (:obj:`int`):
+            Number of timings per measurement; the fastest is reported.
+
+        verbose (:obj:`bool`):
+            Print each record to stderr as it is measured.
+
+    Returns:
+        :obj:`list` of :obj:`dict`: Records with the keys "function", "mode",
+        "leftmost", "chunk", "threads", "seconds", "speedup" and
+        "efficiency".
+    """
+    if threads is None:
+        ncpu = os.cpu_count() or 1
+        threads = [2**i for i in range(ncpu.bit_length()) if 2**i <= ncpu]
+    threads = sorted(set(threads) | {1})
+
+    records = []
+    for name in functions or CASES:
+        if name not in CASES:
+            raise ValueError("scaling: unknown function '{}'; choose from "
+                             "{}".format(name, ", ".join(CASES)))
+        for size in leftmost:
+            fi, kernel, wrapper = CASES[name](size)
+
+            runs = []
+            if "threads" in modes and name in KERNEL_FUNCTIONS:
+                runs += [("threads", None)]
+            if "dask" in modes and name in DASK_FUNCTIONS:
+                runs += [("dask", c) for c in (chunks or sorted({1, 4, size}))]
+
+            for mode, chunk in runs:
+                for nthreads in threads:
+                    if mode == "threads":
+                        seconds = _time_threaded(kernel, fi, nthreads, repeat)
+                    else:
+                        seconds = _time_dask(wrapper, fi, chunk, nthreads,
+                                             repeat)
+                    rec = {
+                        "function": name,
+                        "mode": mode,
+                        "leftmost": size,
+                        "chunk": chunk,
+                        "threads": nthreads,
+                        "seconds": seconds,
+                    }
+                    if verbose:
+                        print(rec, file=sys.stderr)
+                    records.append(rec)
+
+    return _add_speedup(records)
+
+
+def write_report(records, path):
+    """Writes scaling records to `path` as JSON (``.json``) or CSV."""
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(records, f, indent=2)
+    else:
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+
+
+def _format_table(records):
+    lines = [
+        "{:<15} {:<8} {:>8} {:>6} {:>7} {:>10} {:>8} {:>10}".format(*FIELDS)
+    ]
+    for rec in records:
+        lines.append(
+            "{function:<15} {mode:<8} {leftmost:>8} {chunk!s:>6} {threads:>7} "
+            "{seconds:>10.4f} {speedup:>8.2f} {efficiency:>10.2f}".format(
+                **rec))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m geocat.ncomp.benchmarks.scaling",
+        description=__doc__.split("\n\n")[0])
+    parser.add_argument("--functions", nargs="+", choices=list(CASES))
+    parser.add_argument("--threads", nargs="+", type=int)
+    parser.add_argument("--chunks", nargs="+", type=int)
+    parser.add_argument("--leftmost", nargs="+", type=int, default=[32])
+    parser.add_argument("--modes",
+                        nargs="+",
+                        choices=["dask", "threads"],
+                        default=["dask", "threads"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output",
+                        help="write the report to this .csv or .json file")
+    args = parser.parse_args(argv)
+
+    records = run_scaling(functions=args.functions,
+                          threads=args.threads,
+                          chunks=args.chunks,
+                          leftmost=args.leftmost,
+                          modes=tuple(args.modes),
+                          repeat=args.repeat,
+                          verbose=True)
+    print(_format_table(records))
+    if args.output:
+        write_report(records, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""Memory soak test for the GeoCAT-ncomp bindings.
+
+Calls each :mod:`geocat.ncomp._ncomp` binding many times on small synthetic
+inputs while sampling the resident set size (RSS) of the process and the
+Python heap as seen by :mod:`tracemalloc`, and reports the growth of both per
+call. A binding that does not leak should report (close to) zero bytes per
+call once the allocator has warmed up. Run it with, e.g.::
+
+    python -m geocat.ncomp.benchmarks.soak --calls 1000000 --output soak.csv
+
+Memory allocated by libncomp itself is invisible to :mod:`tracemalloc`, so a
+growing RSS with a flat traced heap points at the C side of a binding, while
+growth in both points at Python or numpy objects that are kept alive.
+"""
+
+import argparse
+import csv
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+
+from . import synthetic
+
+FIELDS = ("binding", "calls", "seconds", "rss_start", "rss_end", "rss_per_call",
+          "traced_per_call")
+
+
+def rss_bytes():
+    """Returns the current resident set size of this process in bytes.
+
+    Uses :mod:`psutil` when it is installed and ``/proc/self/statm``
+    otherwise; returns None when neither is available.
+    """
+    try:
+        import psutil
+    except ImportError:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            return None
+    return psutil.Process().memory_info().rss
+
+
+def _missing(data):
+    return synthetic.add_missing(data, 0.1)
+
+
+def _cases():
+    """Builds (name, binding, args, kwargs) for every binding under test.
+
+    Inputs are kept small so that millions of calls finish in reasonable time
+    and contain missing values so the NaN replacement paths are exercised.
+    """
+    from .. import _ncomp
+
+    yi, xi = synthetic.rectilinear_grid(10, 20)
+    yo, xo = synthetic.rectilinear_grid(19, 40)
+    fi = _missing(synthetic.rectilinear_field(yi, xi, (2,)))
+    ylat, xlon = synthetic.scattered_points(16,
+                                            lat_bounds=(-80.0, 80.0),
+                                            lon_bounds=(0.0, 320.0))
+
+    lat2d, lon2d = synthetic.curvilinear_grid(10, 12)
+    lat1d = np.linspace(lat2d.min(), lat2d.max(), 10)
+    lon1d = np.linspace(lon2d.min(), lon2d.max(), 12)
+    fi_rcm = _missing(
+        synthetic.rectilinear_field(lat2d[:, 0], lon2d[0, :], (2,)))
+    fi_rgrid = _missing(synthetic.rectilinear_field(lat1d, lon1d, (2,)))
+    lat_pts, lon_pts = synthetic.scattered_points(
+        16,
+        lat_bounds=(lat2d[:, 6].min() + 1, lat2d[:, 6].max() - 1),
+        lon_bounds=(lon2d[5].min() + 1, lon2d[5].max() - 1))
+
+    data = synthetic.eof_inputs(6, 8, 24, missing_fraction=0.1)
+    data_t = np.ascontiguousarray(np.moveaxis(data, -1, 0))
+    evec = _ncomp._eofunc(data, 2)[0]
+    opt = {b"jopt": np.array(0, dtype=np.int32)}
+
+    triple_data = _missing(
+        (np.cos(np.deg2rad(ylat)) * np.sin(np.deg2rad(xlon))).reshape((1, 16)))
+    triple_opt = {
+        b"method": np.array(1, dtype=np.int32),
+        b"distmx": np.array(1e20, dtype=np.float64),
+        b"domain": np.array(1.0, dtype=np.float64),
+    }
+
+    plev, psfc, ptop = synthetic.pressure_inputs(17, (4, 5),
+                                                 missing_fraction=0.1)
+    moc = synthetic.pop_moc_inputs(12, 5, 10, 8, missing_fraction=0.1)
+
+    return [
+        ("linint2", _ncomp._linint2, (xi, yi, fi, xo, yo, 1), {}),
+        ("linint2_points", _ncomp._linint2_points, (xi, yi, fi, xlon, ylat, 1),
+         {}),
+        ("rcm2rgrid", _ncomp._rcm2rgrid, (lat2d, lon2d, fi_rcm, lat1d, lon1d),
+         {}),
+        ("rgrid2rcm", _ncomp._rgrid2rcm, (lat1d, lon1d, fi_rgrid, lat2d, lon2d),
+         {}),
+        ("rcm2points", _ncomp._rcm2points, (lat2d, lon2d, fi_rcm, lat_pts,
+                                            lon_pts, 2), {}),
+        ("triple2grid", _ncomp._triple2grid, (xlon, ylat, triple_data, xi, yi,
+                                              triple_opt), {}),
+        ("grid2triple", _ncomp._grid2triple, (xi, yi, fi[0]), {}),
+        ("eofunc", _ncomp._eofunc, (data, 2, opt), {}),
+        ("eofunc_n", _ncomp._eofunc_n, (data_t, 2, 0, opt), {}),
+        ("eofunc_ts", _ncomp._eofunc_ts, (data, evec, opt), {}),
+        ("eofunc_ts_n", _ncomp._eofunc_ts_n, (data_t, evec, 0, opt), {}),
+        ("dpres_plevel", _ncomp._dpres_plevel, (plev, psfc, np.float64(ptop)),
+         {}),
+        ("moc_globe_atl", _ncomp._moc_globe_atl, (), moc),
+    ]
+
+
+def soak(binding, args=(), kwargs=None, calls=1000000, samples=20, warmup=1000):
+    """Calls `binding` repeatedly and measures the memory growth per call.
+
+    Args:
+
+        binding (:obj:`callable`):
+            The function under test.
+
+        args (:obj:`tuple`), kwargs (:obj:`dict`):
+            Arguments passed to every call.
+
+        calls (:obj:`int`):
+            Number of measured calls.
+
+        samples (:obj:`int`):
+            Number of times RSS and the traced heap are sampled over the
+            measured calls.
+
+        warmup (:obj:`int`):
+            Number of unmeasured calls made first, so that caches, free
+            lists and the allocator reach a steady state.
+
+    Returns:
+        :obj:`dict`: With the keys "calls", "seconds", "rss_start",
+        "rss_end", "rss_per_call" and "traced_per_call". The per call values
+        are least squares slopes of the sampled RSS and traced heap sizes
+        against the number of calls, in bytes.
+    """
+    kwargs = kwargs or {}
+    for _ in range(warmup):
+        binding(*args, **kwargs)
+
+    step = max(calls // samples, 1)
+    counts, rss, traced = [], [], []
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        done = 0
+        while done < calls:
+            n = min(step, calls - done)
+            for _ in range(n):
+                binding(*args, **kwargs)
+            done += n
+            gc.collect()
+            counts.append(done)
+            rss.append(rss_bytes())
+            traced.append(tracemalloc.get_traced_memory()[0])
+        seconds = time.perf_counter() - start
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    def slope(values):
+        if len(counts) < 2 or values[0] is None:
+            return None
+        return float(np.polyfit(counts, values, 1)[0])
+
+    return {
+        "calls": calls,
+        "seconds": seconds,
+        "rss_start": rss[0],
+        "rss_end": rss[-1],
+        "rss_per_call": slope(rss),
+        "traced_per_call": slope(traced),
+    }
+
+
+def run_soak(bindings=None,
+             calls=1000000,
+             samples=20,
+             warmup=1000,
+             verbose=False):
+    """Soaks every binding in `bindings` (default: all of them).
+
+    Returns:
+        :obj:`list` of :obj:`dict`: One record per binding, as returned by
+        :func:`soak` plus a "binding" key.
+    """
+    cases = _cases()
+    names = [case[0] for case in cases]
+    for name in bindings or ():
+        if name not in names:
+            raise ValueError("soak: unknown binding '{}'; choose from "
+                             "{}".format(name, ", ".join(names)))
+
+    records = []
+    with warnings.catch_warnings():
+        # dpres_plevel warns on every call
+        warnings.simplefilter("ignore")
+        for name, binding, args, kwargs in cases:
+            if bindings and name not in bindings:
+                continue
+            rec = dict(binding=name,
+                       **soak(binding, args, kwargs, calls, samples, warmup))
+            if verbose:
+                print(rec, file=sys.stderr)
+            records.append(rec)
+    return records
+
+
+def write_report(records, path):
+    """Writes soak records to `path` as JSON (``.json``) or CSV."""
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(records, f, indent=2)
+    else:
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m geocat.ncomp.benchmarks.soak",
+        description=__doc__.split("\n\n")[0])
+    parser.add_argument("--bindings", nargs="+")
+    parser.add_argument("--calls", type=int, default=1000000)
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=1000)
+    parser.add_argument("--tolerance",
+                        type=float,
+                        default=1.0,
+                        help="exit with status 1 if any binding grows RSS or "
+                        "the traced heap by more than this many bytes per call")
+    parser.add_argument("--output",
+                        help="write the report to this .csv or .json file")
+    args = parser.parse_args(argv)
+
+    records = run_soak(bindings=args.bindings,
+                       calls=args.calls,
+                       samples=args.samples,
+                       warmup=args.warmup,
+                       verbose=True)
+    if args.output:
+        write_report(records, args.output)
+
+    leaking = []
+    for rec in records:
+        per_call = [
+            rec[k]
+            for k in ("rss_per_call", "traced_per_call")
+            if rec[k] is not None
+        ]
+        print("{:<15} rss {:>10.2f} B/call   traced {:>10.2f} B/call".format(
+            rec["binding"], rec["rss_per_call"] or 0.0,
+            rec["traced_per_call"] or 0.0))
+        if any(v > args.tolerance for v in per_call):
+            leaking.append(rec["binding"])
+    if leaking:
+        print("leaking: " + ", ".join(leaking), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,368 @@
+"""Reproducible synthetic inputs for benchmarking GeoCAT-ncomp functions.
+
+Every generator takes an explicit ``seed`` so repeated benchmark runs (and
+runs on different machines) see identical data.
+"""
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def add_missing(data, fraction, msg=None, seed=0):
+    """Returns a copy of `data` with a fraction of its elements set missing.
+
+    Args:
+
+        data (:class:`numpy.ndarray`):
+            The array to copy.
+
+        fraction (:obj:`float`):
+            The fraction of elements, between 0 and 1, to replace with the
+            missing value.
+
+        msg (:obj:`numpy.number`):
+            The missing value to use. Defaults to NaN, which requires a
+            floating point `data`.
+
+        seed (:obj:`int`):
+            Seed for the random selection of missing elements.
+
+    Returns:
+        :class:`numpy.ndarray`: A copy of `data` with missing values.
+    """
+    out = np.array(data, copy=True)
+    if fraction <= 0:
+        return out
+    if fraction > 1:
+        raise ValueError("add_missing: fraction must be between 0 and 1.")
+    if msg is None:
+        if not np.issubdtype(out.dtype, np.floating):
+            raise TypeError(
+                "add_missing: msg must be given for non-floating point data.")
+        msg = np.nan
+
+    rng = np.random.RandomState(seed)
+    flat = out.reshape(-1)
+    nmissing = int(round(fraction * flat.size))
+    flat[rng.choice(flat.size, nmissing, replace=False)] = msg
+    return out
+
+
+def rectilinear_grid(nlat,
+                     nlon,
+                     lat_bounds=(-90.0, 90.0),
+                     lon_bounds=(0.0, 360.0)):
+    """Returns the 1D coordinates of a regular latitude/longitude grid.
+
+    Longitudes of a global grid (a 360 degree span) do not repeat the first
+    point, which is the layout that requires ``icycx=True`` in
+    :func:`geocat.ncomp.linint2`.
+
+    Args:
+
+        nlat (:obj:`int`):
+            Number of latitudes.
+
+        nlon (:obj:`int`):
+            Number of longitudes.
+
+        lat_bounds (:obj:`tuple`):
+            First and last latitude; default is (-90, 90).
+
+        lon_bounds (:obj:`tuple`):
+            Longitude span; default is (0, 360).
+
+    Returns:
+        :obj:`tuple`: (lat, lon), both strictly increasing
+        :class:`numpy.ndarray` of type double.
+    """
+    lat = np.linspace(lat_bounds[0], lat_bounds[1], nlat)
+    cyclic = np.isclose(lon_bounds[1] - lon_bounds[0], 360.0)
+    lon = np.linspace(lon_bounds[0], lon_bounds[1], nlon, endpoint=not cyclic)
+    return lat, lon
+
+
+def rectilinear_field(lat,
+                      lon,
+                      leading=(),
+                      dtype=np.float64,
+                      missing_fraction=0.0,
+                      seed=0):
+    """Returns a smooth field with noise on a rectilinear grid.
+
+    Args:
+
+        lat (:class:`numpy.ndarray`):
+            One-dimensional latitudes (second-to-rightmost dimension).
+
+        lon (:class:`numpy.ndarray`):
+            One-dimensional longitudes (rightmost dimension).
+
+        leading (:obj:`tuple`):
+            Sizes of the leftmost (e.g. time and level) dimensions.
+
+        dtype (:class:`numpy.dtype`):
+            Type of the returned array.
+
+        missing_fraction (:obj:`float`):
+            Fraction of elements set to NaN. Must be zero for integer types.
+
+        seed (:obj:`int`):
+            Seed for the noise and the missing value locations.
+
+    Returns:
+        :class:`numpy.ndarray`: An array of shape ``leading + (nlat, nlon)``.
+    """
+    rng = np.random.RandomState(seed)
+    shape = tuple(leading) + (len(lat), len(lon))
+    lat_r = np.deg2rad(np.asarray(lat, dtype=np.float64))[:, np.newaxis]
+    lon_r = np.deg2rad(np.asarray(lon, dtype=np.float64))[np.newaxis, :]
+    pattern = 280.0 + 30.0 * np.cos(lat_r) + 5.0 * np.sin(3.0 * lon_r) * np.cos(
+        2.0 * lat_r)
+    field = pattern + rng.standard_normal(shape)
+    field = add_missing(field, missing_fraction, seed=seed)
+    return field.astype(dtype)
+
+
+def curvilinear_grid(ny,
+                     nx,
+                     dx_km=12.0,
+                     center=(40.0, -97.0),
+                     true_lats=(30.0, 60.0)):
+    """Returns the 2D coordinates of a WRF-like Lambert conformal grid.
+
+    The grid is laid out the way WRF writes ``XLAT``/``XLONG``: latitudes
+    increase south-to-north along the first dimension and longitudes
+    increase west-to-east along the second, but neither is constant along
+    grid lines.
+
+    Args:
+
+        ny (:obj:`int`):
+            Number of grid rows (south-north).
+
+        nx (:obj:`int`):
+            Number of grid columns (west-east).
+
+        dx_km (:obj:`float`):
+            Grid spacing on the projection plane in kilometers.
+
+        center (:obj:`tuple`):
+            (latitude, longitude) of the domain center.
+
+        true_lats (:obj:`tuple`):
+            The two standard parallels of the projection.
+
+    Returns:
+        :obj:`tuple`: (lat2d, lon2d), both :class:`numpy.ndarray` of
+        shape (ny, nx) and type double.
+    """
+    phi0, lam0 = np.deg2rad(center[0]), np.deg2rad(center[1])
+    phi1, phi2 = np.deg2rad(true_lats[0]), np.deg2rad(true_lats[1])
+
+    n = np.log(np.cos(phi1) / np.cos(phi2)) / np.log(
+        np.tan(np.pi / 4 + phi2 / 2) / np.tan(np.pi / 4 + phi1 / 2))
+    big_f = np.cos(phi1) * np.tan(np.pi / 4 + phi1 / 2)**n / n
+    rho0 = EARTH_RADIUS_KM * big_f / np.tan(np.pi / 4 + phi0 / 2)**n
+
+    x = (np.arange(nx) - (nx - 1) / 2.0) * dx_km
+    y = (np.arange(ny) - (ny - 1) / 2.0) * dx_km
+    x2d, y2d = np.meshgrid(x, y)
+
+    rho = np.sign(n) * np.hypot(x2d, rho0 - y2d)
+    theta = np.arctan2(x2d, rho0 - y2d)
+    lat2d = 2.0 * np.arctan((EARTH_RADIUS_KM * big_f / rho)**(1.0 / n)) \
+        - np.pi / 2
+    lon2d = lam0 + theta / n
+
+    return np.rad2deg(lat2d), np.rad2deg(lon2d)
+
+
+def scattered_points(npts,
+                     lat_bounds=(-90.0, 90.0),
+                     lon_bounds=(0.0, 360.0),
+                     seed=0):
+    """Returns randomly located points, in caller (unsorted) order.
+
+    Args:
+
+        npts (:obj:`int`):
+            Number of points.
+
+        lat_bounds (:obj:`tuple`):
+            Latitude range of the points.
+
+        lon_bounds (:obj:`tuple`):
+            Longitude range of the points.
+
+        seed (:obj:`int`):
+            Seed for the point locations.
+
+    Returns:
+        :obj:`tuple`: (lat, lon), both one-dimensional
+        :class:`numpy.ndarray` of type double.
+    """
+    rng = np.random.RandomState(seed)
+    lat = rng.uniform(lat_bounds[0], lat_bounds[1], npts)
+    lon = rng.uniform(lon_bounds[0], lon_bounds[1], npts)
+    return lat, lon
+
+
+def pop_moc_inputs(nyaux,
+                   kdepth,
+                   nlat,
+                   nlon,
+                   dtype=np.float64,
+                   missing_fraction=0.0,
+                   seed=0):
+    """Returns POP-like inputs for :func:`geocat.ncomp.moc_globe_atl`.
+
+    Args:
+
+        nyaux (:obj:`int`):
+            Size of the latitude grid for transport diagnostics.
+
+        kdepth (:obj:`int`):
+            Number of vertical levels.
+
+        nlat (:obj:`int`):
+            Number of t-grid rows.
+
+        nlon (:obj:`int`):
+            Number of t-grid columns.
+
+        dtype (:class:`numpy.dtype`):
+            Type of the vertical velocity arrays.
+
+        missing_fraction (:obj:`float`):
+            Fraction of `a_wvel` elements set to NaN (land points).
+
+        seed (:obj:`int`):
+            Seed for the velocity fields and the missing value locations.
+
+    Returns:
+        :obj:`dict`: Keyword arguments ``lat_aux_grid``, ``a_wvel``,
+        ``a_bolus``, ``a_submeso``, ``tlat`` and ``rmlak`` for
+        :func:`geocat.ncomp.moc_globe_atl`.
+    """
+    rng = np.random.RandomState(seed)
+
+    lat_aux_grid = np.linspace(-79.5, 89.5, nyaux)
+
+    # a displaced-pole like t-grid: latitude rows bend northward with
+    # longitude, as the POP gx1v6 grid does in the northern hemisphere
+    lat1d = np.linspace(-79.0, 89.0, nlat)
+    lon1d = np.linspace(0.0, 360.0, nlon, endpoint=False)
+    bend = 2.0 * np.sin(np.deg2rad(lon1d))[np.newaxis, :] * \
+        np.clip(lat1d[:, np.newaxis] / 90.0, 0.0, 1.0)
+    tlat = np.clip(lat1d[:, np.newaxis] + bend, -90.0, 90.0)
+
+    shape = (kdepth, nlat, nlon)
+    a_wvel = add_missing(rng.standard_normal(shape),
+                         missing_fraction,
+                         seed=seed)
+    a_bolus = 0.1 * rng.standard_normal(shape)
+    a_submeso = 0.01 * rng.standard_normal(shape)
+
+    rmlak = np.zeros((2, nlat, nlon), dtype=np.int32)
+    rmlak[0] = 1
+    atlantic = (lon1d >= 280.0) | (lon1d <= 20.0)
+    rmlak[1][:, atlantic] = 1
+
+    return {
+        "lat_aux_grid": lat_aux_grid,
+        "a_wvel": a_wvel.astype(dtype),
+        "a_bolus": a_bolus.astype(dtype),
+        "a_submeso": a_submeso.astype(dtype),
+        "tlat": tlat,
+        "rmlak": rmlak,
+    }
+
+
+def eof_inputs(nlat,
+               nlon,
+               ntime,
+               nmodes=3,
+               dtype=np.float64,
+               missing_fraction=0.0,
+               seed=0):
+    """Returns anomalies with a few dominant modes for EOF analysis.
+
+    Args:
+
+        nlat (:obj:`int`):
+            Number of latitudes.
+
+        nlon (:obj:`int`):
+            Number of longitudes.
+
+        ntime (:obj:`int`):
+            Number of time steps (rightmost dimension).
+
+        nmodes (:obj:`int`):
+            Number of spatial patterns mixed into the data.
+
+        dtype (:class:`numpy.dtype`):
+            Type of the returned array.
+
+        missing_fraction (:obj:`float`):
+            Fraction of elements set to NaN.
+
+        seed (:obj:`int`):
+            Seed for the amplitudes, noise and missing value locations.
+
+    Returns:
+        :class:`numpy.ndarray`: An array of shape (nlat, nlon, ntime).
+    """
+    rng = np.random.RandomState(seed)
+    yy, xx = np.meshgrid(np.linspace(0, np.pi, nlat),
+                         np.linspace(0, 2 * np.pi, nlon),
+                         indexing="ij")
+    data = 0.1 * rng.standard_normal((nlat, nlon, ntime))
+    for mode in range(1, nmodes + 1):
+        pattern = np.sin(mode * yy) * np.cos(mode * xx)
+        amplitude = rng.standard_normal(ntime) / mode
+        data += pattern[..., np.newaxis] * amplitude
+    data = add_missing(data, missing_fraction, seed=seed)
+    return data.astype(dtype)
+
+
+def pressure_inputs(nlev,
+                    shape=(),
+                    dtype=np.float64,
+                    missing_fraction=0.0,
+                    seed=0):
+    """Returns inputs for :func:`geocat.ncomp.dpres_plevel`.
+
+    Args:
+
+        nlev (:obj:`int`):
+            Number of constant pressure levels.
+
+        shape (:obj:`tuple`):
+            Shape of the surface pressure, e.g. (time, lat, lon). An empty
+            tuple returns a scalar surface pressure.
+
+        dtype (:class:`numpy.dtype`):
+            Type of the surface pressure.
+
+        missing_fraction (:obj:`float`):
+            Fraction of surface pressure elements set to NaN.
+
+        seed (:obj:`int`):
+            Seed for the surface pressure and missing value locations.
+
+    Returns:
+        :obj:`tuple`: (plev, psfc, ptop) in Pa, with `plev` descending from
+        1000 hPa.
+    """
+    rng = np.random.RandomState(seed)
+    plev = np.linspace(100000.0, 1000.0, nlev)
+    ptop = 0.0
+    psfc = 101325.0 - np.abs(3000.0 * rng.standard_normal(shape))
+    if shape:
+        psfc = add_missing(psfc, missing_fraction, seed=seed).astype(dtype)
+    else:
+        psfc = np.dtype(dtype).type(psfc)
+    return plev, psfc, ptop
@@ -0,0 +1,413 @@
+import numpy as np
+import xarray as xr
+
+from ._util import _is_dask_array
+from .errors import (CoordinateError, DimensionError)
+from .grids import CurvilinearGrid, RectilinearGrid, unpack
+from .linint2 import linint2
+from .rcm2rgrid import rcm2rgrid
+from .rgrid2rcm import rgrid2rcm
+
+
+def _spatial_dims(ds, dims, name):
+    """The (y, x) dimensions of the grid of `ds`: `dims` if given, otherwise
+    the two rightmost dimensions of its first data variable with two or more
+    dimensions."""
+    if dims is None:
+        for var in ds.data_vars.values():
+            if var.ndim >= 2:
+                dims = var.dims[-2:]
+                break
+        else:
+            raise DimensionError("ERROR {}: ds has no variable of two or more "
+                                 "dimensions !".format(name))
+    dims = tuple(dims)
+    if len(dims) != 2 or any(d not in ds.dims for d in dims):
+        raise DimensionError(
+            "ERROR {}: dims must be the names of two dimensions of ds, not "
+            "{} !".format(name, dims))
+    return dims
+
+
+def _as_array(value, ds):
+    """`value`, or the variable of `ds` it names, as a numpy array."""
+    if isinstance(value, str):
+        value = ds[value]
+    if isinstance(value, xr.DataArray):
+        value = value.values
+    return np.asarray(value)
+
+
+def _regrid_dataset(ds, dims, regrid, out_dims, out_coords):
+    """Applies `regrid` to the variables of `ds` on the grid `dims`.
+
+    The variables are grouped by their dimensions, dtype and chunks, and
+    every group is stacked along a new leftmost axis, which is not chunked,
+    so that `regrid` is called once per group and computes once per chunk.
+    `regrid(fi)` returns the interpolated array, whose two rightmost
+    dimensions are `out_dims`, with coordinates `out_coords`. Variables
+    without the grid dimensions are copied, those with the grid dimensions
+    elsewhere than rightmost are transposed first, and those with only one
+    of them or of a non-numeric type are dropped.
+    """
+    groups = {}
+    data_vars = {}
+    for name, var in ds.data_vars.items():
+        if not set(dims) & set(var.dims):
+            data_vars[name] = var
+            continue
+        if not set(dims) <= set(var.dims) or var.dtype.kind not in "biuf":
+            continue
+        var = var.transpose(*[d for d in var.dims if d not in dims], *dims)
+        key = (var.dims, var.dtype, var.chunks, _is_dask_array(var.data))
+        groups.setdefault(key, []).append((name, var))
+
+    for (var_dims, _, _, dask), members in groups.items():
+        if dask:
+            import dask.array as da
+
+            stacked = da.stack([var.data for _, var in members])
+            stacked = stacked.rechunk({0: -1})
+        else:
+            stacked = np.stack([var.data for _, var in members])
+
+        fo = regrid(stacked)
+        fo = fo.data if isinstance(fo, xr.DataArray) else fo
+        out_var_dims = var_dims[:-2] + tuple(out_dims)
+        for (name, var), data in zip(members, fo):
+            data_vars[name] = xr.DataArray(data,
+                                           dims=out_var_dims,
+                                           attrs=var.attrs)
+
+    # coordinates on the source grid do not apply to the target grid
+    coords = {
+        name: coord
+        for name, coord in ds.coords.items()
+        if not set(coord.dims) & set(dims)
+    }
+    coords.update(out_coords)
+    # in the order of ds
+    data_vars = {
+        name: data_vars[name] for name in ds.data_vars if name in data_vars
+    }
+    return xr.Dataset(data_vars, coords=coords, attrs=ds.attrs)
+
+
+def linint2_dataset(ds, xo, yo, icycx, msg=None, dims=None, engine=None):
+    """Interpolates all variables of a dataset on a rectilinear grid to
+    another rectilinear grid using bi-linear interpolation.
+
+    Gives the same results as calling :func:`~geocat.ncomp.linint2` on every
+    variable, but variables with the same dimensions and type are
+    interpolated together, with a single kernel call (or a single dask task
+    per chunk) for all of them.
+
+    Args:
+
+        ds (:class:`xarray.Dataset`):
+            A dataset whose variables on the grid are interpolated. The
+            coordinates of the grid dimensions are the X and Y coordinates
+            of the grid; they must be strictly monotonically increasing.
+            The two grid dimensions must not be chunked.
+
+        xo (:class:`xarray.DataArray` or :class:`numpy.ndarray`):
+            A one-dimensional array that specifies the X coordinates of
+            the output grid. It must be strictly monotonically increasing.
+            A :class:`~geocat.ncomp.RectilinearGrid` can be passed as xo,
+            with None as yo, in place of both arrays.
+
+        yo (:class:`xarray.DataArray` or :class:`numpy.ndarray`):
+            A one-dimensional array that specifies the Y coordinates of
+            the output grid. It must be strictly monotonically increasing.
+
+        icycx (:obj:`bool`):
+            An option to indicate whether the X dimension of the grid is
+            cyclic, as for :func:`~geocat.ncomp.linint2`.
+
+        msg (:obj:`numpy.number`):
+            A numpy scalar value that represent a missing value in the
+            variables.
+
+        dims (:obj:`tuple`):
+            The names (y, x) of the grid dimensions. Default is the two
+            rightmost dimensions of the first variable of `ds` with two or
+            more dimensions.
+
+        engine (:obj:`str`):
+            Name of the engine computing the result, e.g. "libncomp" or
+            "numpy". Default is the engine set with
+            :func:`~geocat.ncomp.engine.set_default_engine`.
+
+    Returns:
+        :class:`xarray.Dataset`: `ds` with its variables on the grid
+        interpolated to (`yo`, `xo`), which become the coordinates of the
+        grid dimensions, and the grid dimensions moved to the right of the
+        variables that had them elsewhere. Variables without the grid
+        dimensions are unchanged. Variables with only one of them or of a
+        non-numeric type, and coordinates along them, are dropped.
+
+    Examples:
+
+        Example 1: Regridding every variable of a model output file
+
+        .. code-block:: python
+
+            import numpy as np
+            import xarray as xr
+            import geocat.ncomp
+
+            ds = xr.open_dataset("model_output.nc", chunks={"time": 1})
+            out = geocat.ncomp.linint2_dataset(ds, np.arange(0, 360, 0.5),
+                                               np.arange(-90, 90.1, 0.5), 1)
+    """
+    y_dim, x_dim = _spatial_dims(ds, dims, "linint2_dataset")
+    if x_dim not in ds.coords or y_dim not in ds.coords:
+        raise CoordinateError(
+            "linint2_dataset: the grid dimensions of ds must have "
+            "coordinates.")
+    xi = ds[x_dim].values
+    yi = ds[y_dim].values
+    xo, yo = unpack(xo, yo, RectilinearGrid, ("x", "y"), "linint2_dataset")
+    xo = _as_array(xo, ds)
+    yo = _as_array(yo, ds)
+
+    def regrid(fi):
+        return linint2(fi,
+                       xo,
+                       yo,
+                       icycx,
+                       msg=msg,
+                       meta=False,
+                       xi=xi,
+                       yi=yi,
+                       engine=engine)
+
+    return _regrid_dataset(ds, (y_dim, x_dim), regrid, (y_dim, x_dim), {
+        y_dim: yo,
+        x_dim: xo
+    })
+
+
+def rcm2rgrid_dataset(ds,
+                      lat2d,
+                      lon2d,
+                      lat1d,
+                      lon1d,
+                      msg=None,
+                      dims=None,
+                      out_dims=("lat", "lon"),
+                      engine=None,
+                      out_chunks=None):
+    """Interpolates all variables of a dataset on a curvilinear grid (i.e.
+    RCM, WRF, NARR) to a rectilinear grid.
+
+    Gives the same results as calling :func:`~geocat.ncomp.rcm2rgrid` on
+    every variable, but variables with the same dimensions and type are
+    interpolated together, with a single kernel call (or a single dask task
+    per chunk) for all of them.
+
+    Args:
+
+        ds (:class:`xarray.Dataset`):
+            A dataset whose variables on the curvilinear grid are
+            interpolated.
+
+        lat2d (:class:`numpy.ndarray` or :obj:`str`):
+            A two-dimensional array, or the name of the variable of `ds`,
+            that specifies the latitudes of the curvilinear grid. A
+            :class:`~geocat.ncomp.CurvilinearGrid` can be passed as lat2d,
+            with None as lon2d, in place of both arrays.
+
+        lon2d (:class:`numpy.ndarray` or :obj:`str`):
+            A two-dimensional array, or the name of the variable of `ds`,
+            that specifies the longitudes of the curvilinear grid.
+
+        lat1d (:class:`numpy.ndarray`):
+            A one-dimensional array that specifies the latitude coordinates
+            of the rectilinear grid. Must be monotonically increasing.
+            A :class:`~geocat.ncomp.RectilinearGrid` can be passed as lat1d,
+            with None as lon1d, in place of both arrays.
+
+        lon1d (:class:`numpy.ndarray`):
+            A one-dimensional array that specifies the longitude coordinates
+            of the rectilinear grid. Must be monotonically increasing.
+
+        msg (:obj:`numpy.number`):
+            A numpy scalar value that represent a missing value in the
+            variables.
+
+        dims (:obj:`tuple`):
+            The names (y, x) of the dimensions of the curvilinear grid.
+            Default is the dimensions of `lat2d` if it is an
+            :class:`xarray.DataArray` or the name of a variable, otherwise
+            the two rightmost dimensions of the first variable of `ds` with
+            two or more dimensions.
+
+        out_dims (:obj:`tuple`):
+            The names (lat, lon) of the dimensions of the rectilinear grid.
+            Default is ("lat", "lon").
+
+        engine (:obj:`str`):
+            Name of the engine computing the result, as for
+            :func:`~geocat.ncomp.rcm2rgrid`.
+
+        out_chunks (:obj:`tuple`):
+            Tile size (y, x) of the output when the variables are dask
+            arrays, as for :func:`~geocat.ncomp.rcm2rgrid`.
+
+    Returns:
+        :class:`xarray.Dataset`: `ds` with its variables on the curvilinear
+        grid interpolated to the rectilinear grid, whose dimensions are
+        `out_dims` with coordinates `lat1d` and `lon1d`. Variables without
+        the curvilinear grid dimensions are unchanged. Variables with only
+        one of them or of a non-numeric type, and coordinates along them
+        (such as two-dimensional latitudes and longitudes), are dropped.
+
+    Examples:
+
+        Example 1: Regridding a WRF output file
+
+        .. code-block:: python
+
+            import numpy as np
+            import xarray as xr
+            import geocat.ncomp
+
+            ds = xr.open_dataset("wrfout.nc")[["T2", "Q2", "PSFC"]]
+            out = geocat.ncomp.rcm2rgrid_dataset(
+                ds, ds.XLAT[0], ds.XLONG[0], np.arange(20, 50, 0.1),
+                np.arange(-130, -60, 0.1), dims=("south_north", "west_east"))
+    """
+    if dims is None and isinstance(lat2d, (str, xr.DataArray)):
+        dims = (ds[lat2d] if isinstance(lat2d, str) else lat2d).dims[-2:]
+    dims = _spatial_dims(ds, dims, "rcm2rgrid_dataset")
+    lat2d, lon2d = unpack(lat2d, lon2d, CurvilinearGrid, ("lat", "lon"),
+                          "rcm2rgrid_dataset")
+    lat1d, lon1d = unpack(lat1d, lon1d, RectilinearGrid, ("y", "x"),
+                          "rcm2rgrid_dataset")
+    lat2d = _as_array(lat2d, ds)
+    lon2d = _as_array(lon2d, ds)
+    lat1d = _as_array(lat1d, ds)
+    lon1d = _as_array(lon1d, ds)
+
+    def regrid(fi):
+        return rcm2rgrid(lat2d,
+                         lon2d,
+                         fi,
+                         lat1d,
+                         lon1d,
+                         msg=msg,
+                         engine=engine,
+                         out_chunks=out_chunks)
+
+    return _regrid_dataset(ds, dims, regrid, out_dims, {
+        out_dims[0]: lat1d,
+        out_dims[1]: lon1d
+    })
+
+
+def rgrid2rcm_dataset(ds,
+                      lat2d,
+                      lon2d,
+                      msg=None,
+                      dims=None,
+                      out_dims=None,
+                      engine=None,
+                      out_chunks=None):
+    """Interpolates all variables of a dataset on a rectilinear grid to a
+    curvilinear grid like those used by the RCM, WRF and NARR models.
+
+    Gives the same results as calling :func:`~geocat.ncomp.rgrid2rcm` on
+    every variable, but variables with the same dimensions and type are
+    interpolated together, with a single kernel call (or a single dask task
+    per chunk) for all of them.
+
+    Args:
+
+        ds (:class:`xarray.Dataset`):
+            A dataset whose variables on the rectilinear grid are
+            interpolated. The coordinates of the grid dimensions are the
+            latitudes and longitudes of the grid; they must be monotonically
+            increasing.
+
+        lat2d (:class:`xarray.DataArray` or :class:`numpy.ndarray`):
+            A two-dimensional array that specifies the latitudes of the
+            curvilinear grid. A :class:`~geocat.ncomp.CurvilinearGrid` can
+            be passed as lat2d, with None as lon2d, in place of both arrays.
+
+        lon2d (:class:`xarray.DataArray` or :class:`numpy.ndarray`):
+            A two-dimensional array that specifies the longitudes of the
+            curvilinear grid.
+
+        msg (:obj:`numpy.number`):
+            A numpy scalar value that represent a missing value in the
+            variables.
+
+        dims (:obj:`tuple`):
+            The names (lat, lon) of the dimensions of the rectilinear grid.
+            Default is the two rightmost dimensions of the first variable of
+            `ds` with two or more dimensions.
+
+        out_dims (:obj:`tuple`):
+            The names (y, x) of the dimensions of the curvilinear grid.
+            Default is the dimensions of `lat2d` if it is an
+            :class:`xarray.DataArray`, otherwise ("y", "x").
+
+        engine (:obj:`str`):
+            Name of the engine computing the result, as for
+            :func:`~geocat.ncomp.rgrid2rcm`.
+
+        out_chunks (:obj:`tuple`):
+            Tile size (y, x) of the output when the variables are dask
+            arrays, as for :func:`~geocat.ncomp.rgrid2rcm`.
+
+    Returns:
+        :class:`xarray.Dataset`: `ds` with its variables on the rectilinear
+        grid interpolated to the curvilinear grid, whose dimensions are
+        `out_dims`, with `lat2d` and `lon2d` as the "lat2d" and "lon2d"
+        coordinates. Variables without the rectilinear grid dimensions are
+        unchanged. Variables with only one of them or of a non-numeric type,
+        and coordinates along them, are dropped.
+
+    Examples:
+
+        Example 1: Downscaling a global analysis to a WRF grid
+
+        .. code-block:: python
+
+            import xarray as xr
+            import geocat.ncomp
+
+            gfs = xr.open_dataset("gfs.nc")[["t2m", "u10", "v10"]]
+            wrf = xr.open_dataset("wrfinput_d01")
+            out = geocat.ncomp.rgrid2rcm_dataset(gfs, wrf.XLAT[0],
+                                                 wrf.XLONG[0])
+    """
+    lat_dim, lon_dim = _spatial_dims(ds, dims, "rgrid2rcm_dataset")
+    if lat_dim not in ds.coords or lon_dim not in ds.coords:
+        raise CoordinateError(
+            "rgrid2rcm_dataset: the grid dimensions of ds must have "
+            "coordinates.")
+    if out_dims is None:
+        out_dims = lat2d.dims if isinstance(lat2d, xr.DataArray) else ("y", "x")
+    lat1d = ds[lat_dim].values
+    lon1d = ds[lon_dim].values
+    lat2d, lon2d = unpack(lat2d, lon2d, CurvilinearGrid, ("lat", "lon"),
+                          "rgrid2rcm_dataset")
+    lat2d = _as_array(lat2d, ds)
+    lon2d = _as_array(lon2d, ds)
+
+    def regrid(fi):
+        return rgrid2rcm(lat1d,
+                         lon1d,
+                         fi,
+                         lat2d,
+                         lon2d,
+                         msg=msg,
+                         engine=engine,
+                         out_chunks=out_chunks)
+
+    return _regrid_dataset(ds, (lat_dim, lon_dim), regrid, out_dims, {
+        "lat2d": (tuple(out_dims), lat2d),
+        "lon2d": (tuple(out_dims), lon2d)
+    })
@@ -1,13 +1,13 @@
 import numpy as np
 import xarray as xr
 
-from . import _ncomp
+from .engine import get_kernel
 # The following imports allow for the function name to be used directly under the package namespace, skipping the module name.
 # This is done to maintain backwards compatibily from when the functions were defined in geocat/ncomp/__init__.py
 from .errors import (AttributeError, DimensionError, MetaError)
 
 
-def dpres_plevel(plev, psfc, ptop=None, msg=None, meta=False):
+def dpres_plevel(plev, psfc, ptop=None, msg=None, meta=False, engine=None):
     """Calculates the pressure layer thicknesses of a constant pressure level coordinate system.
 
     Args:
@@ -36,6 +36,11 @@ def dpres_plevel(plev, psfc, ptop=None, msg=None, meta=False):
             default is False.
             Warning: this option is not currently supported.
 
+        engine (:obj:`str`):
+            Name of the engine computing the result, e.g. "libncomp" or
+            "numpy". Default is the engine set with
+            :func:`~geocat.ncomp.engine.set_default_engine`.
+
     Returns:
         :class:`numpy.ndarray`: If psfc is a scalar the return variable will be a
         one-dimensional array the same size as `plev`; if `psfc` is two-dimensional
@@ -114,7 +119,7 @@ def dpres_plevel(plev, psfc, ptop=None, msg=None, meta=False):
                 "ERROR dpres_plevel: The 'ptop' value must be <= min(plev) !")
 
     # call the ncomp 'dpres_plevel' function
-    result_dp = _ncomp._dpres_plevel(plev, psfc, ptop, msg)
+    result_dp = get_kernel("dpres_plevel", engine)(plev, psfc, ptop, msg)
 
     if meta and isinstance(input, xr.DataArray):
         raise MetaError(
@@ -0,0 +1,219 @@
+"""Registry of the engines that implement GeoCAT-ncomp's kernels.
+
+Every public function computes its result through one or more kernels, e.g.
+:func:`~geocat.ncomp.linint2` through the "linint2" kernel. A kernel can be
+implemented by several engines: "libncomp" (the compiled NCL routines, always
+registered), "numpy" (vectorized NumPy ports of some kernels), "numba"
+(parallel ports of the point interpolation kernels, usable when numba is
+installed) and "raster" (rcm2rgrid by rasterizing the source cells onto the
+target grid). An engine's kernel takes the same arguments and returns the same
+result as the libncomp kernel of the same name in :mod:`geocat.ncomp._ncomp`,
+except where its module documents otherwise.
+
+The engine is chosen per call with the `engine` argument of the public
+functions, or globally with :func:`set_default_engine`. A kernel that the
+default engine does not implement falls back to libncomp, and if libncomp
+cannot be imported, to any other engine that implements it with an
+:class:`~geocat.ncomp.NcompWarning` naming that engine. With libncomp as the
+default engine, a libncomp that cannot be imported raises an ImportError.
+"""
+
+import importlib
+import warnings
+
+from .errors import NcompWarning
+
+LIBNCOMP = "libncomp"
+
+# kernel name: {engine name: callable, or "module:attribute" to import lazily}
+_kernels = {
+    "dpres_plevel": {
+        "libncomp": "._ncomp:_dpres_plevel",
+        "numpy": "._numpy_engine:_dpres_plevel",
+    },
+    "eofunc": {
+        "libncomp": "._ncomp:_eofunc",
+    },
+    "eofunc_n": {
+        "libncomp": "._ncomp:_eofunc_n",
+    },
+    "eofunc_ts": {
+        "libncomp": "._ncomp:_eofunc_ts",
+    },
+    "eofunc_ts_n": {
+        "libncomp": "._ncomp:_eofunc_ts_n",
+    },
+    "grid2triple": {
+        "libncomp": "._ncomp:_grid2triple",
+        "numpy": "._numpy_engine:_grid2triple",
+    },
+    "linint2": {
+        "libncomp": "._ncomp:_linint2",
+        "numpy": "._numpy_engine:_linint2",
+    },
+    "linint2_filled": {
+        "libncomp": "._ncomp:_linint2_filled",
+    },
+    "linint2_nearest": {
+        "numpy": "._numpy_engine:_linint2_nearest",
+    },
+    "linint2_points": {
+        "libncomp": "._ncomp:_linint2_points",
+        "numba": "._numba_engine:_linint2_points",
+        "numpy": "._numpy_engine:_linint2_points",
+    },
+    "linint2_points_nearest": {
+        "numpy": "._numpy_engine:_linint2_points_nearest",
+    },
+    "moc_globe_atl": {
+        "libncomp": "._ncomp:_moc_globe_atl",
+    },
+    "rcm2points": {
+        "libncomp": "._ncomp:_rcm2points",
+        "numba": "._numba_engine:_rcm2points",
+    },
+    "rcm2rgrid": {
+        "libncomp": "._ncomp:_rcm2rgrid",
+        "raster": "._raster_engine:_rcm2rgrid",
+    },
+    "rgrid2rcm": {
+        "libncomp": "._ncomp:_rgrid2rcm",
+        "numpy": "._numpy_engine:_rgrid2rcm",
+    },
+    "triple2grid": {
+        "libncomp": "._ncomp:_triple2grid",
+    },
+}
+
+_default_engine = LIBNCOMP
+
+
+def _resolve(kernel, engine):
+    """Returns the callable registered as the `engine` engine of `kernel`."""
+    impl = _kernels[kernel][engine]
+    if isinstance(impl, str):
+        module_name, _, attr = impl.partition(":")
+        module = importlib.import_module(module_name, __package__)
+        impl = getattr(module, attr)
+        _kernels[kernel][engine] = impl
+    return impl
+
+
+def register_engine(kernel, engine, impl):
+    """Registers `impl` as the `engine` implementation of `kernel`.
+
+    Args:
+
+        kernel (:obj:`str`):
+            Name of the kernel, e.g. "linint2". See :func:`available_engines`
+            for the kernels known to the registry; a new name adds a kernel.
+
+        engine (:obj:`str`):
+            Name of the engine, e.g. "numpy".
+
+        impl (:obj:`callable` or :obj:`str`):
+            The implementation, with the signature of the libncomp kernel, or
+            a "module:attribute" string naming it, which is imported the
+            first time the kernel is used.
+    """
+    if not (callable(impl) or isinstance(impl, str)):
+        raise TypeError("register_engine: impl must be a callable or a "
+                        "'module:attribute' string")
+    _kernels.setdefault(kernel, {})[engine] = impl
+
+
+def available_engines(kernel=None):
+    """Returns the names of the registered engines.
+
+    Args:
+
+        kernel (:obj:`str`):
+            If given, only the engines implementing this kernel are returned.
+
+    Returns:
+        :obj:`list` of :obj:`str`: Engine names, "libncomp" first.
+    """
+    if kernel is not None:
+        if kernel not in _kernels:
+            raise ValueError(
+                "available_engines: unknown kernel '{}'".format(kernel))
+        names = set(_kernels[kernel])
+    else:
+        names = set().union(*_kernels.values())
+    return sorted(names, key=lambda name: (name != LIBNCOMP, name))
+
+
+def get_default_engine():
+    """Returns the name of the engine used when none is given to a call."""
+    return _default_engine
+
+
+def set_default_engine(engine):
+    """Sets the engine used when none is given to a call.
+
+    Kernels that `engine` does not implement keep using libncomp.
+
+    Args:
+
+        engine (:obj:`str`):
+            Name of a registered engine.
+
+    Returns:
+        :obj:`str`: The previous default engine.
+    """
+    global _default_engine
+    if engine not in available_engines():
+        raise ValueError(
+            "set_default_engine: unknown engine '{}'; choose from {}".format(
+                engine, ", ".join(available_engines())))
+    previous, _default_engine = _default_engine, engine
+    return previous
+
+
+def get_kernel(kernel, engine=None):
+    """Returns the implementation of `kernel` to call.
+
+    Args:
+
+        kernel (:obj:`str`):
+            Name of the kernel.
+
+        engine (:obj:`str`):
+            Name of the engine. An engine that does not implement `kernel`
+            raises a ValueError. If None, the default engine is used. If
+            that is not libncomp, it falls back to libncomp and then to the
+            other engines implementing `kernel`, in that order, if it is not
+            implemented or cannot be imported, warning with an
+            :class:`~geocat.ncomp.NcompWarning` when an engine could not be
+            imported.
+
+    Returns:
+        :obj:`callable`: The kernel implementation.
+    """
+    engines = _kernels[kernel]
+    if engine is not None:
+        if engine not in engines:
+            raise ValueError(
+                "{}: engine '{}' is not available; choose from {}".format(
+                    kernel, engine, ", ".join(available_engines(kernel))))
+        return _resolve(kernel, engine)
+
+    if _default_engine == LIBNCOMP and LIBNCOMP in engines:
+        return _resolve(kernel, LIBNCOMP)
+
+    candidates = [_default_engine] + available_engines(kernel)
+    error = None
+    for name in candidates:
+        if name not in engines:
+            continue
+        try:
+            implementation = _resolve(kernel, name)
+        except ImportError as e:
+            error = error or e
+            continue
+        if error is not None:
+            warnings.warn(
+                "{}: {}; using the '{}' engine instead".format(
+                    kernel, error, name), NcompWarning)
+        return implementation
+    raise error
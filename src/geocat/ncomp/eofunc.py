@@ -3,7 +3,7 @@ from typing import Iterable
 import numpy as np
 import xarray as xr
 
-from . import _ncomp
+from .engine import get_kernel
 
 
 def eofunc(data: Iterable, neval, **kwargs) -> xr.DataArray:
@@ -31,6 +31,8 @@ def eofunc(data: Iterable, neval, **kwargs) -> xr.DataArray:
             - ``missing_value``: a value defining the missing value. The default is ``np.nan``.
             - ``meta``:  If set to True and the input array is an Xarray, the metadata from the input array will be
                          copied to the output array; default is False.
+            - ``engine``: name of the engine computing the result, e.g. ``"libncomp"``. The default is the engine set
+                          with :func:`~geocat.ncomp.engine.set_default_engine`.
     """
 
     # Parsing Options
@@ -85,16 +87,18 @@ def eofunc(data: Iterable, neval, **kwargs) -> xr.DataArray:
         raise ValueError("neval must be a positive non-zero integer value.")
 
     if (time_dim == (np_data.ndim - 1)):
-        response = _ncomp._eofunc(np_data,
-                                  accepted_neval,
-                                  options,
-                                  missing_value=missing_value)
+        response = get_kernel("eofunc",
+                              kwargs.get("engine"))(np_data,
+                                                    accepted_neval,
+                                                    options,
+                                                    missing_value=missing_value)
     else:
-        response = _ncomp._eofunc_n(np_data,
-                                    accepted_neval,
-                                    time_dim,
-                                    options,
-                                    missing_value=missing_value)
+        response = get_kernel("eofunc_n",
+                              kwargs.get("engine"))(np_data,
+                                                    accepted_neval,
+                                                    time_dim,
+                                                    options,
+                                                    missing_value=missing_value)
 
     attrs = data.attrs if isinstance(data, xr.DataArray) and bool(
         kwargs.get("meta", False)) else {}
@@ -140,6 +144,8 @@ def eofunc_ts(data: Iterable, evec, **kwargs) -> xr.DataArray:
             - ``missing_value``: defines the missing_value. The default is ``np.nan``.
             - ``meta``: If set to True and the input array is an Xarray, the metadata from the input array will be
                         copied to the output array; default is False.
+            - ``engine``: name of the engine computing the result, e.g. ``"libncomp"``. The default is the engine set
+                          with :func:`~geocat.ncomp.engine.set_default_engine`.
 
     Returns: A two-dimensional array dimensioned by the number of eigenvalues selected in `eofunc` by the size of the
              time dimension of data. Will contain the following attribute:
@@ -228,16 +234,18 @@ def eofunc_ts(data: Iterable, evec, **kwargs) -> xr.DataArray:
         time_dim = np_data.ndim + time_dim
 
     if (time_dim == (np_data.ndim - 1)):
-        response = _ncomp._eofunc_ts(np_data,
-                                     np_evec,
-                                     options,
-                                     missing_value=missing_value)
+        response = get_kernel("eofunc_ts",
+                              kwargs.get("engine"))(np_data,
+                                                    np_evec,
+                                                    options,
+                                                    missing_value=missing_value)
     else:
-        response = _ncomp._eofunc_ts_n(np_data,
-                                       np_evec,
-                                       time_dim,
-                                       options,
-                                       missing_value=missing_value)
+        response = get_kernel("eofunc_ts_n",
+                              kwargs.get("engine"))(np_data,
+                                                    np_evec,
+                                                    time_dim,
+                                                    options,
+                                                    missing_value=missing_value)
 
     attrs = data.attrs if isinstance(data, xr.DataArray) and bool(
         kwargs.get("meta", False)) else {}
@@ -31,3 +31,14 @@ class MetaError(Error):
     """Exception raised when the support for the retention of metadata is not
      supported."""
     pass
+
+
+class NcompError(Error):
+    """Exception raised when a computational kernel reports an error."""
+    pass
+
+
+class NcompWarning(Warning):
+    """Warning issued when a computational kernel reports a problem with its
+     inputs."""
+    pass
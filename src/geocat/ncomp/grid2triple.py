@@ -1,13 +1,13 @@
 import numpy as np
 import xarray as xr
 
-from . import _ncomp
+from .engine import get_kernel
 # The following imports allow for the function name to be used directly under the package namespace, skipping the module name.
 # This is done to maintain backwards compatibily from when the functions were defined in geocat/ncomp/__init__.py
 from .errors import (DimensionError, MetaError)
 
 
-def grid2triple(x, y, z, msg=None, meta=False):
+def grid2triple(x, y, z, msg=None, meta=False, engine=None):
     """Converts a two-dimensional grid with one-dimensional coordinate variables
        to an array where each grid value is associated with its coordinates.
 
@@ -38,6 +38,11 @@ def grid2triple(x, y, z, msg=None, meta=False):
         default is False.
         Warning: this option is not currently supported.
 
+	engine (:obj:`str`):
+        Name of the engine computing the result, e.g. "libncomp" or
+        "numpy". Default is the engine set with
+        :func:`~geocat.ncomp.engine.set_default_engine`.
+
     Returns:
 	:class:`numpy.ndarray`: If any argument is "double" the return type
         will be "double"; otherwise a "float" is returned.
@@ -85,7 +90,7 @@ def grid2triple(x, y, z, msg=None, meta=False):
         z = z.values
 
     if isinstance(z, np.ndarray):
-        fo = _ncomp._grid2triple(x, y, z, msg)
+        fo = get_kernel("grid2triple", engine)(x, y, z, msg)
     else:
         raise TypeError("grid2triple: the z input argument must be a "
                         "numpy.ndarray or an xarray.DataArray containing a "
@@ -0,0 +1,316 @@
+import numpy as np
+import xarray as xr
+
+from ._numpy_engine import _coords_key, _uniform_spacing
+from ._util import _derived, _know, _negated
+from .errors import (CoordinateError, DimensionError)
+
+
+def _frozen(a):
+    """A read-only float64 copy of `a`, whose derived properties are computed
+    once however many calls it is passed to."""
+    if isinstance(a, xr.DataArray):
+        a = a.values
+    a = np.array(a, dtype=np.float64)
+    a.flags.writeable = False
+    return _know(a)
+
+
+def _direction(c, name):
+    """1 if `c` is strictly increasing, -1 if strictly decreasing."""
+    d = np.diff(c)
+    increasing = bool(np.all(d > 0))
+    decreasing = bool(np.all(d < 0))
+    # the checks of the functions `c` is passed to
+    _derived(c, "increasing", lambda: increasing)
+    _derived(c, "decreasing", lambda: decreasing)
+    if increasing:
+        return 1
+    if decreasing:
+        return -1
+    raise CoordinateError(
+        "{} must be strictly monotonically increasing or decreasing".format(
+            name))
+
+
+class _Descriptor:
+    """Base of the immutable coordinate descriptors.
+
+    Derived properties are computed on first access and cached; equality and
+    hashing are by content.
+    """
+
+    __slots__ = ("_arrays", "_cache")
+
+    def __init__(self, **arrays):
+        object.__setattr__(self, "_arrays", arrays)
+        object.__setattr__(self, "_cache", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("{} is immutable".format(type(self).__name__))
+
+    def __getattr__(self, name):
+        arrays = object.__getattribute__(self, "_arrays")
+        if name in arrays:
+            return arrays[name]
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+            type(self).__name__, name))
+
+    def _cached(self, name, compute):
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    @property
+    def key(self):
+        """:obj:`bytes`: Digest of the coordinates, equal for descriptors of
+        the same type with the same coordinate values."""
+        return self._cached(
+            "key", lambda: _coords_key(np.array(type(self).__name__),
+                                       *self._arrays.values()))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return "{}({})".format(
+            type(self).__name__,
+            ", ".join("{}=<{} values>".format(name, a.size)
+                      for name, a in self._arrays.items()))
+
+
+def _bbox(lat, lon):
+    return (float(np.nanmin(lat)), float(np.nanmax(lat)), float(np.nanmin(lon)),
+            float(np.nanmax(lon)))
+
+
+class RectilinearGrid(_Descriptor):
+    """A validated, immutable rectilinear grid.
+
+    Functions taking the coordinates of a rectilinear grid as a pair of
+    arguments, such as `xi` and `yi` of :func:`~geocat.ncomp.linint2` or
+    `lat1d` and `lon1d` of :func:`~geocat.ncomp.rcm2rgrid`, also accept a
+    RectilinearGrid as the first argument of the pair, with None (the
+    default, if there is one) as the second. The coordinates are validated
+    once, when the grid is created, and its derived properties are computed
+    once, when they are first used.
+
+    Args:
+
+        x (:class:`numpy.ndarray`):
+            A one-dimensional, strictly monotonic array of at least two X
+            (longitude) coordinates.
+
+        y (:class:`numpy.ndarray`):
+            A one-dimensional, strictly monotonic array of at least two Y
+            (latitude) coordinates.
+
+    Examples:
+
+        Example 1: Regridding every time step to the same grid
+
+        .. code-block:: python
+
+            import numpy as np
+            import geocat.ncomp
+
+            src = geocat.ncomp.RectilinearGrid(ds.lon, ds.lat)
+            dst = geocat.ncomp.RectilinearGrid(np.arange(0, 360, 0.5),
+                                               np.arange(-90, 90.1, 0.5))
+            for t in ds.time:
+                fo = geocat.ncomp.linint2(ds.T.sel(time=t), dst, None, 1,
+                                          xi=src)
+    """
+
+    __slots__ = ()
+
+    def __init__(self, x, y):
+        x = _frozen(x)
+        y = _frozen(y)
+        if x.ndim != 1 or y.ndim != 1 or x.size < 2 or y.size < 2:
+            raise DimensionError(
+                "ERROR RectilinearGrid: x and y must be one-dimensional with "
+                "at least 2 elements !")
+        super().__init__(x=x, y=y)
+        self._cache["x_direction"] = _direction(x, "RectilinearGrid: x")
+        self._cache["y_direction"] = _direction(y, "RectilinearGrid: y")
+
+    @property
+    def lon(self):
+        """:class:`numpy.ndarray`: The X coordinates."""
+        return self.x
+
+    @property
+    def lat(self):
+        """:class:`numpy.ndarray`: The Y coordinates."""
+        return self.y
+
+    @property
+    def shape(self):
+        """:obj:`tuple`: The shape (ny, nx) of fields on the grid."""
+        return (self.y.size, self.x.size)
+
+    @property
+    def x_direction(self):
+        """:obj:`int`: 1 if x is increasing, -1 if it is decreasing."""
+        return self._cache["x_direction"]
+
+    @property
+    def y_direction(self):
+        """:obj:`int`: 1 if y is increasing, -1 if it is decreasing."""
+        return self._cache["y_direction"]
+
+    @property
+    def x_spacing(self):
+        """:obj:`float`: The spacing of x if it is equally spaced, else
+        None."""
+        return self._cached("x_spacing",
+                            lambda: self._spacing(self.x, self.x_direction))
+
+    @property
+    def y_spacing(self):
+        """:obj:`float`: The spacing of y if it is equally spaced, else
+        None."""
+        return self._cached("y_spacing",
+                            lambda: self._spacing(self.y, self.y_direction))
+
+    @staticmethod
+    def _spacing(c, direction):
+        # the spacing linint2 finds for its increasing coordinates
+        uniform = _uniform_spacing(c if direction > 0 else _negated(c))
+        return None if uniform is None else float(uniform[1])
+
+    @property
+    def cyclic(self):
+        """:obj:`bool`: True if x is equally spaced and spans the globe,
+        i.e. x[-1] + spacing is x[0] + 360, as for the `icycx` argument of
+        :func:`~geocat.ncomp.linint2`."""
+
+        def compute():
+            dx = self.x_spacing
+            if dx is None:
+                return False
+            return bool(
+                abs(abs(self.x[-1] - self.x[0]) + dx - 360.0) < 0.01 * dx)
+
+        return self._cached("cyclic", compute)
+
+    @property
+    def bbox(self):
+        """:obj:`tuple`: (min y, max y, min x, max x)."""
+        return self._cached("bbox", lambda: _bbox(self.y, self.x))
+
+
+class CurvilinearGrid(_Descriptor):
+    """A validated, immutable curvilinear grid (e.g. RCM, WRF, NARR).
+
+    Functions taking `lat2d` and `lon2d` arguments, such as
+    :func:`~geocat.ncomp.rcm2rgrid`, also accept a CurvilinearGrid as
+    `lat2d`, with None as `lon2d`.
+
+    Args:
+
+        lat (:class:`numpy.ndarray`):
+            A two-dimensional array of the latitudes of the grid points, of
+            at least 2 x 2 points.
+
+        lon (:class:`numpy.ndarray`):
+            A two-dimensional array of the longitudes of the grid points, of
+            the same shape as `lat`.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, lat, lon):
+        lat = _frozen(lat)
+        lon = _frozen(lon)
+        if lat.ndim != 2 or lat.shape != lon.shape:
+            raise DimensionError(
+                "ERROR CurvilinearGrid: lat and lon must be two-dimensional "
+                "and of the same shape !")
+        if min(lat.shape) < 2:
+            raise DimensionError(
+                "ERROR CurvilinearGrid: the grid must have at least 2 points "
+                "in each dimension !")
+        super().__init__(lat=lat, lon=lon)
+
+    @property
+    def shape(self):
+        """:obj:`tuple`: The shape (ny, nx) of fields on the grid."""
+        return self.lat.shape
+
+    @property
+    def bbox(self):
+        """:obj:`tuple`: (min lat, max lat, min lon, max lon)."""
+        return self._cached("bbox", lambda: _bbox(self.lat, self.lon))
+
+
+class PointSet(_Descriptor):
+    """A validated, immutable set of locations.
+
+    Functions taking the coordinates of scattered locations as a pair of
+    arguments, such as `xo` and `yo` of
+    :func:`~geocat.ncomp.linint2_points` or `lat1dPoints` and `lon1dPoints`
+    of :func:`~geocat.ncomp.rcm2points`, also accept a PointSet as the first
+    argument of the pair, with None as the second.
+
+    Args:
+
+        x (:class:`numpy.ndarray`):
+            A one-dimensional array of the X (longitude) coordinates of the
+            locations.
+
+        y (:class:`numpy.ndarray`):
+            A one-dimensional array of the Y (latitude) coordinates of the
+            locations, of the same size as `x`.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, x, y):
+        x = _frozen(x)
+        y = _frozen(y)
+        if x.ndim != 1 or x.shape != y.shape:
+            raise DimensionError(
+                "ERROR PointSet: x and y must be one-dimensional and of the "
+                "same size !")
+        super().__init__(x=x, y=y)
+
+    @property
+    def lon(self):
+        """:class:`numpy.ndarray`: The X coordinates."""
+        return self.x
+
+    @property
+    def lat(self):
+        """:class:`numpy.ndarray`: The Y coordinates."""
+        return self.y
+
+    @property
+    def size(self):
+        """:obj:`int`: The number of locations."""
+        return self.x.size
+
+    @property
+    def bbox(self):
+        """:obj:`tuple`: (min y, max y, min x, max x)."""
+        return self._cached("bbox", lambda: _bbox(self.y, self.x))
+
+
+def unpack(first, second, cls, order, name):
+    """Coordinate arrays of the pair of arguments (`first`, `second`).
+
+    If `first` is a `cls` descriptor, `second` must be None and its
+    coordinates are returned in `order`, a pair of attribute names, e.g.
+    ("y", "x"); otherwise the arguments are returned as they are.
+    """
+    if not isinstance(first, _Descriptor):
+        return first, second
+    if not isinstance(first, cls) or second is not None:
+        raise CoordinateError(
+            "{}: a {} must be passed in place of both arrays of the pair, "
+            "with None as the second".format(name, cls.__name__))
+    return tuple(getattr(first, attr) for attr in order)
@@ -1,22 +1,45 @@
-import dask.array as da
+import concurrent.futures
+
 import numpy as np
 import xarray as xr
-from dask.array.core import map_blocks
 
-from . import _ncomp
+from .engine import LIBNCOMP, get_default_engine, get_kernel
+from ._tiling import (compact_cells, rectilinear_window, regrid_masked,
+                      source_crop, target_cells)
+from ._numpy_engine import _missing_value
+from ._staging import restore_dims, spatial_last, stage
+from ._util import (_decreasing, _is_dask_array, _method_kernel, _negated,
+                    _reverse, _sliced)
 # The following imports allow for the function name to be used directly under the package namespace, skipping the module name.
 # This is done to maintain backwards compatibily from when the functions were defined in geocat/ncomp/__init__.py
 from .errors import (ChunkError, CoordinateError)
-
-
-def linint2(fi, xo, yo, icycx, msg=None, meta=True, xi=None, yi=None):
+from .grids import RectilinearGrid, unpack
+
+
+def linint2(fi,
+            xo,
+            yo,
+            icycx,
+            msg=None,
+            meta=True,
+            xi=None,
+            yi=None,
+            engine=None,
+            target_mask=None,
+            compact=False,
+            method="linear",
+            x_dim=None,
+            y_dim=None,
+            staging=None):
     """Interpolates a regular grid to a rectilinear one using bi-linear
     interpolation.
 
     linint2 uses bilinear interpolation to interpolate from one
     rectilinear grid to another. The input grid may be cyclic in the x
     direction. The interpolation is first performed in the x direction,
-    and then in the y direction.
+    and then in the y direction. Only the part of fi around the output grid
+    is read, so a small region of a global grid costs in proportion to the
+    region.
 
     Args:
 
@@ -43,7 +66,7 @@ def linint2(fi, xo, yo, icycx, msg=None, meta=True, xi=None, yi=None):
         xo (:class:`xarray.DataArray` or :class:`numpy.ndarray`):
             A one-dimensional array that specifies the X coordinates of
             the return array. It must be strictly monotonically
-            increasing, but may be unequally spaced.
+            increasing or decreasing, but may be unequally spaced.
 
             For geo-referenced data, xo is generally the longitude
             array.
@@ -53,10 +76,13 @@ def linint2(fi, xo, yo, icycx, msg=None, meta=True, xi=None, yi=None):
             coordinates will be set to missing (i.e. no extrapolation is
             performed).
 
+            A :class:`~geocat.ncomp.RectilinearGrid` can be passed as xo,
+            with None as yo, in place of both arrays.
+
         yo (:class:`xarray.DataArray` or :class:`numpy.ndarray`):
             A one-dimensional array that specifies the Y coordinates of
             the return array. It must be strictly monotonically
-            increasing, but may be unequally spaced.
+            increasing or decreasing, but may be unequally spaced.
 
             For geo-referenced data, yo is generally the latitude array.
 
@@ -73,6 +99,11 @@ def linint2(fi, xo, yo, icycx, msg=None, meta=True, xi=None, yi=None):
             values go from, say, -179.75 to 179.75, or 0.5 to 359.5,
             then you would set this to True.
 
+            If set, xo may use another longitude convention than xi, e.g.
+            -180 to 180 for xi going from 0 to 360: xo is shifted by
+            multiples of 360 into the range of xi, and only the output
+            columns are put back in the order of xo, fi is not rearranged.
+
         msg (:obj:`numpy.number`):
             A numpy scalar value that represent a missing value in fi.
             This argument allows a user to use a missing value scheme
@@ -86,9 +117,10 @@ def linint2(fi, xo, yo, icycx, msg=None, meta=True, xi=None, yi=None):
         xi (:class:`numpy.ndarray`):
             An array that specifies the X coordinates of the fi array.
             Most frequently, this is a 1D strictly monotonically
-            increasing array that may be unequally spaced. In some
-            cases, xi can be a multi-dimensional array (see next
-            paragraph). The rightmost dimension (call it nxi) must have
+            increasing or decreasing array that may be unequally spaced.
+            A decreasing xi (e.g. longitudes from east to west) is handled
+            without reordering fi. In some cases, xi can be a
+            multi-dimensional array (see next paragraph). The rightmost dimension (call it nxi) must have
             at least two elements, and is the last (fastest varying)
             dimension of fi.
 
@@ -100,6 +132,9 @@ def linint2(fi, xo, yo, icycx, msg=None, meta=True, xi=None, yi=None):
             For geo-referenced data, xi is generally the longitude
             array.
 
+            A :class:`~geocat.ncomp.RectilinearGrid` can be passed as xi,
+            with yi left unspecified, in place of both arrays.
+
             Note:
                 If fi is of type :class:`xarray.DataArray` and xi is
                 left unspecified, then the rightmost coordinate
@@ -111,8 +146,9 @@ def linint2(fi, xo, yo, icycx, msg=None, meta=True, xi=None, yi=None):
         yi (:class:`numpy.ndarray`):
             An array that specifies the Y coordinates of the fi array.
             Most frequently, this is a 1D strictly monotonically
-            increasing array that may be unequally spaced. In some
-            cases, yi can be a multi-dimensional array (see next
+            increasing or decreasing array that may be unequally spaced.
+            A decreasing yi (e.g. latitudes from north to south) is
+            handled without reordering fi. In some cases, yi can be a multi-dimensional array (see next
             paragraph). The rightmost dimension (call it nyi) must have
             at least two elements, and is the second-to-last dimension
             of fi.
@@ -132,6 +168,58 @@ def linint2(fi, xo, yo, icycx, msg=None, meta=True, xi=None, yi=None):
                 mandatory parameter. This parameter must be specified as
                 a keyword argument.
 
+        engine (:obj:`str`):
+            Name of the engine computing the result, e.g. "libncomp" or
+            "numpy". Default is the engine set with
+            :func:`~geocat.ncomp.engine.set_default_engine`.
+
+        target_mask (:class:`numpy.ndarray`):
+            The output cells to compute, as a boolean array of shape
+            (len(yo), len(xo)) or as an array of flat indices of the active
+            cells. Only the output tiles holding active cells are
+            interpolated, and all inactive cells are missing (NaN). Default
+            is every cell.
+
+        compact (:obj:`bool`):
+            If True, only the values of the active cells of `target_mask`
+            are returned, along a "cell" dimension replacing the two
+            rightmost ones, ordered like the flat indices of `target_mask`,
+            or in C order if it is boolean. With `meta`, the X and Y
+            coordinates of the cells are coordinates along "cell". Default
+            is False.
+
+        method (:obj:`str`):
+            "linear" (the default) for bilinear interpolation, or "nearest"
+            to take the value of the nearest point of fi, e.g. for
+            categorical fields. "nearest" is only implemented by the "numpy"
+            engine, honors `icycx`, and keeps the type of fi: missing values
+            of an integer result are `msg` instead of NaN, or if `msg` is
+            None the smallest value of a signed integer type and the largest
+            value of an unsigned one, as 0 is usually a valid class.
+
+        x_dim (:obj:`str` or :obj:`int`):
+            Name or index of the X dimension of fi. Default is the rightmost
+            dimension.
+
+        y_dim (:obj:`str` or :obj:`int`):
+            Name or index of the Y dimension of fi. Default is the second
+            rightmost dimension.
+
+            If x_dim and y_dim are not the two rightmost dimensions, e.g.
+            for a (lat, lon, time) fi, fi is not transposed into a copy: the
+            other dimensions are interpolated a block at a time, and the
+            output has the dimension order of fi. A compact output has its
+            "cell" dimension last.
+
+        staging (:obj:`bool` or :obj:`int`):
+            How a numpy fi is passed to the kernel. If None (the default), a
+            fi that is not C-contiguous, e.g. a strided view, or that is
+            memory-mapped, is interpolated a block of its leading dimensions
+            (about 64 MiB) at a time, each copied into one reused contiguous
+            buffer, rather than copied whole. True always stages fi, a
+            number always stages it in blocks of that many bytes, and False
+            passes fi to the kernel whole.
+
     Returns:
         :class:`xarray.DataArray`: The interpolated grid. If the *meta*
         parameter is True, then the result will include named dimensions
@@ -139,7 +227,7 @@ def linint2(fi, xo, yo, icycx, msg=None, meta=True, xi=None, yi=None):
         dimensions as fi, except for the rightmost two dimensions which
         will have the same dimension sizes as the lengths of yo and xo.
         The return type will be double if fi is double, and float
-        otherwise.
+        otherwise, or the type of fi if `method` is "nearest".
 
     Examples:
 
@@ -175,6 +263,9 @@ def linint2(fi, xo, yo, icycx, msg=None, meta=True, xi=None, yi=None):
 
     """
 
+    xo, yo = unpack(xo, yo, RectilinearGrid, ("x", "y"), "linint2")
+    xi, yi = unpack(xi, yi, RectilinearGrid, ("x", "y"), "linint2")
+
     if not isinstance(fi, xr.DataArray):
         fi = xr.DataArray(fi)
         if xi is None or yi is None:
@@ -182,6 +273,9 @@ def linint2(fi, xo, yo, icycx, msg=None, meta=True, xi=None, yi=None):
                 "linint2: arguments xi and yi must be passed"
                 " explicitly if fi is not an xarray.DataArray.")
 
+    # fi with x_dim and y_dim rightmost, as a view
+    fi, dims = spatial_last(fi, x_dim, y_dim, "linint2")
+
     # duplicate fragment #1 start
     if xi is None:
         xi = fi.coords[fi.dims[-1]].values
@@ -200,7 +294,44 @@ def linint2(fi, xo, yo, icycx, msg=None, meta=True, xi=None, yi=None):
     # duplicate fragement #1 end
     fi_data = fi.data
 
-    if isinstance(fi_data, da.Array):
+    # the kernels get increasing coordinates, and cyclic ones get xo in the
+    # longitude range of xi; fi is never reordered for that
+    xi_k, xo_k, flip_x = _increasing(xi, xo)
+    yi_k, yo_k, flip_y = _increasing(yi, yo)
+    xo_k, unwrap = _wrapped(xi_k, xo_k, icycx)
+
+    # only the part of fi around the output grid is interpolated
+    icycx_k = icycx
+    crop = _crop(xi_k, yi_k, xo_k, yo_k, icycx)
+    if crop is not None:
+        (sy, sx), icycx_k = crop
+        xi_k, yi_k = _sliced(xi_k, sx), _sliced(yi_k, sy)
+        fi_data = fi_data[..., sy, sx]
+
+    kernel = get_kernel(_method_kernel("linint2", method), engine)
+    # nearest neighbors keep the type of fi, linear interpolation is float
+    if method == "nearest":
+        fo_dtype = fi.dtype
+    else:
+        fo_dtype = np.float64 if fi.dtype == np.float64 else np.float32
+    mask = None
+    if target_mask is not None:
+        mask, cells = target_cells(target_mask, (np.size(yo), np.size(xo)),
+                                   "linint2")
+        # the mask of the cells in the order they are computed in
+        mask = _reverse(mask, flip_y, flip_x)
+        if unwrap is not None:
+            mask = mask[:, np.argsort(unwrap)]
+        missing = np.nan if method == "linear" else _missing_value(
+            fi.dtype, msg)
+        masked = (_tile_kernel(kernel, icycx_k), (yi_k, xi_k), (yo_k, xo_k),
+                  msg, mask, _whole_grid, fo_dtype, missing)
+    elif compact:
+        raise ValueError("linint2: compact requires a target_mask")
+
+    if _is_dask_array(fi_data):
+        from dask.array.core import map_blocks
+
         chunks = list(fi.chunks)
 
         # ensure rightmost dimensions of input are not chunked
@@ -212,40 +343,608 @@ def linint2(fi, xo, yo, icycx, msg=None, meta=True, xi=None, yi=None):
         chunks[-2:] = (yo.shape, xo.shape)
 
         # map_blocks maps each chunk of fi_data to a separate invocation of
-        # _ncomp._linint2. The "chunks" keyword argument should be the chunked
+        # the linint2 kernel. The "chunks" keyword argument should be the chunked
         # dimensionality of the expected output; the number of chunks should
         # match that of fi_data. Additionally, "drop_axis" and "new_axis" in
         # this case indicate that the two rightmost dimensions of the input
         # will be dropped from the output array, and that two new axes will be
         # added instead.
-        fo = map_blocks(_ncomp._linint2,
-                        xi,
-                        yi,
-                        fi_data,
-                        xo,
-                        yo,
-                        icycx,
-                        msg,
-                        chunks=chunks,
-                        dtype=fi.dtype,
-                        drop_axis=[fi.ndim - 2, fi.ndim - 1],
-                        new_axis=[fi.ndim - 2, fi.ndim - 1])
+        if mask is not None:
+            fo = map_blocks(_regrid_masked_block,
+                            fi_data,
+                            *masked,
+                            chunks=chunks,
+                            dtype=fo_dtype,
+                            drop_axis=[fi.ndim - 2, fi.ndim - 1],
+                            new_axis=[fi.ndim - 2, fi.ndim - 1])
+        else:
+            fo = map_blocks(kernel,
+                            xi_k,
+                            yi_k,
+                            fi_data,
+                            xo_k,
+                            yo_k,
+                            icycx_k,
+                            msg,
+                            chunks=chunks,
+                            dtype=fo_dtype,
+                            drop_axis=[fi.ndim - 2, fi.ndim - 1],
+                            new_axis=[fi.ndim - 2, fi.ndim - 1])
     elif isinstance(fi_data, np.ndarray):
-        fo = _ncomp._linint2(xi, yi, fi_data, xo, yo, icycx, msg)
+
+        def interpolate(fi_block):
+            if mask is not None:
+                # only the output tiles holding active cells are interpolated
+                return _regrid_masked_block(fi_block, *masked)
+            return kernel(xi_k, yi_k, fi_block, xo_k, yo_k, icycx_k, msg)
+
+        # a transposed or strided fi is copied a block at a time
+        fo = stage(interpolate, fi_data, staging, "linint2")
     else:
         raise TypeError("linint2: the fi input argument must be a "
                         "numpy.ndarray, a dask.array.Array, or an "
                         "xarray.DataArray containing either a numpy.ndarray or"
                         " a dask.array.Array.")
 
+    if unwrap is not None:
+        fo = fo[..., unwrap]
+    fo = _reverse(fo, flip_y, flip_x)
+    if compact:
+        return _wrap_cells(compact_cells(fo, cells), fi, xo, yo, cells, meta)
+    fo = _wrap(fo, fi, xo, yo, meta)
+    if dims is not None:
+        fo = restore_dims(fo, fi, dims)
+    return fo
+
+
+def _whole_grid(*args):
+    """Slices (y, x) of all of fi, for :func:`regrid_masked`; the kernel of
+    :func:`_tile_kernel` crops fi itself."""
+    return slice(None), slice(None)
+
+
+def _tile_kernel(kernel, icycx):
+    """Returns the linint2 `kernel` with the arguments of the kernels of
+    :func:`regrid_masked`, interpolating each output tile from the part of
+    fi around it."""
+
+    def tile_kernel(yi, xi, fi, yo, xo, msg):
+        icycx_tile = icycx
+        crop = _crop(xi, yi, xo, yo, icycx)
+        if crop is not None:
+            (sy, sx), icycx_tile = crop
+            xi, yi, fi = xi[sx], yi[sy], fi[..., sy, sx]
+        return kernel(xi, yi, fi, xo, yo, icycx_tile, msg)
+
+    return tile_kernel
+
+
+def _regrid_masked_block(fi, kernel, src, dst, msg, mask, window, dtype,
+                         missing):
+    """:func:`regrid_masked` with `fi` first, for :func:`map_blocks`."""
+    return regrid_masked(kernel,
+                         fi,
+                         src,
+                         dst,
+                         msg,
+                         mask,
+                         window,
+                         dtype,
+                         missing=missing)
+
+
+def _wrap_cells(fo, fi, xo, yo, cells, meta):
+    """Returns the values `fo` of the output `cells` as a
+    :class:`xarray.DataArray` with a "cell" dimension, with the other
+    dimensions, coordinates and attributes of `fi` and the coordinates of
+    the cells if `meta` is True."""
+    if meta:
+        y_dim, x_dim = fi.dims[-2:]
+        coords = {
+            k: v
+            for (k, v) in fi.coords.items()
+            if y_dim not in v.dims and x_dim not in v.dims
+        }
+        iy, ix = np.divmod(cells, np.size(xo))
+        coords[y_dim] = ("cell", np.asarray(yo)[iy])
+        coords[x_dim] = ("cell", np.asarray(xo)[ix])
+        return xr.DataArray(fo,
+                            attrs=fi.attrs,
+                            dims=fi.dims[:-2] + ("cell",),
+                            coords=coords)
+    return xr.DataArray(fo)
+
+
+def _wrap(fo, fi, xo, yo, meta):
+    """Returns `fo` as a :class:`xarray.DataArray`, with the dimensions,
+    coordinates and attributes of `fi` if `meta` is True."""
     if meta:
         coords = {
             k: v if k not in fi.dims[-2:] else (xo if k == fi.dims[-1] else yo)
             for (k, v) in fi.coords.items()
         }
 
-        fo = xr.DataArray(fo, attrs=fi.attrs, dims=fi.dims, coords=coords)
+        return xr.DataArray(fo, attrs=fi.attrs, dims=fi.dims, coords=coords)
+    return xr.DataArray(fo)
+
+
+def _prepare(fi, msg, fill=None):
+    """Returns `fi` as a C-contiguous float array with its missing values
+    set to NaN, or to `fill` if given, copied only if that is needed.
+
+    Double input stays double; float input stays float; other types become
+    double, so that no integer is rounded before the interpolation.
+    """
+    dtype = np.float32 if fi.dtype == np.float32 else np.float64
+    out = np.ascontiguousarray(fi, dtype=dtype)
+    if msg is None or np.isnan(msg):
+        if fill is None:
+            return out
+        missing = np.isnan(out)
     else:
-        fo = xr.DataArray(fo)
+        missing = fi == msg
+    if missing.any():
+        if out is fi:
+            out = out.copy()
+        out[missing] = np.nan if fill is None else fill
+    return out
+
+
+# the netCDF default fill values, which libncomp uses for missing values
+_NC_FILL = {
+    np.dtype(np.float32): np.float32(9.9692099683868690e+36),
+    np.dtype(np.float64): np.float64(9.9692099683868690e+36),
+}
+
+
+def _prepared_kernel(engine, dtype):
+    """Returns the linint2 kernel of `engine` for an fi of `dtype` prepared
+    once by :func:`_prepare` for several calls, and the `fill` to prepare
+    it with.
+
+    The libncomp linint2 kernel scans fi for missing values and rewrites
+    them in place on every call. Its variant for an fi whose missing values
+    are already set to the netCDF fill value does neither, and leaves fi
+    unchanged, so that calls on several threads can share it.
+    """
+    if (engine or get_default_engine()) == LIBNCOMP:
+        fill = _NC_FILL[np.dtype(np.float32 if dtype ==
+                                 np.float32 else np.float64)]
+        return get_kernel("linint2_filled", LIBNCOMP), fill
+    return get_kernel("linint2", engine), None
 
-    return fo
+
+def _increasing(ci, co):
+    """Returns the coordinates `ci` of an axis of fi and `co` of the same axis
+    of the output made increasing, without reordering any data.
+
+    A decreasing `ci` is negated together with `co`, which leaves the
+    interpolation weights unchanged. If `co` is then decreasing, it is
+    reversed and the returned flag is True: the output of the kernel must
+    then be reversed back along that axis.
+    """
+    if _decreasing(ci):
+        ci, co = _negated(ci), _negated(co)
+    if _decreasing(co):
+        return ci, _sliced(co, slice(None, None, -1)), True
+    return ci, co, False
+
+
+def _wrapped(xi, xo, icycx):
+    """Returns the target longitudes `xo` moved into the cyclic source
+    longitudes `xi`, and the indices putting the output columns back in the
+    order of `xo`.
+
+    Only if the source is cyclic and `xo` reaches past `xi` padded by one
+    spacing on each side, e.g. with -180 to 180 targets for 0 to 360
+    sources, is `xo` shifted by multiples of 360 into [xi[0], xi[0] + 360)
+    and sorted; otherwise, or if the shifted values are not distinct, `xo`
+    is returned as it is with None as indices.
+    """
+    if not icycx or np.ndim(xi) != 1 or np.size(xi) < 2 or np.size(xo) == 0:
+        return xo, None
+    xi = np.asarray(xi, dtype=np.float64)
+    xo = np.asarray(xo, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        if (np.nanmin(xo) >= 2 * xi[0] - xi[1] and
+                np.nanmax(xo) <= 2 * xi[-1] - xi[-2]):
+            return xo, None
+        shifted = xi[0] + np.mod(xo - xi[0], 360.0)
+        order = np.argsort(shifted, kind="stable")
+        shifted = shifted[order]
+        if not np.all(np.diff(shifted) > 0):
+            return xo, None
+    return shifted, np.argsort(order)
+
+
+def _crop(xi, yi, xo, yo, icycx):
+    """Returns the slices (y, x) of fi holding the output grid (`xo`, `yo`)
+    with a halo of one point, and the icycx to interpolate that part of fi
+    with, or None if all of fi is needed.
+
+    A cyclic fi is only cropped in x if no output point is interpolated
+    across its wrap around; the cropped part is then not cyclic.
+    """
+    if np.ndim(xi) != 1 or np.ndim(yi) != 1:
+        return None
+    crop = source_crop((yi, xi), (yo, xo), rectilinear_window)
+    if crop is None:
+        return None
+    sy, sx = crop
+    if icycx:
+        nx = np.size(xi)
+        start, stop = sx.indices(nx)[:2]
+        if (start == 0 or stop == nx or np.min(xo) < xi[0] or
+                np.max(xo) > xi[-1]):
+            if sy.indices(np.size(yi))[:2] == (0, np.size(yi)):
+                return None
+            return (sy, slice(None)), icycx
+    return (sy, sx), 0
+
+
+def _interpolate(kernel, xi, yi, fi, xo, yo, icycx, fo_dtype, msg=None):
+    """Calls the linint2 `kernel` on `fi` prepared by :func:`_prepare` with
+    `msg` as fill, returning the output type of `fi` before it was
+    prepared."""
+    xi, xo, flip_x = _increasing(xi, xo)
+    yi, yo, flip_y = _increasing(yi, yo)
+    xo, unwrap = _wrapped(xi, xo, icycx)
+    crop = _crop(xi, yi, xo, yo, icycx)
+    if crop is not None:
+        (sy, sx), icycx = crop
+        xi, yi, fi = _sliced(xi, sx), _sliced(yi, sy), fi[..., sy, sx]
+    fo = kernel(xi, yi, fi, xo, yo, icycx, msg).astype(fo_dtype, copy=False)
+    if unwrap is not None:
+        fo = fo[..., unwrap]
+    return _reverse(fo, flip_y, flip_x)
+
+
+def _targets(targets):
+    """The (xo, yo) arrays of the target grids of :func:`linint2_multi`."""
+    return [(target.x,
+             target.y) if isinstance(target, RectilinearGrid) else tuple(
+                 c.values if isinstance(c, xr.DataArray) else c
+                 for c in target)
+            for target in targets]
+
+
+def linint2_multi(fi,
+                  targets,
+                  icycx,
+                  msg=None,
+                  meta=True,
+                  xi=None,
+                  yi=None,
+                  engine=None,
+                  workers=1):
+    """Interpolates a regular grid to several rectilinear grids using
+    bi-linear interpolation.
+
+    Gives the same results as calling :func:`linint2` once per target
+    grid, but `fi` is read, converted to a contiguous floating point array
+    and scanned for missing values only once, rather than once per target
+    grid.
+
+    Args:
+
+        fi (:class:`xarray.DataArray` or :class:`numpy.ndarray`):
+            An array of two or more dimensions, as for :func:`linint2`.
+
+        targets (:obj:`list`):
+            The target grids, as (xo, yo) pairs of one-dimensional arrays
+            that are strictly monotonic, or as
+            :class:`~geocat.ncomp.RectilinearGrid` objects.
+
+        icycx (:obj:`bool`):
+            An option to indicate whether the rightmost dimension of fi
+            is cyclic, as for :func:`linint2`.
+
+        msg (:obj:`numpy.number`):
+            A numpy scalar value that represent a missing value in fi.
+
+        meta (:obj:`bool`):
+            If set to True and the input array is an Xarray, the metadata
+            from the input array will be copied to the output arrays.
+
+        xi (:class:`numpy.ndarray`):
+            An array that specifies the X coordinates of the fi array, as
+            for :func:`linint2`.
+
+        yi (:class:`numpy.ndarray`):
+            An array that specifies the Y coordinates of the fi array, as
+            for :func:`linint2`.
+
+        engine (:obj:`str`):
+            Name of the engine computing the result, e.g. "libncomp" or
+            "numpy". Default is the engine set with
+            :func:`~geocat.ncomp.engine.set_default_engine`.
+
+        workers (:obj:`int`):
+            Number of target grids interpolated at the same time, in
+            separate threads, when `fi` is not a dask array; the libncomp
+            and NumPy kernels release the GIL while they compute. Default
+            is 1. The threads share `fi` as prepared once, with its missing
+            values set, which no kernel modifies. Dask arrays are computed
+            by the dask scheduler, which also prepares every chunk of `fi`
+            only once when the results are computed together (e.g. with
+            :func:`dask.compute`).
+
+    Returns:
+        :obj:`list` of :class:`xarray.DataArray`: The interpolated grids, in
+        the order of `targets`, as returned by :func:`linint2`.
+
+    Examples:
+
+        Example 1: Regridding a field to three resolutions
+
+        .. code-block:: python
+
+            import numpy as np
+            import geocat.ncomp
+
+            targets = [(np.arange(0, 360, res), np.arange(-90, 90.1, res))
+                       for res in (0.25, 0.5, 1.0)]
+            fo_025, fo_05, fo_1 = geocat.ncomp.linint2_multi(fi, targets, 1)
+    """
+
+    xi, yi = unpack(xi, yi, RectilinearGrid, ("x", "y"), "linint2_multi")
+
+    if not isinstance(fi, xr.DataArray):
+        fi = xr.DataArray(fi)
+        if xi is None or yi is None:
+            raise CoordinateError(
+                "linint2_multi: arguments xi and yi must be passed"
+                " explicitly if fi is not an xarray.DataArray.")
+
+    if xi is None:
+        xi = fi.coords[fi.dims[-1]].values
+    elif isinstance(xi, xr.DataArray):
+        xi = xi.values
+
+    if yi is None:
+        yi = fi.coords[fi.dims[-2]].values
+    elif isinstance(yi, xr.DataArray):
+        yi = yi.values
+
+    targets = _targets(targets)
+    kernel, fill = _prepared_kernel(engine, fi.dtype)
+    fi_data = fi.data
+    fo_dtype = np.float64 if fi.dtype == np.float64 else np.float32
+
+    if _is_dask_array(fi_data):
+        from dask.array.core import map_blocks
+
+        chunks = list(fi.chunks)
+
+        # ensure rightmost dimensions of input are not chunked
+        if chunks[-2:] != [yi.shape, xi.shape]:
+            raise ChunkError("linint2_multi: the two rightmost dimensions of "
+                             "fi must not be chunked.")
+
+        # one task per chunk prepares it for the kernel tasks of all targets
+        prepared = map_blocks(
+            _prepare,
+            fi_data,
+            msg,
+            fill,
+            dtype=np.float32 if fi.dtype == np.float32 else np.float64)
+        fos = []
+        for xo, yo in targets:
+            chunks[-2:] = (yo.shape, xo.shape)
+            fos.append(
+                map_blocks(_interpolate,
+                           kernel,
+                           xi,
+                           yi,
+                           prepared,
+                           xo,
+                           yo,
+                           icycx,
+                           fo_dtype,
+                           fill,
+                           chunks=chunks,
+                           dtype=fo_dtype,
+                           drop_axis=[fi.ndim - 2, fi.ndim - 1],
+                           new_axis=[fi.ndim - 2, fi.ndim - 1]))
+    elif isinstance(fi_data, np.ndarray):
+        prepared = _prepare(fi_data, msg, fill)
+
+        def interpolate(target):
+            return _interpolate(kernel, xi, yi, prepared, target[0], target[1],
+                                icycx, fo_dtype, fill)
+
+        if workers > 1 and len(targets) > 1:
+            with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+                fos = list(executor.map(interpolate, targets))
+        else:
+            fos = [interpolate(target) for target in targets]
+    else:
+        raise TypeError("linint2_multi: the fi input argument must be a "
+                        "numpy.ndarray, a dask.array.Array, or an "
+                        "xarray.DataArray containing either a numpy.ndarray or"
+                        " a dask.array.Array.")
+
+    return [_wrap(fo, fi, xo, yo, meta) for fo, (xo, yo) in zip(fos, targets)]
+
+
+def _covers(xs, ys, xo, yo, cyclic):
+    """True if the grid (`xs`, `ys`) spans the grid (`xo`, `yo`); only in y
+    if it is `cyclic`."""
+
+    def spans(c, co):
+        return np.min(c) <= np.min(co) and np.max(co) <= np.max(c)
+
+    return spans(ys, yo) and (cyclic or spans(xs, xo))
+
+
+def linint2_pyramid(fi,
+                    levels,
+                    icycx,
+                    msg=None,
+                    meta=True,
+                    xi=None,
+                    yi=None,
+                    engine=None,
+                    cascade=True):
+    """Interpolates a regular grid to a pyramid of rectilinear grids of
+    decreasing resolution using bi-linear interpolation.
+
+    `fi` is read, converted to a contiguous floating point array and has
+    its missing values set to NaN only once, as by :func:`linint2_multi`.
+    With `cascade`, each level after the first is then interpolated from
+    the level before it rather than from `fi`, so the cost of a level is in
+    proportion to the size of the level before it instead of that of `fi`.
+
+    Args:
+
+        fi (:class:`xarray.DataArray` or :class:`numpy.ndarray`):
+            An array of two or more dimensions, as for :func:`linint2`.
+
+        levels (:obj:`list`):
+            The grids of the levels, finest first, as (xo, yo) pairs of
+            one-dimensional arrays that are strictly monotonic, or as
+            :class:`~geocat.ncomp.RectilinearGrid` objects.
+
+        icycx (:obj:`bool`):
+            An option to indicate whether the rightmost dimension of fi
+            is cyclic, as for :func:`linint2`. A level that spans the globe
+            in x is cyclic for the level interpolated from it.
+
+        msg (:obj:`numpy.number`):
+            A numpy scalar value that represent a missing value in fi.
+
+        meta (:obj:`bool`):
+            If set to True and the input array is an Xarray, the metadata
+            from the input array will be copied to the output arrays.
+
+        xi (:class:`numpy.ndarray`):
+            An array that specifies the X coordinates of the fi array, as
+            for :func:`linint2`.
+
+        yi (:class:`numpy.ndarray`):
+            An array that specifies the Y coordinates of the fi array, as
+            for :func:`linint2`.
+
+        engine (:obj:`str`):
+            Name of the engine computing the result, e.g. "libncomp" or
+            "numpy". Default is the engine set with
+            :func:`~geocat.ncomp.engine.set_default_engine`.
+
+        cascade (:obj:`bool`):
+            If True (the default), each level is interpolated from the
+            level before it when that level spans it, and from `fi`
+            otherwise. The result is the same as from `fi` where the points
+            of a level are points of the level before it, e.g. when every
+            other point is kept; elsewhere it is interpolated twice, which
+            smooths it slightly. If False, every level is interpolated from
+            `fi`, with the results of :func:`linint2`.
+
+    Returns:
+        :obj:`list` of :class:`xarray.DataArray`: The interpolated grids, in
+        the order of `levels`, as returned by :func:`linint2`. If `fi` is a
+        dask array, every level is a dask array, whose tasks depend on
+        those of the level before it with `cascade`.
+
+    Examples:
+
+        Example 1: A pyramid of global grids halving the resolution
+
+        .. code-block:: python
+
+            import numpy as np
+            import geocat.ncomp
+
+            levels = [(np.arange(0, 360, res), np.arange(-90, 90.1, res))
+                      for res in (0.125, 0.25, 0.5, 1.0)]
+            pyramid = geocat.ncomp.linint2_pyramid(fi, levels, 1)
+    """
+
+    if not cascade:
+        return linint2_multi(fi,
+                             levels,
+                             icycx,
+                             msg=msg,
+                             meta=meta,
+                             xi=xi,
+                             yi=yi,
+                             engine=engine)
+
+    xi, yi = unpack(xi, yi, RectilinearGrid, ("x", "y"), "linint2_pyramid")
+
+    if not isinstance(fi, xr.DataArray):
+        fi = xr.DataArray(fi)
+        if xi is None or yi is None:
+            raise CoordinateError(
+                "linint2_pyramid: arguments xi and yi must be passed"
+                " explicitly if fi is not an xarray.DataArray.")
+
+    if xi is None:
+        xi = fi.coords[fi.dims[-1]].values
+    elif isinstance(xi, xr.DataArray):
+        xi = xi.values
+
+    if yi is None:
+        yi = fi.coords[fi.dims[-2]].values
+    elif isinstance(yi, xr.DataArray):
+        yi = yi.values
+
+    levels = _targets(levels)
+    kernel = get_kernel("linint2", engine)
+    fi_data = fi.data
+    fo_dtype = np.float64 if fi.dtype == np.float64 else np.float32
+
+    if _is_dask_array(fi_data):
+        from dask.array.core import map_blocks
+
+        chunks = list(fi.chunks)
+
+        # ensure rightmost dimensions of input are not chunked
+        if chunks[-2:] != [yi.shape, xi.shape]:
+            raise ChunkError("linint2_pyramid: the two rightmost dimensions "
+                             "of fi must not be chunked.")
+
+        prepared = map_blocks(
+            _prepare,
+            fi_data,
+            msg,
+            dtype=np.float32 if fi.dtype == np.float32 else np.float64)
+
+        def interpolate(xs, ys, fs, cyclic, xo, yo):
+            chunks[-2:] = (yo.shape, xo.shape)
+            return map_blocks(_interpolate,
+                              kernel,
+                              xs,
+                              ys,
+                              fs,
+                              xo,
+                              yo,
+                              cyclic,
+                              fo_dtype,
+                              chunks=chunks,
+                              dtype=fo_dtype,
+                              drop_axis=[fi.ndim - 2, fi.ndim - 1],
+                              new_axis=[fi.ndim - 2, fi.ndim - 1])
+    elif isinstance(fi_data, np.ndarray):
+        prepared = _prepare(fi_data, msg)
+
+        def interpolate(xs, ys, fs, cyclic, xo, yo):
+            return _interpolate(kernel, xs, ys, fs, xo, yo, cyclic, fo_dtype)
+    else:
+        raise TypeError("linint2_pyramid: the fi input argument must be a "
+                        "numpy.ndarray, a dask.array.Array, or an "
+                        "xarray.DataArray containing either a numpy.ndarray or"
+                        " a dask.array.Array.")
+
+    fos = []
+    for k, (xo, yo) in enumerate(levels):
+        source = (xi, yi, prepared, icycx)
+        if k > 0:
+            xs, ys = levels[k - 1]
+            # the level before is cyclic if it spans the globe
+            cyclic = bool(icycx) and min(np.size(xs), np.size(ys)) > 1 and \
+                RectilinearGrid(xs, ys).cyclic
+            if _covers(xs, ys, xo, yo, cyclic):
+                source = (xs, ys, fos[-1], cyclic)
+        fos.append(interpolate(*source, xo, yo))
+
+    return [_wrap(fo, fi, xo, yo, meta) for fo, (xo, yo) in zip(fos, levels)]
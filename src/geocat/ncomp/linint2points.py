@@ -1,13 +1,28 @@
 import numpy as np
 import xarray as xr
 
-from . import _ncomp
+from ._reorder import point_order, unpermute
+from ._util import _decreasing, _method_kernel, _negated
+from .engine import get_kernel
 # The following imports allow for the function name to be used directly under the package namespace, skipping the module name.
 # This is done to maintain backwards compatibily from when the functions were defined in geocat/ncomp/__init__.py
 from .errors import (CoordinateError, DimensionError, MetaError)
-
-
-def linint2_points(fi, xo, yo, icycx, msg=None, meta=False, xi=None, yi=None):
+from .grids import PointSet, RectilinearGrid, unpack
+from ._staging import stage
+
+
+def linint2_points(fi,
+                   xo,
+                   yo,
+                   icycx,
+                   msg=None,
+                   meta=False,
+                   xi=None,
+                   yi=None,
+                   engine=None,
+                   reorder=None,
+                   method="linear",
+                   staging=None):
     """Interpolates from a rectilinear grid to an unstructured grid or locations using bilinear interpolation.
 
     Args:
@@ -28,6 +43,9 @@ def linint2_points(fi, xo, yo, icycx, msg=None, meta=False, xi=None, yi=None):
             coordinates of the unstructured grid. It must be the same
             length as `xo`.
 
+            A :class:`~geocat.ncomp.PointSet` can be passed as xo, with
+            None as yo, in place of both arrays.
+
         icycx (:obj:`bool`):
             An option to indicate whether the rightmost dimension of fi
             is cyclic. This should be set to True only if you have
@@ -48,18 +66,50 @@ def linint2_points(fi, xo, yo, icycx, msg=None, meta=False, xi=None, yi=None):
             Warning: this option is not currently supported.
 
         xi (:class:`numpy.ndarray`):
-            A strictly monotonically increasing array that specifies
-            the X [longitude] coordinates of the `fi` array.
+            A strictly monotonically increasing or decreasing array that
+            specifies the X [longitude] coordinates of the `fi` array.
 
         yi (:class:`numpy.ndarray`):
-            A strictly monotonically increasing array that specifies
-            the Y [latitude] coordinates of the `fi` array.
+            A strictly monotonically increasing or decreasing array that
+            specifies the Y [latitude] coordinates of the `fi` array.
+
+            A :class:`~geocat.ncomp.RectilinearGrid` can be passed as xi,
+            with yi left unspecified, in place of both arrays.
+
+        engine (:obj:`str`):
+            Name of the engine computing the result: "libncomp", "numpy" or
+            "numba" (requires numba). Default is the engine set with
+            :func:`~geocat.ncomp.engine.set_default_engine`.
+
+        reorder (:obj:`str`):
+            If "morton" or "hilbert", the output locations are interpolated
+            in their order along that space-filling curve, so that nearby
+            locations read nearby parts of `fi`, and the result is returned
+            in the original order. This speeds up the interpolation of many
+            scattered locations from a large grid without changing the
+            result. Default is None (locations are interpolated in order).
+
+        method (:obj:`str`):
+            "linear" (the default) for bilinear interpolation, or "nearest"
+            to take the value of the nearest point of fi, as for
+            :func:`~geocat.ncomp.linint2`. With "nearest", locations on the
+            last row or column of fi are inside of it.
+
+        staging (:obj:`bool` or :obj:`int`):
+            How a numpy fi is passed to the kernel. If None (the default), a
+            fi that is not C-contiguous, e.g. a strided view, or that is
+            memory-mapped, is interpolated a block of its leading dimensions
+            (about 64 MiB) at a time, each copied into one reused contiguous
+            buffer, rather than copied whole. True always stages fi, a
+            number always stages it in blocks of that many bytes, and False
+            passes fi to the kernel whole.
 
     Returns:
 	:class:`numpy.ndarray`: The returned value will have the same
         dimensions as `fi`, except for the rightmost dimension which will
         have the same dimension size as the length of `yo` and `xo`. The
-        return type will be double if fi is double, and float otherwise.
+        return type will be double if fi is double, and float otherwise,
+        or the type of fi if `method` is "nearest".
 
     Description:
         The inint2_points uses bilinear interpolation to interpolate from
@@ -123,6 +173,9 @@ def linint2_points(fi, xo, yo, icycx, msg=None, meta=False, xi=None, yi=None):
     """
 
     # todo: Revisit for handling of "meta" argument
+    xo, yo = unpack(xo, yo, PointSet, ("x", "y"), "linint2_points")
+    xi, yi = unpack(xi, yi, RectilinearGrid, ("x", "y"), "linint2_points")
+
     # Basic sanity checks
     if not isinstance(fi, xr.DataArray):
         fi = xr.DataArray(fi)
@@ -155,8 +208,27 @@ def linint2_points(fi, xo, yo, icycx, msg=None, meta=False, xi=None, yi=None):
 
     fi_data = fi.values
 
+    order = point_order(yo, xo, reorder)
+    if order is not None:
+        xo = xo[order]
+        yo = yo[order]
+
+    # a decreasing xi or yi is negated along with the locations, which leaves
+    # the interpolation weights unchanged without reordering fi
+    if _decreasing(xi):
+        xi, xo = _negated(xi), _negated(xo)
+    if _decreasing(yi):
+        yi, yo = _negated(yi), _negated(yo)
+
     if isinstance(fi_data, np.ndarray):
-        fo = _ncomp._linint2_points(xi, yi, fi_data, xo, yo, icycx, msg)
+        kernel = get_kernel(_method_kernel("linint2_points", method), engine)
+
+        def interpolate(fi_block):
+            return kernel(xi, yi, fi_block, xo, yo, icycx, msg)
+
+        # a strided fi is copied a block at a time
+        fo = stage(interpolate, fi_data, staging, "linint2_points")
+        fo = unpermute(fo, order)
     else:
         raise TypeError
 
@@ -1,7 +1,7 @@
 import numpy as np
 import xarray as xr
 
-from . import _ncomp
+from .engine import get_kernel
 # The following imports allow for the function name to be used directly under the package namespace, skipping the module name.
 # This is done to maintain backwards compatibily from when the functions were defined in geocat/ncomp/__init__.py
 from .errors import (MetaError)
@@ -14,7 +14,8 @@ def moc_globe_atl(lat_aux_grid,
                   tlat,
                   rmlak,
                   msg=None,
-                  meta=False):
+                  meta=False,
+                  engine=None):
     """Facilitates calculating the meridional overturning circulation for the
     globe and Atlantic.
 
@@ -49,6 +50,11 @@ def moc_globe_atl(lat_aux_grid,
             default is False.
             Warning: this option is not currently supported.
 
+        engine (:obj:`str`):
+            Name of the engine computing the result, e.g. "libncomp" or
+            "numpy". Default is the engine set with
+            :func:`~geocat.ncomp.engine.set_default_engine`.
+
         Returns:
             :class:`xarray.DataArray`: A multi-dimensional array of size [moc_comp] x
             [n_transport_reg] x [kdepth] x [nyaux] where:
@@ -119,8 +125,8 @@ def moc_globe_atl(lat_aux_grid,
         msg = np.float32(msg)
 
     # Call ncomp function
-    out_arr = _ncomp._moc_globe_atl(lat_aux_grid, a_wvel, a_bolus, a_submeso,
-                                    tlat, rmlak, msg)
+    out_arr = get_kernel("moc_globe_atl", engine)(lat_aux_grid, a_wvel, a_bolus,
+                                                  a_submeso, tlat, rmlak, msg)
 
     if meta and isinstance(input, xr.DataArray):
         raise MetaError(
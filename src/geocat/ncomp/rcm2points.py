@@ -1,10 +1,13 @@
 import numpy as np
 import xarray as xr
 
-from . import _ncomp
+from ._reorder import point_order, unpermute
+from .engine import get_kernel
 # The following imports allow for the function name to be used directly under the package namespace, skipping the module name.
 # This is done to maintain backwards compatibily from when the functions were defined in geocat/ncomp/__init__.py
 from .errors import (DimensionError, MetaError)
+from .grids import CurvilinearGrid, PointSet, unpack
+from ._staging import stage
 
 
 def rcm2points(lat2d,
@@ -14,7 +17,10 @@ def rcm2points(lat2d,
                lon1dPoints,
                opt=0,
                msg=None,
-               meta=False):
+               meta=False,
+               engine=None,
+               reorder=None,
+               staging=None):
     """Interpolates data on a curvilinear grid (i.e. RCM, WRF, NARR) to an unstructured grid.
 
     Args:
@@ -23,6 +29,9 @@ def rcm2points(lat2d,
 	    A two-dimensional array that specifies the latitudes locations
 	    of fi. The latitude order must be south-to-north.
 
+	    A :class:`~geocat.ncomp.CurvilinearGrid` can be passed as lat2d,
+	    with None as lon2d, in place of both arrays.
+
 	lon2d (:class:`numpy.ndarray`):
 	    A two-dimensional array that specifies the longitude locations
 	    of fi. The latitude order must be west-to-east.
@@ -35,6 +44,9 @@ def rcm2points(lat2d,
 	    A one-dimensional array that specifies the latitude coordinates of
 	    the output locations.
 
+	    A :class:`~geocat.ncomp.PointSet` can be passed as lat1dPoints,
+	    with None as lon1dPoints, in place of both arrays.
+
 	lon1dPoints (:class:`numpy.ndarray`):
 	    A one-dimensional array that specifies the longitude coordinates of
 	    the output locations.
@@ -54,6 +66,26 @@ def rcm2points(lat2d,
         default is False.
         Warning: this option is not currently supported.
 
+	engine (:obj:`str`):
+        Name of the engine computing the result: "libncomp" or "numba"
+        (requires numba). Default is the engine set with
+        :func:`~geocat.ncomp.engine.set_default_engine`.
+
+	reorder (:obj:`str`):
+        If "morton" or "hilbert", the output locations are interpolated in
+        their order along that space-filling curve, so that nearby locations
+        read nearby parts of `fi`, and the result is returned in the original
+        order. Default is None (locations are interpolated in order).
+
+	staging (:obj:`bool` or :obj:`int`):
+        How a numpy fi is passed to the kernel. If None (the default), a
+        fi that is not C-contiguous, e.g. a strided view, or that is
+        memory-mapped, is interpolated a block of its leading dimensions
+        (about 64 MiB) at a time, each copied into one reused contiguous
+        buffer, rather than copied whole. True always stages fi, a
+        number always stages it in blocks of that many bytes, and False
+        passes fi to the kernel whole.
+
     Returns:
 	:class:`numpy.ndarray`: The interpolated grid. A multi-dimensional array
 	of the same size as fi except that the rightmost dimension sizes have been
@@ -95,6 +127,11 @@ def rcm2points(lat2d,
 	    ht_points = geocat.comp.rcm2points(lat2D_curv, lon2D_curv, ht_curv, newlat1D_points, newlon1D_points)
     """
 
+    lat2d, lon2d = unpack(lat2d, lon2d, CurvilinearGrid, ("lat", "lon"),
+                          "rcm2points")
+    lat1dPoints, lon1dPoints = unpack(lat1dPoints, lon1dPoints, PointSet,
+                                      ("y", "x"), "rcm2points")
+
     # todo: Revisit for handling of "meta" argument
     # Basic sanity checks
     if lat2d.shape[0] != lon2d.shape[0] or lat2d.shape[1] != lon2d.shape[1]:
@@ -136,9 +173,21 @@ def rcm2points(lat2d,
 
     fi_data = fi.values
 
+    order = point_order(lat1dPoints, lon1dPoints, reorder)
+    if order is not None:
+        lat1dPoints = lat1dPoints[order]
+        lon1dPoints = lon1dPoints[order]
+
     if isinstance(fi_data, np.ndarray):
-        fo = _ncomp._rcm2points(lat2d, lon2d, fi_data, lat1dPoints, lon1dPoints,
-                                opt, msg)
+        kernel = get_kernel("rcm2points", engine)
+
+        def interpolate(fi_block):
+            return kernel(lat2d, lon2d, fi_block, lat1dPoints, lon1dPoints, opt,
+                          msg)
+
+        # a strided fi is copied a block at a time
+        fo = stage(interpolate, fi_data, staging, "rcm2points")
+        fo = unpermute(fo, order)
     else:
         raise TypeError("rcm2points: the fi input argument must be a "
                         "numpy.ndarray, a dask.array.Array, or an "
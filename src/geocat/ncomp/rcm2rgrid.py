@@ -1,15 +1,39 @@
-import dask.array as da
 import numpy as np
 import xarray as xr
-from dask.array.core import map_blocks
 
-from . import _ncomp
+from .engine import get_kernel
+from ._util import (_decreasing, _derived, _is_dask_array, _reverse, _sliced)
 # The following imports allow for the function name to be used directly under the package namespace, skipping the module name.
 # This is done to maintain backwards compatibily from when the functions were defined in geocat/ncomp/__init__.py
-from .errors import (ChunkError, DimensionError, MetaError)
-
-
-def rcm2rgrid(lat2d, lon2d, fi, lat1d, lon1d, msg=None, meta=False):
+from ._tiling import (MASK_TILE, compact_cells, curvilinear_window,
+                      curvilinear_windows, output_tiles, regrid_masked,
+                      regrid_tiles, source_crop, target_cells)
+from .errors import (DimensionError, MetaError)
+from .grids import CurvilinearGrid, RectilinearGrid, unpack
+from ._staging import restore_dims, spatial_last, stage
+
+
+def _north_to_south(lat2d):
+    """Returns True if the latitudes `lat2d` of a curvilinear grid decrease
+    along its first dimension."""
+    return _derived(lat2d, "north_to_south",
+                    lambda: bool(np.nanmean(lat2d[-1]) < np.nanmean(lat2d[0])))
+
+
+def rcm2rgrid(lat2d,
+              lon2d,
+              fi,
+              lat1d,
+              lon1d,
+              msg=None,
+              meta=False,
+              engine=None,
+              out_chunks=None,
+              target_mask=None,
+              compact=False,
+              x_dim=None,
+              y_dim=None,
+              staging=None):
     """Interpolates data on a curvilinear grid (i.e. RCM, WRF, NARR) to a rectilinear grid.
 
     Args:
@@ -17,24 +41,34 @@ def rcm2rgrid(lat2d, lon2d, fi, lat1d, lon1d, msg=None, meta=False):
         lat2d (:class:`numpy.ndarray`):
 	    A two-dimensional array that specifies the latitudes locations
 	    of fi. Because this array is two-dimensional it is not an associated
-	    coordinate variable of `fi`. The latitude order must be south-to-north.
+	    coordinate variable of `fi`. The latitudes may increase (south to
+	    north) or decrease (north to south) along the first dimension; a
+	    north-to-south grid is regridded as the south-to-north grid it
+	    reverses to, without copying fi.
+
+	    A :class:`~geocat.ncomp.CurvilinearGrid` can be passed as lat2d,
+	    with None as lon2d, in place of both arrays.
 
         lon2d (:class:`numpy.ndarray`):
 	    A two-dimensional array that specifies the longitude locations
 	    of fi. Because this array is two-dimensional it is not an associated
-	    coordinate variable of `fi`. The latitude order must be west-to-east.
+	    coordinate variable of `fi`. The longitude order must be west-to-east.
 
         fi (:class:`numpy.ndarray`):
 	    A multi-dimensional array to be interpolated. The rightmost two
 	    dimensions (latitude, longitude) are the dimensions to be interpolated.
+	    Only the part of fi around the rectilinear grid is read.
 
         lat1d (:class:`numpy.ndarray`):
 	    A one-dimensional array that specifies the latitude coordinates of
-	    the regular grid. Must be monotonically increasing.
+	    the regular grid. Must be monotonically increasing or decreasing.
+
+	    A :class:`~geocat.ncomp.RectilinearGrid` can be passed as lat1d,
+	    with None as lon1d, in place of both arrays.
 
         lon1d (:class:`numpy.ndarray`):
 	    A one-dimensional array that specifies the longitude coordinates of
-	    the regular grid. Must be monotonically increasing.
+	    the regular grid. Must be monotonically increasing or decreasing.
 
         msg (:obj:`numpy.number`):
             A numpy scalar value that represent a missing value in fi.
@@ -47,6 +81,57 @@ def rcm2rgrid(lat2d, lon2d, fi, lat1d, lon1d, msg=None, meta=False):
             default is False.
             Warning: this option is not currently supported.
 
+        engine (:obj:`str`):
+            Name of the engine computing the result: "libncomp" or "raster".
+            The "raster" engine finds the source cell containing every
+            target point in a single pass over the source cells, which is
+            much faster on large grids, and interpolates from the corners of
+            that cell only: target points outside of the source grid, or
+            whose cell has only missing corners, are missing rather than
+            filled. Default is the engine set with
+            :func:`~geocat.ncomp.engine.set_default_engine`.
+
+        out_chunks (:obj:`tuple`):
+            Tile size (y, x) of the output when `fi` is a dask array. Each
+            output tile is computed by a separate task from the part of `fi`
+            it needs, so `fi` may be chunked along its two rightmost
+            dimensions and neither grid has to fit in one worker. Default is
+            as many tiles along y and x as `fi` has chunks, i.e. a single
+            tile if the two rightmost dimensions of `fi` are not chunked.
+
+        target_mask (:class:`numpy.ndarray`):
+            The output cells to compute, as a boolean array of the shape of
+            the output grid or as an array of flat indices of the active
+            cells. Only the output tiles holding active cells are
+            interpolated, and all inactive cells are missing (NaN). Default
+            is every cell.
+
+        compact (:obj:`bool`):
+            If True, only the values of the active cells of `target_mask`
+            are returned: one dimension replaces the two rightmost ones of
+            the output, ordered like the flat indices of `target_mask`, or
+            in C order if it is boolean. Default is False.
+
+        x_dim (:obj:`str` or :obj:`int`):
+            Name or index of the X (second index of lat2d) dimension of fi.
+            Default is the rightmost dimension.
+
+        y_dim (:obj:`str` or :obj:`int`):
+            Name or index of the Y (first index of lat2d) dimension of fi.
+            Default is the second rightmost dimension. If x_dim and y_dim
+            are not the two rightmost dimensions, fi is not transposed into
+            a copy: the other dimensions are interpolated a block at a time,
+            and the output has the dimension order of fi.
+
+        staging (:obj:`bool` or :obj:`int`):
+            How a numpy fi is passed to the kernel. If None (the default), a
+            fi that is not C-contiguous, e.g. a strided view, or that is
+            memory-mapped, is interpolated a block of its leading dimensions
+            (about 64 MiB) at a time, each copied into one reused contiguous
+            buffer, rather than copied whole. True always stages fi, a
+            number always stages it in blocks of that many bytes, and False
+            passes fi to the kernel whole.
+
     Returns:
         :class:`numpy.ndarray`: The interpolated grid. A multi-dimensional array
 	of the same size as fi except that the rightmost dimension sizes have been
@@ -103,6 +188,16 @@ def rcm2rgrid(lat2d, lon2d, fi, lat1d, lon1d, msg=None, meta=False):
 
     """
 
+    lat2d, lon2d = unpack(lat2d, lon2d, CurvilinearGrid, ("lat", "lon"),
+                          "rcm2rgrid")
+    lat1d, lon1d = unpack(lat1d, lon1d, RectilinearGrid, ("y", "x"),
+                          "rcm2rgrid")
+
+    # fi with x_dim and y_dim rightmost, as a view
+    if not isinstance(fi, xr.DataArray):
+        fi = xr.DataArray(fi)
+    fi, dims = spatial_last(fi, x_dim, y_dim, "rcm2rgrid")
+
     # todo: Revisit for handling of "meta" argument
     # Basic sanity checks
     if lat2d.shape[0] != lon2d.shape[0] or lat2d.shape[1] != lon2d.shape[1]:
@@ -131,52 +226,104 @@ def rcm2rgrid(lat2d, lon2d, fi, lat1d, lon1d, msg=None, meta=False):
     if isinstance(lon2d, xr.DataArray):
         lon2d = lon2d.values
 
-    if not isinstance(fi, xr.DataArray):
-        fi = xr.DataArray(fi)
-
     # ensure lat1d and lon1d are numpy.ndarrays
     if isinstance(lat1d, xr.DataArray):
         lat1d = lat1d.values
     if isinstance(lon1d, xr.DataArray):
         lon1d = lon1d.values
 
+    # decreasing lat1d or lon1d are interpolated to in increasing order, and
+    # the output is reversed back as a view
+    flip_y, flip_x = _decreasing(lat1d), _decreasing(lon1d)
+    if flip_y:
+        lat1d = _sliced(lat1d, slice(None, None, -1))
+    if flip_x:
+        lon1d = _sliced(lon1d, slice(None, None, -1))
+
     fi_data = fi.data
 
-    if isinstance(fi_data, da.Array):
-        chunks = list(fi.chunks)
-
-        # ensure rightmost dimensions of input are not chunked
-        if chunks[-2:] != [lon2d.shape, lat2d.shape]:
-            raise ChunkError(
-                "rcm2rgrid: the two rightmost dimensions of fi must"
-                " not be chunked.")
-
-        # ensure rightmost dimensions of output are not chunked
-        chunks[-2:] = (lon1d.shape, lat1d.shape)
-
-        fo = map_blocks(_ncomp._rcm2rgrid,
-                        lat2d,
-                        lon2d,
-                        fi_data,
-                        lat1d,
-                        lon1d,
-                        msg,
-                        chunks=chunks,
-                        dtype=fi.dtype,
-                        drop_axis=[fi.ndim - 2, fi.ndim - 1],
-                        new_axis=[fi.ndim - 2, fi.ndim - 1])
+    # the kernels get a south-to-north source grid: one running north to
+    # south is reversed along its first dimension, together with fi, as views
+    if _north_to_south(lat2d):
+        lat2d, lon2d = lat2d[::-1], lon2d[::-1]
+        fi_data = fi_data[..., ::-1, :]
+
+    # only the part of fi around the rectilinear grid is regridded
+    crop = source_crop((lat2d, lon2d), (lat1d, lon1d), curvilinear_window)
+    if crop is not None:
+        sy, sx = crop
+        lat2d, lon2d = lat2d[sy, sx], lon2d[sy, sx]
+        fi_data = fi_data[..., sy, sx]
+
+    fo_dtype = np.float64 if fi.dtype == np.float64 else np.float32
+    mask = None
+    if target_mask is not None:
+        mask, cells = target_cells(target_mask, (lat1d.size, lon1d.size),
+                                   "rcm2rgrid")
+        mask = _reverse(mask, flip_y, flip_x)
+    elif compact:
+        raise ValueError("rcm2rgrid: compact requires a target_mask")
+
+    if _is_dask_array(fi_data):
+        from dask.array.core import map_blocks
+
+        tiles = output_tiles(fi_data.chunks, lat2d.shape,
+                             (lat1d.size, lon1d.size), out_chunks, "rcm2rgrid")
+        if tiles is None and mask is not None:
+            tiles = MASK_TILE
+        if tiles is not None:
+            # each output tile is computed from the part of fi it needs
+            fo = regrid_tiles(get_kernel("rcm2rgrid", engine),
+                              fi_data, (lat2d, lon2d), (lat1d, lon1d),
+                              msg,
+                              tiles,
+                              curvilinear_windows(lat2d, lon2d),
+                              fo_dtype,
+                              mask=mask)
+        else:
+            chunks = list(fi_data.chunks)
+            chunks[-2:] = (lat1d.shape, lon1d.shape)
+            fo = map_blocks(get_kernel("rcm2rgrid", engine),
+                            lat2d,
+                            lon2d,
+                            fi_data,
+                            lat1d,
+                            lon1d,
+                            msg,
+                            chunks=chunks,
+                            dtype=fo_dtype,
+                            drop_axis=[fi.ndim - 2, fi.ndim - 1],
+                            new_axis=[fi.ndim - 2, fi.ndim - 1])
     elif isinstance(fi_data, np.ndarray):
-        fo = _ncomp._rcm2rgrid(lat2d, lon2d, fi_data, lat1d, lon1d, msg)
+        kernel = get_kernel("rcm2rgrid", engine)
+        if mask is not None:
+            window = curvilinear_windows(lat2d, lon2d)
+
+        def interpolate(fi_block):
+            if mask is not None:
+                # only the output tiles holding active cells are interpolated
+                return regrid_masked(kernel, fi_block, (lat2d, lon2d),
+                                     (lat1d, lon1d), msg, mask, window,
+                                     fo_dtype)
+            return kernel(lat2d, lon2d, fi_block, lat1d, lon1d, msg)
+
+        # a transposed or strided fi is copied a block at a time
+        fo = stage(interpolate, fi_data, staging, "rcm2rgrid")
     else:
         raise TypeError("rcm2rgrid: the fi input argument must be a "
                         "numpy.ndarray, a dask.array.Array, or an "
                         "xarray.DataArray containing either a numpy.ndarray or"
                         " a dask.array.Array.")
+    fo = _reverse(fo, flip_y, flip_x)
+    if compact:
+        fo = compact_cells(fo, cells)
 
     if meta and isinstance(input, xr.DataArray):
         raise MetaError(
             "ERROR rcm2rgrid: retention of metadata is not yet supported !")
     else:
         fo = xr.DataArray(fo)
+    if dims is not None and not compact:
+        fo = restore_dims(fo, fi, dims)
 
     return fo
@@ -1,15 +1,30 @@
-import dask.array as da
 import numpy as np
 import xarray as xr
-from dask.array.core import map_blocks
 
-from . import _ncomp
+from .engine import get_kernel
+from ._util import _is_dask_array, _sliced
 # The following imports allow for the function name to be used directly under the package namespace, skipping the module name.
 # This is done to maintain backwards compatibily from when the functions were defined in geocat/ncomp/__init__.py
-from .errors import (ChunkError, DimensionError, MetaError)
-
-
-def rgrid2rcm(lat1d, lon1d, fi, lat2d, lon2d, msg=None, meta=False):
+from ._tiling import (MASK_TILE, compact_cells, output_tiles, regrid_masked,
+                      regrid_tiles, rectilinear_window, source_crop,
+                      target_cells)
+from .errors import (DimensionError, MetaError)
+from .grids import CurvilinearGrid, RectilinearGrid, unpack
+from ._staging import stage
+
+
+def rgrid2rcm(lat1d,
+              lon1d,
+              fi,
+              lat2d,
+              lon2d,
+              msg=None,
+              meta=False,
+              engine=None,
+              out_chunks=None,
+              target_mask=None,
+              compact=False,
+              staging=None):
     """Interpolates data on a rectilinear lat/lon grid to a curvilinear grid like
        those used by the RCM, WRF and NARR models/datasets.
 
@@ -19,6 +34,9 @@ def rgrid2rcm(lat1d, lon1d, fi, lat2d, lon2d, msg=None, meta=False):
 	    A one-dimensional array that specifies the latitude coordinates of
 	    the regular grid. Must be monotonically increasing.
 
+	    A :class:`~geocat.ncomp.RectilinearGrid` can be passed as lat1d,
+	    with None as lon1d, in place of both arrays.
+
         lon1d (:class:`numpy.ndarray`):
 	    A one-dimensional array that specifies the longitude coordinates of
 	    the regular grid. Must be monotonically increasing.
@@ -26,12 +44,16 @@ def rgrid2rcm(lat1d, lon1d, fi, lat2d, lon2d, msg=None, meta=False):
         fi (:class:`numpy.ndarray`):
 	    A multi-dimensional array to be interpolated. The rightmost two
 	    dimensions (latitude, longitude) are the dimensions to be interpolated.
+	    Only the part of fi around the curvilinear grid is read.
 
         lat2d (:class:`numpy.ndarray`):
 	    A two-dimensional array that specifies the latitude locations
 	    of fi. Because this array is two-dimensional it is not an associated
 	    coordinate variable of `fi`.
 
+	    A :class:`~geocat.ncomp.CurvilinearGrid` can be passed as lat2d,
+	    with None as lon2d, in place of both arrays.
+
         lon2d (:class:`numpy.ndarray`):
 	    A two-dimensional array that specifies the longitude locations
 	    of fi. Because this array is two-dimensional it is not an associated
@@ -48,6 +70,45 @@ def rgrid2rcm(lat1d, lon1d, fi, lat2d, lon2d, msg=None, meta=False):
             default is False.
             Warning: this option is not currently supported.
 
+        engine (:obj:`str`):
+            Name of the engine computing the result: "libncomp" or "numpy".
+            The "numpy" engine locates the curvilinear grid points in the
+            rectilinear grid with binary searches, and keeps the resulting
+            weights for the last few pairs of grids, so that interpolating
+            many fields between the same grids is much faster after the
+            first call. Default is the engine set with
+            :func:`~geocat.ncomp.engine.set_default_engine`.
+
+        out_chunks (:obj:`tuple`):
+            Tile size (y, x) of the output when `fi` is a dask array. Each
+            output tile is computed by a separate task from the part of `fi`
+            it needs, so `fi` may be chunked along its two rightmost
+            dimensions and neither grid has to fit in one worker. Default is
+            as many tiles along y and x as `fi` has chunks, i.e. a single
+            tile if the two rightmost dimensions of `fi` are not chunked.
+
+        target_mask (:class:`numpy.ndarray`):
+            The output cells to compute, as a boolean array of the shape of
+            the output grid or as an array of flat indices of the active
+            cells. Only the output tiles holding active cells are
+            interpolated, and all inactive cells are missing (NaN). Default
+            is every cell.
+
+        compact (:obj:`bool`):
+            If True, only the values of the active cells of `target_mask`
+            are returned: one dimension replaces the two rightmost ones of
+            the output, ordered like the flat indices of `target_mask`, or
+            in C order if it is boolean. Default is False.
+
+        staging (:obj:`bool` or :obj:`int`):
+            How a numpy fi is passed to the kernel. If None (the default), a
+            fi that is not C-contiguous, e.g. a strided view, or that is
+            memory-mapped, is interpolated a block of its leading dimensions
+            (about 64 MiB) at a time, each copied into one reused contiguous
+            buffer, rather than copied whole. True always stages fi, a
+            number always stages it in blocks of that many bytes, and False
+            passes fi to the kernel whole.
+
     Returns:
         :class:`numpy.ndarray`: The interpolated grid. A multi-dimensional array of the
 	same size as `fi` except that the rightmost dimension sizes have been replaced
@@ -94,6 +155,11 @@ def rgrid2rcm(lat1d, lon1d, fi, lat2d, lon2d, msg=None, meta=False):
 
     """
 
+    lat1d, lon1d = unpack(lat1d, lon1d, RectilinearGrid, ("y", "x"),
+                          "rgrid2rcm")
+    lat2d, lon2d = unpack(lat2d, lon2d, CurvilinearGrid, ("lat", "lon"),
+                          "rgrid2rcm")
+
     # todo: Revisit for handling of "meta" argument
     # Basic sanity checks
     if lat2d.shape[0] != lon2d.shape[0] or lat2d.shape[1] != lon2d.shape[1]:
@@ -134,36 +200,70 @@ def rgrid2rcm(lat1d, lon1d, fi, lat2d, lon2d, msg=None, meta=False):
 
     fi_data = fi.data
 
-    if isinstance(fi_data, da.Array):
-        chunks = list(fi.chunks)
-
-        # ensure rightmost dimensions of input are not chunked
-        if chunks[-2:] != [lon1d.shape, lat1d.shape]:
-            raise ChunkError(
-                "rgrid2rcm: the two rightmost dimensions of fi must"
-                " not be chunked.")
-
-        # ensure rightmost dimensions of output are not chunked
-        chunks[-2:] = (lon2d.shape, lat2d.shape)
-
-        fo = map_blocks(_ncomp._rgrid2rcm,
-                        lat1d,
-                        lon1d,
-                        fi_data,
-                        lat2d,
-                        lon2d,
-                        msg,
-                        chunks=chunks,
-                        dtype=fi.dtype,
-                        drop_axis=[fi.ndim - 2, fi.ndim - 1],
-                        new_axis=[fi.ndim - 2, fi.ndim - 1])
+    # only the part of fi around the curvilinear grid is regridded
+    crop = source_crop((lat1d, lon1d), (lat2d, lon2d), rectilinear_window)
+    if crop is not None:
+        sy, sx = crop
+        lat1d, lon1d = _sliced(lat1d, sy), _sliced(lon1d, sx)
+        fi_data = fi_data[..., sy, sx]
+
+    fo_dtype = np.float64 if fi.dtype == np.float64 else np.float32
+    mask = None
+    if target_mask is not None:
+        mask, cells = target_cells(target_mask, lat2d.shape, "rgrid2rcm")
+    elif compact:
+        raise ValueError("rgrid2rcm: compact requires a target_mask")
+
+    if _is_dask_array(fi_data):
+        from dask.array.core import map_blocks
+
+        tiles = output_tiles(fi_data.chunks, (lat1d.size, lon1d.size),
+                             lat2d.shape, out_chunks, "rgrid2rcm")
+        if tiles is None and mask is not None:
+            tiles = MASK_TILE
+        if tiles is not None:
+            # each output tile is computed from the part of fi it needs
+            fo = regrid_tiles(get_kernel("rgrid2rcm", engine),
+                              fi_data, (lat1d, lon1d), (lat2d, lon2d),
+                              msg,
+                              tiles,
+                              rectilinear_window,
+                              fo_dtype,
+                              mask=mask)
+        else:
+            chunks = list(fi_data.chunks)
+            chunks[-2:] = ((lat2d.shape[0],), (lat2d.shape[1],))
+            fo = map_blocks(get_kernel("rgrid2rcm", engine),
+                            lat1d,
+                            lon1d,
+                            fi_data,
+                            lat2d,
+                            lon2d,
+                            msg,
+                            chunks=chunks,
+                            dtype=fo_dtype,
+                            drop_axis=[fi.ndim - 2, fi.ndim - 1],
+                            new_axis=[fi.ndim - 2, fi.ndim - 1])
     elif isinstance(fi_data, np.ndarray):
-        fo = _ncomp._rgrid2rcm(lat1d, lon1d, fi_data, lat2d, lon2d, msg)
+        kernel = get_kernel("rgrid2rcm", engine)
+
+        def interpolate(fi_block):
+            if mask is not None:
+                # only the output tiles holding active cells are interpolated
+                return regrid_masked(kernel, fi_block, (lat1d, lon1d),
+                                     (lat2d, lon2d), msg, mask,
+                                     rectilinear_window, fo_dtype)
+            return kernel(lat1d, lon1d, fi_block, lat2d, lon2d, msg)
+
+        # a strided fi is copied a block at a time
+        fo = stage(interpolate, fi_data, staging, "rgrid2rcm")
     else:
         raise TypeError("rgrid2rcm: the fi input argument must be a "
                         "numpy.ndarray, a dask.array.Array, or an "
                         "xarray.DataArray containing either a numpy.ndarray or"
                         " a dask.array.Array.")
+    if compact:
+        fo = compact_cells(fo, cells)
 
     if meta and isinstance(input, xr.DataArray):
         raise MetaError(
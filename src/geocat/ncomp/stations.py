@@ -0,0 +1,276 @@
+import numpy as np
+import xarray as xr
+
+from ._geometry import (apply_weights, bilinear_weights, idw_weights,
+                        inside_quad, quad_coordinates, unit_vectors)
+from .errors import (CoordinateError, DimensionError)
+from .grids import CurvilinearGrid, unpack
+
+STATION_METHODS = ("idw", "bilinear")
+
+# stations are located against this many grid points at a time
+_BLOCK = 2**20
+
+
+def _nearest_nodes(grid_xyz, xyz):
+    """Flat index of the grid point nearest to each station."""
+    best = np.full(len(xyz), -np.inf)
+    nearest = np.zeros(len(xyz), dtype=np.int64)
+    block = max(_BLOCK // max(len(xyz), 1), 1)
+    for start in range(0, len(grid_xyz), block):
+        dots = xyz @ grid_xyz[start:start + block].T
+        i = np.argmax(dots, axis=1)
+        d = dots[np.arange(len(xyz)), i]
+        closer = d > best
+        best[closer] = d[closer]
+        nearest[closer] = i[closer] + start
+    return nearest
+
+
+def _as_ids(station_ids, name):
+    """List of the station IDs `station_ids`, a single ID or a collection
+    of IDs: a list or tuple, kept as given, or an array-like such as a
+    numpy array, :class:`xarray.DataArray` or pandas Index, whose elements
+    are converted to Python objects."""
+    if hasattr(station_ids, "__array__"):
+        station_ids = np.asarray(station_ids).tolist()
+    if isinstance(station_ids, (str, bytes)):
+        station_ids = [station_ids]
+    else:
+        try:
+            station_ids = list(station_ids)
+        except TypeError:
+            station_ids = [station_ids]
+    for station_id in station_ids:
+        try:
+            hash(station_id)
+        except TypeError:
+            raise TypeError("StationInterpolator.{}: station IDs must be "
+                            "hashable, got {!r}".format(name, station_id))
+    return station_ids
+
+
+class StationInterpolator:
+    """Interpolates fields on a fixed curvilinear grid to a set of stations.
+
+    The grid cell enclosing each station, and the weights of its four
+    corners, are computed once when the station is added and kept under its
+    ID, so every later call only gathers and combines four grid values per
+    station. Stations can be added and removed at any time without
+    recomputing the others.
+
+    Args:
+
+        lat2d (:class:`numpy.ndarray`):
+            A two-dimensional array that specifies the latitudes of the
+            grid points. A :class:`~geocat.ncomp.CurvilinearGrid` can be
+            passed as lat2d, with None as lon2d, in place of both arrays.
+
+        lon2d (:class:`numpy.ndarray`):
+            A two-dimensional array that specifies the longitudes of the
+            grid points.
+
+        method (:obj:`str`):
+            "idw" (default) weights the corners of the enclosing cell by
+            their inverse squared great circle distance to the station, like
+            :func:`~geocat.ncomp.rcm2points` does with opt=0 (the results
+            are the same on rectilinear grids); "bilinear" uses the bilinear
+            weights of the station within the cell.
+
+    Examples:
+
+        Example 1: Hourly extraction at a slowly changing station list
+
+        .. code-block:: python
+
+            import geocat.ncomp
+
+            interp = geocat.ncomp.StationInterpolator(ds.XLAT, ds.XLONG)
+            interp.add(stations.id, stations.lat, stations.lon)
+            for hour in ds.time:
+                t2 = interp(ds.T2.sel(time=hour))
+
+            # a station is retired and one is added, the others are kept
+            interp.remove(["KBOU"])
+            interp.add(["KDEN"], [39.85], [-104.66])
+    """
+
+    def __init__(self, lat2d, lon2d=None, method="idw"):
+        lat2d, lon2d = unpack(lat2d, lon2d, CurvilinearGrid, ("lat", "lon"),
+                              "StationInterpolator")
+        if isinstance(lat2d, xr.DataArray):
+            lat2d = lat2d.values
+        if isinstance(lon2d, xr.DataArray):
+            lon2d = lon2d.values
+        lat2d = np.asarray(lat2d, dtype=np.float64)
+        lon2d = np.asarray(lon2d, dtype=np.float64)
+        if lat2d.ndim != 2 or lat2d.shape != lon2d.shape:
+            raise DimensionError(
+                "ERROR StationInterpolator: lat2d and lon2d must be "
+                "two-dimensional and of the same shape !")
+        if lat2d.shape[0] < 2 or lat2d.shape[1] < 2:
+            raise DimensionError(
+                "ERROR StationInterpolator: the grid must have at least 2 "
+                "points in each dimension !")
+        if method not in STATION_METHODS:
+            raise ValueError("StationInterpolator: method must be one of {}, "
+                             "not '{}'".format(", ".join(STATION_METHODS),
+                                               method))
+
+        self.lat2d = lat2d
+        self.lon2d = lon2d
+        self.method = method
+        self._grid_xyz = unit_vectors(lat2d, lon2d).reshape((-1, 3))
+
+        self._ids = []
+        self._rows = {}
+        self._lat = np.empty(0)
+        self._lon = np.empty(0)
+        self._nodes = np.empty((0, 4), dtype=np.int64)
+        self._weights = np.empty((0, 4))
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, station_id):
+        return station_id in self._rows
+
+    @property
+    def station_ids(self):
+        """The station IDs, in the order of the interpolated values."""
+        return list(self._ids)
+
+    def _locate(self, lat, lon):
+        """Corner indices and weights of the cells enclosing the stations.
+
+        The enclosing cell is searched among the four cells around the grid
+        point nearest to each station. Stations in none of them get zero
+        weights, which makes their values missing.
+        """
+        ny, nx = self.lat2d.shape
+        nearest = _nearest_nodes(self._grid_xyz, unit_vectors(lat, lon))
+        jy, jx = np.divmod(nearest, nx)
+
+        # lower left corners of the candidate cells, shape (nstations, 4)
+        cy = np.clip(jy[:, None] + np.array([-1, -1, 0, 0]), 0, ny - 2)
+        cx = np.clip(jx[:, None] + np.array([-1, 0, -1, 0]), 0, nx - 2)
+        nodes = np.stack((cy * nx + cx, cy * nx + cx + 1, (cy + 1) * nx + cx,
+                          (cy + 1) * nx + cx + 1),
+                         axis=-1)
+
+        lat_flat = self.lat2d.ravel()
+        lon_flat = self.lon2d.ravel()
+        u, v = quad_coordinates(lat_flat[nodes], lon_flat[nodes], lat[:, None],
+                                lon[:, None])
+
+        inside = inside_quad(u, v)
+        found = inside.any(axis=1)
+        cell = np.argmax(inside, axis=1)
+        rows = np.arange(len(lat))
+        nodes = nodes[rows, cell]
+
+        if self.method == "bilinear":
+            weights = bilinear_weights(u[rows, cell], v[rows, cell])
+        else:
+            weights = idw_weights(lat_flat[nodes], lon_flat[nodes], lat, lon)
+        weights[~found] = 0.0
+        return nodes, weights
+
+    def add(self, station_ids, lat, lon):
+        """Adds stations, or moves existing ones to new locations.
+
+        Args:
+
+            station_ids (:obj:`list`):
+                Hashable, unique station IDs, or a single ID.
+
+            lat (:class:`numpy.ndarray`):
+                Latitudes of the stations.
+
+            lon (:class:`numpy.ndarray`):
+                Longitudes of the stations.
+        """
+        station_ids = _as_ids(station_ids, "add")
+        lat = np.atleast_1d(np.asarray(lat, dtype=np.float64))
+        lon = np.atleast_1d(np.asarray(lon, dtype=np.float64))
+        if not len(station_ids) == lat.size == lon.size:
+            raise DimensionError(
+                "ERROR StationInterpolator.add: station_ids, lat and lon "
+                "must be of the same size !")
+        if len(set(station_ids)) != len(station_ids):
+            raise CoordinateError(
+                "StationInterpolator.add: station_ids must be unique !")
+
+        # moved stations are removed and added again at the end, once the
+        # new locations are known to be valid
+        nodes, weights = self._locate(lat, lon)
+        self.remove([i for i in station_ids if i in self._rows])
+        for station_id in station_ids:
+            self._rows[station_id] = len(self._ids)
+            self._ids.append(station_id)
+        self._lat = np.concatenate((self._lat, lat))
+        self._lon = np.concatenate((self._lon, lon))
+        self._nodes = np.concatenate((self._nodes, nodes))
+        self._weights = np.concatenate((self._weights, weights))
+
+    def remove(self, station_ids):
+        """Removes stations.
+
+        Args:
+
+            station_ids (:obj:`list`):
+                IDs of stations that were added before, or a single ID.
+        """
+        station_ids = _as_ids(station_ids, "remove")
+        missing = [i for i in station_ids if i not in self._rows]
+        if missing:
+            raise KeyError("StationInterpolator.remove: unknown stations "
+                           "{}".format(missing))
+        if not station_ids:
+            return
+        keep = np.ones(len(self._ids), dtype=bool)
+        keep[[self._rows[i] for i in station_ids]] = False
+        self._ids = [i for i, k in zip(self._ids, keep) if k]
+        self._rows = {i: row for row, i in enumerate(self._ids)}
+        self._lat = self._lat[keep]
+        self._lon = self._lon[keep]
+        self._nodes = self._nodes[keep]
+        self._weights = self._weights[keep]
+
+    def __call__(self, fi, msg=None):
+        """Interpolates `fi` to the stations.
+
+        Args:
+
+            fi (:class:`xarray.DataArray` or :class:`numpy.ndarray`):
+                An array of two or more dimensions whose two rightmost
+                dimensions are the grid.
+
+            msg (:obj:`numpy.number`):
+                A numpy scalar value that represent a missing value in fi.
+
+        Returns:
+            :class:`xarray.DataArray`: The leftmost dimensions of `fi` and a
+            "station" dimension with the station IDs as coordinates. Values
+            are missing (NaN) for stations outside of the grid or whose
+            enclosing cell has no valid corner. Double if fi is double,
+            otherwise float.
+        """
+        dims = None
+        if isinstance(fi, xr.DataArray):
+            dims = fi.dims[:-2]
+            fi = fi.values
+        fi = np.asarray(fi)
+        if fi.ndim < 2 or fi.shape[-2:] != self.lat2d.shape:
+            raise DimensionError(
+                "ERROR StationInterpolator: the rightmost dimensions of fi "
+                "must be the shape of the grid !")
+
+        fo = apply_weights(fi, self._nodes, self._weights, msg)
+
+        fo_dtype = np.float64 if fi.dtype == np.float64 else np.float32
+        return xr.DataArray(
+            fo.astype(fo_dtype),
+            dims=(dims or tuple("dim_{}".format(i) for i in range(fi.ndim - 2)))
+            + ("station",),
+            coords={"station": self._ids})
@@ -0,0 +1,404 @@
+import numpy as np
+import xarray as xr
+
+from ._numpy_engine import (_bracket, _is_increasing, _missing_to_nan,
+                            _output_dtype)
+from .engine import get_kernel
+from .errors import (CoordinateError, DimensionError)
+from .grids import CurvilinearGrid, PointSet, RectilinearGrid, unpack
+
+TIME_INTERP_METHODS = ("linear", "nearest")
+
+
+def _as_float(t):
+    """Returns times as float64, datetimes as nanoseconds since the epoch."""
+    t = np.asarray(t)
+    if t.dtype.kind == "M":
+        return t.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    return t.astype(np.float64)
+
+
+def _time_weights(ti, to, time_interp):
+    """Locates the sample times `to` in `ti`.
+
+    Returns the index of the earlier time level of each sample, the weight
+    of the later one (0 with "nearest" time interpolation, where the index
+    is that of the nearest time level) and a mask of the samples within
+    [ti[0], ti[-1]].
+    """
+    if time_interp not in TIME_INTERP_METHODS:
+        raise ValueError("time_interp must be one of {}, not '{}'".format(
+            ", ".join(TIME_INTERP_METHODS), time_interp))
+    it, wt, inside = _bracket(ti, to)
+    # unlike in space, samples at the last time level are inside
+    inside |= to == ti[-1]
+    if time_interp == "nearest":
+        it = np.where(wt > 0.5, it + 1, it)
+        wt = np.zeros_like(wt)
+    return it, wt, inside
+
+
+def _blend(f0, f1, wt):
+    """Linearly interpolates between the time levels f0 and f1, taking either
+    one unchanged where it has all the weight."""
+    with np.errstate(invalid="ignore"):
+        fo = f0 * (1.0 - wt) + f1 * wt
+    fo = np.where(wt == 0, f0, fo)
+    return np.where(wt == 1, f1, fo)
+
+
+def _levels_batched(call, fi, it, wt, inside):
+    """Interpolates at the sample times with one call of a points kernel.
+
+    `call(fi_levels, samples)` interpolates the time levels `fi_levels` of
+    `fi` to the samples of index `samples`, mapping an array of shape
+    (n, ..., ny, nx) to one of shape (n, ..., samples.size). It is called
+    once, for the time levels spanned by the samples, and each sample is
+    taken from the result at the levels around it and blended in time.
+    """
+    fo = np.full(fi.shape[1:-2] + (it.size,), np.nan)
+    samples = np.flatnonzero(inside)
+    if samples.size == 0:
+        return fo
+    i0 = it[samples]
+    i1 = np.where(wt[samples] > 0, i0 + 1, i0)
+    first = i0.min()
+    values = np.moveaxis(call(fi[first:i1.max() + 1], samples), 0, -2)
+    k = np.arange(samples.size)
+    fo[..., samples] = _blend(values[..., i0 - first, k],
+                              values[..., i1 - first, k], wt[samples])
+    return fo
+
+
+def _linint2_trajectory(ti, xi, yi, fi, to, xo, yo, icycx, time_interp, msg):
+    fo_dtype = _output_dtype(fi)
+    it, wt, inside_t = _time_weights(ti, to, time_interp)
+
+    nx = xi.size
+    if icycx:
+        # column c of the extended grid is column c - 1 of fi, wrapped around
+        xi = np.concatenate(
+            ([xi[0] - (xi[1] - xi[0])], xi, [xi[-1] + (xi[-1] - xi[-2])]))
+    ix, wx, inside_x = _bracket(xi, xo)
+    iy, wy, inside_y = _bracket(yi, yo)
+    inside = inside_t & inside_x & inside_y
+
+    it, wt, ix, wx, iy, wy = (a[inside] for a in (it, wt, ix, wx, iy, wy))
+    weights = ((1 - wy) * (1 - wx), (1 - wy) * wx, wy * (1 - wx), wy * wx)
+
+    def at_time(t):
+        # bilinear interpolation at time level t[k] for each sample k, with
+        # the weights renormalized over the non-missing corners
+        total = 0.0
+        wsum = 0.0
+        for (dy, dx), w in zip(((0, 0), (0, 1), (1, 0), (1, 1)), weights):
+            col = ix + dx
+            if icycx:
+                col = (col - 1) % nx
+            # the sample axis comes first when indexing both ends of fi
+            corner = _missing_to_nan(fi[t, ..., iy + dy, col], msg)
+            corner = np.moveaxis(corner, 0, -1)
+            valid = ~np.isnan(corner)
+            total = total + np.where(valid, corner * w, 0.0)
+            wsum = wsum + np.where(valid, w, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(wsum > 0, total / wsum, np.nan)
+
+    f0 = at_time(it)
+    f1 = at_time(it + 1) if wt.any() else f0
+    fo = np.full(fi.shape[1:-2] + (to.size,), np.nan)
+    fo[..., inside] = _blend(f0, f1, wt)
+    return fo.astype(fo_dtype)
+
+
+def linint2_points_trajectory(fi,
+                              to,
+                              xo,
+                              yo,
+                              icycx,
+                              msg=None,
+                              ti=None,
+                              xi=None,
+                              yi=None,
+                              time_interp="linear",
+                              engine=None):
+    """Interpolates from a time series of rectilinear grids to samples along
+    trajectories, each with its own time and location.
+
+    Args:
+
+        fi (:class:`xarray.DataArray` or :class:`numpy.ndarray`):
+            An array of three or more dimensions. The leftmost dimension is
+            time and the two rightmost dimensions (nyi x nxi) are the
+            dimensions to be used in the spatial interpolation. If
+            user-defined missing values are present (other than NaNs), the
+            value of `msg` must be set appropriately.
+
+        to (:class:`xarray.DataArray` or :class:`numpy.ndarray`):
+            A one-dimensional array that specifies the time of each sample,
+            in the units (or numpy datetime type) of `ti`.
+
+        xo (:class:`xarray.DataArray` or :class:`numpy.ndarray`):
+            A one-dimensional array that specifies the X coordinates of
+            the samples.
+
+        yo (:class:`xarray.DataArray` or :class:`numpy.ndarray`):
+            A one-dimensional array that specifies the Y coordinates of
+            the samples.
+
+        icycx (:obj:`bool`):
+            An option to indicate whether the rightmost dimension of fi
+            is cyclic. This should be set to True only if you have
+            global data, but your longitude values don't quite wrap all
+            the way around the globe.
+
+        msg (:obj:`numpy.number`):
+            A numpy scalar value that represent a missing value in fi.
+
+        ti (:class:`numpy.ndarray`):
+            A strictly monotonically increasing array that specifies the
+            times of the leftmost dimension of `fi`. Taken from the
+            coordinates of `fi` if it is an :class:`xarray.DataArray`.
+
+        xi (:class:`numpy.ndarray`):
+            A strictly monotonically increasing array that specifies
+            the X [longitude] coordinates of the `fi` array.
+
+            A :class:`~geocat.ncomp.RectilinearGrid` can be passed as xi,
+            with None as yi, in place of both arrays.
+
+        yi (:class:`numpy.ndarray`):
+            A strictly monotonically increasing array that specifies
+            the Y [latitude] coordinates of the `fi` array.
+
+        time_interp (:obj:`str`):
+            "linear" (default) interpolates linearly between the two time
+            levels around each sample; "nearest" uses the nearest one.
+
+        engine (:obj:`str`):
+            Name of the engine of the linint2_points kernel to interpolate
+            with, as for :func:`~geocat.ncomp.linint2_points`. If None (the
+            default), the samples are interpolated in the single vectorized
+            pass described below instead.
+
+    Returns:
+        :class:`xarray.DataArray`: The same dimensions as `fi` without the
+        leftmost (time) dimension, and with the two rightmost dimensions
+        replaced by one of the size of `to`. Samples outside of the grid or
+        of [ti[0], ti[-1]] are missing (NaN). The return type will be double
+        if fi is double, and float otherwise.
+
+    Description:
+        Evaluates the equivalent of one :func:`~geocat.ncomp.linint2_points`
+        call per time level at the samples of that time level, followed by
+        linear interpolation in time, in a single vectorized pass over all
+        samples. Only the grid points around the samples are read from
+        `fi`. With an `engine`, its kernel is called once for all samples
+        and the time levels they span instead.
+
+    Examples:
+
+        Example 1: Sampling a model field along a flight track
+
+        .. code-block:: python
+
+            import geocat.ncomp
+
+            # fi has dimensions (time, level, lat, lon); the track has one
+            # time, longitude and latitude per sample
+            fo = geocat.ncomp.linint2_points_trajectory(
+                fi, track.time, track.lon, track.lat, 1)
+    """
+
+    xo, yo = unpack(xo, yo, PointSet, ("x", "y"), "linint2_points_trajectory")
+    xi, yi = unpack(xi, yi, RectilinearGrid, ("x", "y"),
+                    "linint2_points_trajectory")
+
+    if isinstance(fi, xr.DataArray):
+        ti = fi.coords[fi.dims[0]].values if ti is None else ti
+        xi = fi.coords[fi.dims[-1]].values if xi is None else xi
+        yi = fi.coords[fi.dims[-2]].values if yi is None else yi
+        fi = fi.values
+    elif ti is None or xi is None or yi is None:
+        raise CoordinateError(
+            "linint2_points_trajectory: arguments ti, xi and yi must be passed"
+            " explicitly if fi is not an xarray.DataArray !")
+
+    if fi.ndim < 3:
+        raise DimensionError(
+            "ERROR linint2_points_trajectory: fi must be at least three "
+            "dimensions !\n")
+
+    ti, to = (_as_float(t) for t in (ti, to))
+    xi, yi, xo, yo = (np.asarray(c, dtype=np.float64) for c in (xi, yi, xo, yo))
+    if not to.shape == xo.shape == yo.shape or to.ndim != 1:
+        raise DimensionError(
+            "ERROR linint2_points_trajectory: to, xo and yo must be "
+            "one-dimensional and of the same size !")
+    if ti.size < 2:
+        raise DimensionError(
+            "ERROR linint2_points_trajectory: fi must have at least two time levels !"
+        )
+    if ti.size != fi.shape[0]:
+        raise DimensionError(
+            "ERROR linint2_points_trajectory: ti must be the size of the "
+            "leftmost dimension of fi !")
+    if not _is_increasing(ti, xi, yi):
+        raise CoordinateError(
+            "linint2_points_trajectory: ti, xi and yi must be strictly "
+            "monotonically increasing !")
+
+    if engine is None:
+        return xr.DataArray(
+            _linint2_trajectory(ti, xi, yi, fi, to, xo, yo, icycx, time_interp,
+                                msg))
+
+    kernel = get_kernel("linint2_points", engine)
+    it, wt, inside = _time_weights(ti, to, time_interp)
+
+    def interpolate(levels, samples):
+        return kernel(xi, yi, levels, xo[samples], yo[samples], icycx, msg)
+
+    fo = _levels_batched(interpolate, fi, it, wt, inside)
+    return xr.DataArray(fo.astype(_output_dtype(fi)))
+
+
+def rcm2points_trajectory(lat2d,
+                          lon2d,
+                          fi,
+                          to,
+                          lat1dPoints,
+                          lon1dPoints,
+                          opt=0,
+                          msg=None,
+                          ti=None,
+                          time_interp="linear",
+                          engine=None):
+    """Interpolates from a time series of curvilinear grids (i.e. RCM, WRF,
+    NARR) to samples along trajectories, each with its own time and location.
+
+    Args:
+
+        lat2d (:class:`numpy.ndarray`):
+            A two-dimensional array that specifies the latitudes locations
+            of fi. The latitude order must be south-to-north.
+
+            A :class:`~geocat.ncomp.CurvilinearGrid` can be passed as lat2d,
+            with None as lon2d, in place of both arrays.
+
+        lon2d (:class:`numpy.ndarray`):
+            A two-dimensional array that specifies the longitude locations
+            of fi. The latitude order must be west-to-east.
+
+        fi (:class:`xarray.DataArray` or :class:`numpy.ndarray`):
+            An array of three or more dimensions. The leftmost dimension is
+            time and the two rightmost dimensions (latitude, longitude) are
+            the dimensions to be used in the spatial interpolation.
+
+        to (:class:`numpy.ndarray`):
+            A one-dimensional array that specifies the time of each sample,
+            in the units (or numpy datetime type) of `ti`.
+
+        lat1dPoints (:class:`numpy.ndarray`):
+            A one-dimensional array that specifies the latitude coordinates
+            of the samples.
+
+            A :class:`~geocat.ncomp.PointSet` can be passed as lat1dPoints,
+            with None as lon1dPoints, in place of both arrays.
+
+        lon1dPoints (:class:`numpy.ndarray`):
+            A one-dimensional array that specifies the longitude coordinates
+            of the samples.
+
+        opt (:obj:`numpy.number`):
+            opt=0 or 1 means use an inverse distance weight interpolation.
+            opt=2 means use a bilinear interpolation.
+
+        msg (:obj:`numpy.number`):
+            A numpy scalar value that represent a missing value in fi.
+
+        ti (:class:`numpy.ndarray`):
+            A strictly monotonically increasing array that specifies the
+            times of the leftmost dimension of `fi`. Taken from the
+            coordinates of `fi` if it is an :class:`xarray.DataArray`.
+
+        time_interp (:obj:`str`):
+            "linear" (default) interpolates linearly between the two time
+            levels around each sample; "nearest" uses the nearest one.
+
+        engine (:obj:`str`):
+            Name of the engine computing the result: "libncomp" or "numba"
+            (requires numba). Default is the engine set with
+            :func:`~geocat.ncomp.engine.set_default_engine`.
+
+    Returns:
+        :class:`xarray.DataArray`: The same dimensions as `fi` without the
+        leftmost (time) dimension, and with the two rightmost dimensions
+        replaced by one of the size of `to`. Samples outside of
+        [ti[0], ti[-1]] are missing (NaN). Double if fi is double,
+        otherwise float.
+
+    Description:
+        Calls the rcm2points kernel once, with all samples within
+        [ti[0], ti[-1]] and the time levels they span, and interpolates each
+        sample linearly in time between the results at the levels around
+        it. Compared to calling :func:`~geocat.ncomp.rcm2points` once per
+        time step, the inputs are validated and converted, and the samples
+        located on the grid, once.
+    """
+
+    lat2d, lon2d = unpack(lat2d, lon2d, CurvilinearGrid, ("lat", "lon"),
+                          "rcm2points_trajectory")
+    lat1dPoints, lon1dPoints = unpack(lat1dPoints, lon1dPoints, PointSet,
+                                      ("y", "x"), "rcm2points_trajectory")
+
+    if isinstance(fi, xr.DataArray):
+        ti = fi.coords[fi.dims[0]].values if ti is None else ti
+        fi = fi.values
+    elif ti is None:
+        raise CoordinateError(
+            "rcm2points_trajectory: argument ti must be passed explicitly if"
+            " fi is not an xarray.DataArray !")
+    if isinstance(lat2d, xr.DataArray):
+        lat2d = lat2d.values
+    if isinstance(lon2d, xr.DataArray):
+        lon2d = lon2d.values
+
+    if fi.ndim < 3:
+        raise DimensionError(
+            "ERROR rcm2points_trajectory: fi must be at least three "
+            "dimensions !\n")
+    if lat2d.shape != lon2d.shape or fi.shape[-2:] != lat2d.shape:
+        raise DimensionError(
+            "ERROR rcm2points_trajectory: The rightmost dimensions of fi must"
+            " be the shape of the lat2d/lon2d arrays !")
+
+    ti, to = (_as_float(t) for t in (ti, to))
+    lat1dPoints, lon1dPoints = (
+        np.asarray(c, dtype=np.float64) for c in (lat1dPoints, lon1dPoints))
+    if not to.shape == lat1dPoints.shape == lon1dPoints.shape or to.ndim != 1:
+        raise DimensionError(
+            "ERROR rcm2points_trajectory: to, lat1dPoints and lon1dPoints "
+            "must be one-dimensional and of the same size !")
+    if ti.size < 2:
+        raise DimensionError(
+            "ERROR rcm2points_trajectory: fi must have at least two time levels !"
+        )
+    if ti.size != fi.shape[0]:
+        raise DimensionError(
+            "ERROR rcm2points_trajectory: ti must be the size of the leftmost"
+            " dimension of fi !")
+    if not _is_increasing(ti):
+        raise CoordinateError(
+            "rcm2points_trajectory: ti must be strictly monotonically "
+            "increasing !")
+
+    kernel = get_kernel("rcm2points", engine)
+    it, wt, inside = _time_weights(ti, to, time_interp)
+
+    def interpolate(levels, samples):
+        return kernel(lat2d, lon2d, levels, lat1dPoints[samples],
+                      lon1dPoints[samples], opt, msg)
+
+    fo = _levels_batched(interpolate, fi, it, wt, inside)
+    return xr.DataArray(fo.astype(_output_dtype(fi)))
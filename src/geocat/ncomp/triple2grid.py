@@ -1,10 +1,11 @@
 import numpy as np
 import xarray as xr
 
-from . import _ncomp
+from .engine import get_kernel
 # The following imports allow for the function name to be used directly under the package namespace, skipping the module name.
 # This is done to maintain backwards compatibily from when the functions were defined in geocat/ncomp/__init__.py
 from .errors import (DimensionError, MetaError)
+from .grids import PointSet, RectilinearGrid, unpack
 
 
 def triple2grid(x, y, data, xgrid, ygrid, **kwargs):
@@ -17,6 +18,9 @@ def triple2grid(x, y, data, xgrid, ygrid, **kwargs):
             associated with the data values. For geophysical variables, x
             correspond to longitude.
 
+            A :class:`~geocat.ncomp.PointSet` can be passed as x,
+            with None as y, in place of both arrays.
+
 	y (:class:`numpy.ndarray`):
             One-dimensional arrays of the same length containing the coordinates
             associated with the data values. For geophysical variables, y
@@ -33,6 +37,9 @@ def triple2grid(x, y, data, xgrid, ygrid, **kwargs):
             variables, these are longitudes. The coordinates' values must be
             monotonically increasing.
 
+            A :class:`~geocat.ncomp.RectilinearGrid` can be passed as xgrid,
+            with None as ygrid, in place of both arrays.
+
 	ygrid (:class:`numpy.ndarray`):
             A one-dimensional array of length N containing the `y` coordinates
             associated with the returned two-dimensional grid. For geophysical
@@ -64,6 +71,9 @@ def triple2grid(x, y, data, xgrid, ygrid, **kwargs):
                           the metadata from the input array will be copied to the
                           output array; default is False.
                           Warning: this option is not currently supported.
+            - ``engine`` (:obj:`str`): Name of the engine computing the result,
+                          e.g. "libncomp". Default is the engine set with
+                          :func:`~geocat.ncomp.engine.set_default_engine`.
 
     Returns:
 	:class:`numpy.ndarray`: The return array will be K x N x M, where K
@@ -109,6 +119,10 @@ def triple2grid(x, y, data, xgrid, ygrid, **kwargs):
 	    output = geocat.comp.triple2grid(x, y, data, xgrid, ygrid)
     """
 
+    x, y = unpack(x, y, PointSet, ("x", "y"), "triple2grid")
+    xgrid, ygrid = unpack(xgrid, ygrid, RectilinearGrid, ("x", "y"),
+                          "triple2grid")
+
     # todo: Revisit for handling of "meta" argument
     # Basic sanity checks
     if x.shape[0] != y.shape[0] or x.shape[0] != data.shape[data.ndim - 1]:
@@ -170,7 +184,9 @@ def triple2grid(x, y, data, xgrid, ygrid, **kwargs):
         ygrid = ygrid.values
 
     if isinstance(data, np.ndarray):
-        fo = _ncomp._triple2grid(x, y, data, xgrid, ygrid, options, msg)
+        fo = get_kernel("triple2grid",
+                        kwargs.get("engine"))(x, y, data, xgrid, ygrid, options,
+                                              msg)
     else:
         raise TypeError("triple2grid: the data input argument must be a "
                         "numpy.ndarray or an xarray.DataArray containing a "
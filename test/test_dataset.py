@@ -0,0 +1,125 @@
+import numpy as np
+import numpy.testing as nt
+import xarray as xr
+import geocat.ncomp as gn
+
+import unittest as ut
+
+rng = np.random.RandomState(0)
+
+xi = np.linspace(0, 350, num=36)
+yi = np.linspace(-85, 85, num=18)
+xo = np.linspace(0, 340, num=30)
+yo = np.linspace(-80, 80, num=20)
+
+ds_rect = xr.Dataset(
+    {
+        "t": (("time", "lat", "lon"), rng.random_sample((4, 18, 36))),
+        "u": (("time", "lat", "lon"), rng.random_sample((4, 18, 36))),
+        "q": (("time", "lat", "lon"), rng.random_sample(
+            (4, 18, 36)).astype(np.float32)),
+        "z": (("lat", "time", "lon"), rng.random_sample((18, 4, 36))),
+        "zonal": (("time", "lat"), rng.random_sample((4, 18))),
+        "co2": (("time",), np.arange(4.0)),
+    },
+    coords={
+        "time": np.arange(4),
+        "lat": yi,
+        "lon": xi
+    },
+    attrs={"title": "test"})
+ds_rect["t"].attrs["units"] = "K"
+
+# a 20 degree rotated curvilinear grid within the rectilinear grid
+y, x = np.meshgrid(np.arange(12) * 5.0, np.arange(15) * 5.0, indexing="ij")
+lat2d = -30 + x * np.sin(np.deg2rad(20)) + y * np.cos(np.deg2rad(20))
+lon2d = 100 + x * np.cos(np.deg2rad(20)) - y * np.sin(np.deg2rad(20))
+
+ds_curv = xr.Dataset(
+    {
+        "t": (("time", "y", "x"), rng.random_sample((3, 12, 15))),
+        "u": (("time", "y", "x"), rng.random_sample((3, 12, 15))),
+        "co2": (("time",), np.arange(3.0)),
+    },
+    coords={
+        "time": np.arange(3),
+        "lat2d": (("y", "x"), lat2d),
+        "lon2d": (("y", "x"), lon2d)
+    })
+
+
+class Test_linint2_dataset(ut.TestCase):
+
+    def test_linint2_dataset(self):
+        out = gn.linint2_dataset(ds_rect, xo, yo, 1)
+        self.assertEqual(list(out.data_vars), ["t", "u", "q", "z", "co2"])
+        for name in ("t", "u", "q"):
+            expected = gn.linint2(ds_rect[name], xo, yo, 1)
+            self.assertEqual(expected.dtype, out[name].dtype)
+            nt.assert_array_equal(expected.values, out[name].values)
+        nt.assert_array_equal(
+            gn.linint2(ds_rect.z.transpose("time", "lat", "lon"), xo, yo,
+                       1).values, out.z.values)
+        self.assertEqual(out.z.dims, ("time", "lat", "lon"))
+        xr.testing.assert_identical(ds_rect.co2, out.co2)
+        nt.assert_array_equal(xo, out.lon.values)
+        nt.assert_array_equal(yo, out.lat.values)
+        self.assertEqual(out.t.attrs, {"units": "K"})
+        self.assertEqual(out.attrs, {"title": "test"})
+
+    def test_linint2_dataset_dask(self):
+        expected = gn.linint2_dataset(ds_rect, xo, yo, 1)
+        out = gn.linint2_dataset(ds_rect.chunk({"time": 2}), xo, yo, 1)
+        # t and u are interpolated together, by the same tasks
+        self.assertEqual(
+            set(out.t.data.dask.layers) & set(out.u.data.dask.layers),
+            set(out.t.data.dask.layers) - {out.t.data.name})
+        xr.testing.assert_identical(expected, out.compute())
+
+    def test_linint2_dataset_bad_dims(self):
+        with self.assertRaises(gn.DimensionError):
+            gn.linint2_dataset(ds_rect, xo, yo, 1, dims=("lat", "level"))
+
+
+class Test_rcm2rgrid_dataset(ut.TestCase):
+    lat1d = np.linspace(-35, 30, 40)
+    lon1d = np.linspace(95, 190, 50)
+
+    def test_rcm2rgrid_dataset(self):
+        out = gn.rcm2rgrid_dataset(ds_curv,
+                                   "lat2d",
+                                   "lon2d",
+                                   self.lat1d,
+                                   self.lon1d,
+                                   engine="raster")
+        for name in ("t", "u"):
+            expected = gn.rcm2rgrid(lat2d,
+                                    lon2d,
+                                    ds_curv[name].values,
+                                    self.lat1d,
+                                    self.lon1d,
+                                    engine="raster")
+            nt.assert_array_equal(expected.values, out[name].values)
+        self.assertEqual(out.t.dims, ("time", "lat", "lon"))
+        self.assertNotIn("lat2d", out.coords)
+        xr.testing.assert_identical(ds_curv.co2, out.co2)
+
+
+class Test_rgrid2rcm_dataset(ut.TestCase):
+
+    def test_rgrid2rcm_dataset(self):
+        out = gn.rgrid2rcm_dataset(ds_rect,
+                                   ds_curv.lat2d,
+                                   ds_curv.lon2d,
+                                   engine="numpy")
+        for name in ("t", "q"):
+            expected = gn.rgrid2rcm(yi,
+                                    xi,
+                                    ds_rect[name].values,
+                                    lat2d,
+                                    lon2d,
+                                    engine="numpy")
+            self.assertEqual(expected.dtype, out[name].dtype)
+            nt.assert_array_equal(expected.values, out[name].values)
+        self.assertEqual(out.t.dims, ("time", "y", "x"))
+        nt.assert_array_equal(lat2d, out.lat2d.values)
@@ -0,0 +1,206 @@
+import numpy as np
+import geocat.ncomp
+from geocat.ncomp import engine
+
+import unittest as ut
+import warnings
+
+# Inputs shared by the engine conformance tests
+xi = np.linspace(0, 350, num=36, dtype=np.float64)
+yi = np.linspace(-85, 85, num=18, dtype=np.float64)
+xo = np.linspace(-20, 370, num=80, dtype=np.float64)
+yo = np.linspace(-90, 90, num=45, dtype=np.float64)
+
+rng = np.random.RandomState(0)
+fi_np = rng.random_sample((2, 3, yi.size, xi.size))
+fi_nan = fi_np.copy()
+fi_nan[rng.random_sample(fi_nan.shape) < 0.1] = np.nan
+fi_msg = np.where(np.isnan(fi_nan), -99.0, fi_nan)
+
+xpts = rng.uniform(-10, 360, 200)
+ypts = rng.uniform(-90, 90, 200)
+
+
+def _compare(test, kernel, *args):
+    expected = engine.get_kernel(kernel, "libncomp")(*args)
+    actual = engine.get_kernel(kernel, "numpy")(*args)
+    test.assertEqual(expected.dtype, actual.dtype)
+    test.assertEqual(expected.shape, actual.shape)
+    np.testing.assert_allclose(actual, expected, rtol=1e-10, equal_nan=True)
+
+
+class Test_numpy_engine(ut.TestCase):
+
+    def test_linint2(self):
+        for icycx in (0, 1):
+            _compare(self, "linint2", xi, yi, fi_np, xo, yo, icycx, None)
+
+    def test_linint2_float32(self):
+        _compare(self, "linint2", xi, yi, fi_np.astype(np.float32), xo, yo, 1,
+                 None)
+
+    def test_linint2_nan(self):
+        for icycx in (0, 1):
+            _compare(self, "linint2", xi, yi, fi_nan, xo, yo, icycx, None)
+
+    def test_linint2_msg(self):
+        _compare(self, "linint2", xi, yi, fi_msg, xo, yo, 1, -99.0)
+
+    def test_linint2_points(self):
+        for icycx in (0, 1):
+            _compare(self, "linint2_points", xi, yi, fi_np, xpts, ypts, icycx,
+                     None)
+
+    def test_linint2_points_nan(self):
+        _compare(self, "linint2_points", xi, yi, fi_nan, xpts, ypts, 1, None)
+
+    def test_linint2_points_msg(self):
+        _compare(self, "linint2_points", xi, yi, fi_msg, xpts, ypts, 0, -99.0)
+
+    def test_linint2_points_shared_cells(self):
+        # many points per cell take the deduplicated path
+        x = np.repeat(rng.uniform(340, 355, 20), 10)
+        y = np.repeat(rng.uniform(-20, 20, 20), 10)
+        for icycx in (0, 1):
+            _compare(self, "linint2_points", xi, yi, fi_nan, x, y, icycx, None)
+            _compare(self, "linint2_points", xi, yi, fi_np, x, y, icycx, None)
+
+    def test_linint2_points_nonuniform(self):
+        # unequally spaced coordinates take the binary search path
+        xi_log = np.geomspace(1, 350, num=36)
+        _compare(self, "linint2_points", xi_log, yi, fi_nan, xpts, ypts, 0,
+                 None)
+        _compare(self, "linint2", xi_log, yi, fi_nan, xo, yo, 0, None)
+
+    def test_locate_uniform(self):
+        from geocat.ncomp._numpy_engine import _locate
+
+        # equally spaced, up to the rounding of float32
+        for x in (xi, yi, np.linspace(-90, 90, 721, dtype=np.float32)):
+            x = x.astype(np.float64)
+            points = np.concatenate(
+                (rng.uniform(x[0] - 5, x[-1] + 5,
+                             1000), x, np.nextafter(x, np.inf),
+                 np.nextafter(x, -np.inf), [np.nan, np.inf, -np.inf]))
+            np.testing.assert_array_equal(
+                _locate(x, points),
+                np.searchsorted(x, points, side="right") - 1)
+
+    def test_grid2triple(self):
+        _compare(self, "grid2triple", xi, yi, fi_nan[0, 0], None)
+        _compare(self, "grid2triple", xi, yi, fi_msg[0, 0], -99.0)
+
+    def test_dpres_plevel(self):
+        plev = np.array([1000., 925., 850., 700., 500., 300., 200., 100., 50.])
+        psfc = np.array([[1013., 900., 650.], [980., np.nan, 400.]])
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            _compare(self, "dpres_plevel", plev, psfc, 30.0, None)
+            _compare(self, "dpres_plevel", plev, np.array([1013.]), 30.0, None)
+
+    def test_public_function(self):
+        expected = geocat.ncomp.linint2(fi_nan, xo, yo, 1, xi=xi, yi=yi)
+        actual = geocat.ncomp.linint2(fi_nan,
+                                      xo,
+                                      yo,
+                                      1,
+                                      xi=xi,
+                                      yi=yi,
+                                      engine="numpy")
+        np.testing.assert_allclose(actual, expected, equal_nan=True)
+
+
+class Test_engine_registry(ut.TestCase):
+
+    def tearDown(self):
+        engine.set_default_engine("libncomp")
+        for kernels in engine._kernels.values():
+            kernels.pop("test", None)
+        engine._kernels.pop("test_kernel", None)
+
+    def test_available_engines(self):
+        self.assertEqual(engine.available_engines()[0], "libncomp")
+        self.assertIn("numpy", engine.available_engines("linint2"))
+        self.assertNotIn("numpy", engine.available_engines("rcm2rgrid"))
+
+    def test_unsupported_engine(self):
+        with self.assertRaises(ValueError):
+            geocat.ncomp.rcm2points(np.zeros((2, 2)),
+                                    np.zeros((2, 2)),
+                                    np.zeros((2, 2)),
+                                    np.zeros(1),
+                                    np.zeros(1),
+                                    engine="numpy")
+
+    def test_unknown_default_engine(self):
+        with self.assertRaises(ValueError):
+            engine.set_default_engine("not_an_engine")
+
+    def test_default_engine_fallback(self):
+        self.assertEqual(engine.set_default_engine("numpy"), "libncomp")
+        self.assertEqual(engine.get_default_engine(), "numpy")
+        self.assertIs(engine.get_kernel("linint2"),
+                      engine.get_kernel("linint2", "numpy"))
+        self.assertIs(engine.get_kernel("rcm2rgrid"),
+                      engine.get_kernel("rcm2rgrid", "libncomp"))
+
+    def test_broken_libncomp(self):
+        engine.register_engine("test_kernel", "libncomp",
+                               "._no_such_module:_test_kernel")
+        engine.register_engine("test_kernel", "test", len)
+        with self.assertRaises(ImportError):
+            engine.get_kernel("test_kernel")
+        engine.set_default_engine("numpy")
+        with self.assertWarns(geocat.ncomp.NcompWarning):
+            self.assertIs(engine.get_kernel("test_kernel"), len)
+
+    def test_register_engine(self):
+        calls = []
+
+        def kernel(*args):
+            calls.append(args)
+            return np.zeros((3,))
+
+        engine.register_engine("grid2triple", "test", kernel)
+        geocat.ncomp.grid2triple(np.arange(3.0),
+                                 np.arange(1.0),
+                                 np.zeros((1, 3)),
+                                 engine="test")
+        self.assertEqual(len(calls), 1)
+
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+@ut.skipIf(numba is None, "requires numba")
+class Test_numba_engine(ut.TestCase):
+
+    def _compare(self, kernel, *args):
+        expected = engine.get_kernel(kernel, "libncomp")(*args)
+        actual = engine.get_kernel(kernel, "numba")(*args)
+        self.assertEqual(expected.dtype, actual.dtype)
+        self.assertEqual(expected.shape, actual.shape)
+        np.testing.assert_allclose(actual, expected, rtol=1e-6, equal_nan=True)
+
+    def test_linint2_points(self):
+        for icycx in (0, 1):
+            self._compare("linint2_points", xi, yi, fi_nan, xpts, ypts, icycx,
+                          None)
+
+    def test_linint2_points_msg(self):
+        self._compare("linint2_points", xi, yi, fi_msg.astype(np.float32), xpts,
+                      ypts, 0, -99.0)
+
+    def test_rcm2points(self):
+        lat2d, lon2d = np.meshgrid(yi, xi[:20], indexing="ij")
+        lat2d = lat2d + 0.1 * np.sin(np.deg2rad(lon2d))
+        lat = rng.uniform(-80, 80, 100)
+        lon = rng.uniform(0, 180, 100)
+        for opt in (0, 2):
+            self._compare("rcm2points", lat2d, lon2d, fi_nan[..., :20], lat,
+                          lon, opt, None)
+            self._compare("rcm2points", lat2d, lon2d, fi_msg[..., :20], lat,
+                          lon, opt, -99.0)
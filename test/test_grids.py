@@ -0,0 +1,193 @@
+import numpy as np
+import xarray as xr
+import geocat.ncomp
+from geocat.ncomp import (CoordinateError, CurvilinearGrid, DimensionError,
+                          PointSet, RectilinearGrid)
+
+import unittest as ut
+from unittest import mock
+
+xi = np.arange(0, 360, 10, dtype=np.float64)
+yi = np.linspace(-85, 85, num=18, dtype=np.float64)
+xo = np.linspace(5, 345, num=50)
+yo = np.linspace(-80, 80, num=30)
+
+rng = np.random.RandomState(0)
+fi_np = rng.random_sample((2, yi.size, xi.size))
+
+lat2d, lon2d = np.meshgrid(np.linspace(-60, 60, 20),
+                           np.linspace(10, 300, 25),
+                           indexing="ij")
+xpts = rng.uniform(10, 340, 40)
+ypts = rng.uniform(-80, 80, 40)
+
+
+class Test_RectilinearGrid(ut.TestCase):
+
+    def test_properties(self):
+        grid = RectilinearGrid(xi, yi[::-1])
+        self.assertEqual(grid.shape, (yi.size, xi.size))
+        self.assertEqual(grid.x_direction, 1)
+        self.assertEqual(grid.y_direction, -1)
+        self.assertAlmostEqual(grid.x_spacing, 10.0)
+        self.assertAlmostEqual(grid.y_spacing, 10.0)
+        self.assertTrue(grid.cyclic)
+        self.assertEqual(grid.bbox, (-85.0, 85.0, 0.0, 350.0))
+        np.testing.assert_array_equal(grid.lon, xi)
+        np.testing.assert_array_equal(grid.lat, yi[::-1])
+
+    def test_not_cyclic(self):
+        self.assertFalse(RectilinearGrid(xi[:-3], yi).cyclic)
+        uneven = np.concatenate((xi[:10], xi[11:]))
+        grid = RectilinearGrid(uneven, yi)
+        self.assertIsNone(grid.x_spacing)
+        self.assertFalse(grid.cyclic)
+
+    def test_copy_is_read_only(self):
+        x = xi.copy()
+        grid = RectilinearGrid(xr.DataArray(x), yi)
+        x[0] = -1.0
+        self.assertEqual(grid.x[0], 0.0)
+        with self.assertRaises(ValueError):
+            grid.x[0] = 1.0
+
+    def test_immutable(self):
+        grid = RectilinearGrid(xi, yi)
+        with self.assertRaises(AttributeError):
+            grid.x = xo
+
+    def test_equality(self):
+        grid = RectilinearGrid(xi, yi)
+        self.assertEqual(grid, RectilinearGrid(list(xi), yi))
+        self.assertEqual(hash(grid), hash(RectilinearGrid(xi, yi)))
+        self.assertNotEqual(grid, RectilinearGrid(xi, yi[::-1]))
+        self.assertNotEqual(grid, PointSet(xi[:18], yi))
+
+    def test_not_monotonic(self):
+        with self.assertRaises(CoordinateError):
+            RectilinearGrid(xi[[0, 2, 1, 3]], yi)
+
+    def test_bad_shape(self):
+        with self.assertRaises(DimensionError):
+            RectilinearGrid(xi[:1], yi)
+        with self.assertRaises(DimensionError):
+            RectilinearGrid(lat2d, yi)
+
+
+class Test_CurvilinearGrid(ut.TestCase):
+
+    def test_properties(self):
+        grid = CurvilinearGrid(lat2d, lon2d)
+        self.assertEqual(grid.shape, lat2d.shape)
+        self.assertEqual(grid.bbox, (-60.0, 60.0, 10.0, 300.0))
+        self.assertEqual(grid, CurvilinearGrid(lat2d.copy(), lon2d))
+
+    def test_bad_shape(self):
+        with self.assertRaises(DimensionError):
+            CurvilinearGrid(lat2d, lon2d[1:])
+        with self.assertRaises(DimensionError):
+            CurvilinearGrid(lat2d[:1], lon2d[:1])
+
+
+class Test_PointSet(ut.TestCase):
+
+    def test_properties(self):
+        points = PointSet(xpts, ypts)
+        self.assertEqual(points.size, xpts.size)
+        self.assertEqual(points.bbox,
+                         (ypts.min(), ypts.max(), xpts.min(), xpts.max()))
+
+    def test_bad_shape(self):
+        with self.assertRaises(DimensionError):
+            PointSet(xpts, ypts[1:])
+
+
+class Test_descriptor_arguments(ut.TestCase):
+
+    def test_linint2(self):
+        expected = geocat.ncomp.linint2(fi_np, xo, yo, 0, xi=xi, yi=yi)
+        actual = geocat.ncomp.linint2(fi_np,
+                                      RectilinearGrid(xo, yo),
+                                      None,
+                                      0,
+                                      xi=RectilinearGrid(xi, yi))
+        np.testing.assert_array_equal(actual.values, expected.values)
+
+    def test_linint2_points(self):
+        expected = geocat.ncomp.linint2_points(fi_np,
+                                               xpts,
+                                               ypts,
+                                               0,
+                                               xi=xi,
+                                               yi=yi)
+        actual = geocat.ncomp.linint2_points(fi_np,
+                                             PointSet(xpts, ypts),
+                                             None,
+                                             0,
+                                             xi=RectilinearGrid(xi, yi))
+        np.testing.assert_array_equal(np.asarray(actual), np.asarray(expected))
+
+    def test_checks_once(self):
+        # the direction and spacing of the coordinates of grids are not
+        # checked again by later calls
+        src = RectilinearGrid(xi, yi[::-1])
+        dst = RectilinearGrid(xo, yo)
+        expected = geocat.ncomp.linint2(fi_np[..., ::-1, :],
+                                        xo,
+                                        yo,
+                                        0,
+                                        xi=xi,
+                                        yi=yi[::-1],
+                                        engine="numpy")
+        geocat.ncomp.linint2(fi_np[..., ::-1, :],
+                             dst,
+                             None,
+                             0,
+                             xi=src,
+                             engine="numpy")
+        with mock.patch("numpy.diff", wraps=np.diff) as diff:
+            actual = geocat.ncomp.linint2(fi_np[..., ::-1, :],
+                                          dst,
+                                          None,
+                                          0,
+                                          xi=src,
+                                          engine="numpy")
+        self.assertEqual(diff.call_count, 0)
+        np.testing.assert_array_equal(actual.values, expected.values)
+
+    def test_rgrid2rcm_key_once(self):
+        # the coordinates of grids are hashed once for the weights cache
+        src = RectilinearGrid(xi, yi)
+        dst = CurvilinearGrid(lat2d, lon2d)
+        geocat.ncomp.rgrid2rcm(src, None, fi_np, dst, None, engine="numpy")
+        module = geocat.ncomp._numpy_engine
+        with mock.patch.object(module, "_digest",
+                               wraps=module._digest) as digest:
+            geocat.ncomp.rgrid2rcm(src, None, fi_np, dst, None, engine="numpy")
+        self.assertEqual(digest.call_count, 0)
+
+    def test_wrong_descriptor(self):
+        with self.assertRaises(CoordinateError):
+            geocat.ncomp.linint2_points(fi_np,
+                                        RectilinearGrid(xo, yo),
+                                        None,
+                                        0,
+                                        xi=xi,
+                                        yi=yi)
+
+    def test_second_array_passed(self):
+        with self.assertRaises(CoordinateError):
+            geocat.ncomp.linint2(fi_np,
+                                 RectilinearGrid(xo, yo),
+                                 yo,
+                                 0,
+                                 xi=xi,
+                                 yi=yi)
+
+    def test_stations(self):
+        fi = rng.random_sample(lat2d.shape)
+        expected = geocat.ncomp.StationInterpolator(lat2d, lon2d)
+        actual = geocat.ncomp.StationInterpolator(CurvilinearGrid(lat2d, lon2d))
+        for interp in (expected, actual):
+            interp.add(np.arange(xpts.size), ypts / 2, xpts)
+        np.testing.assert_array_equal(actual(fi).values, expected(fi).values)
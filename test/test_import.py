@@ -1,7 +1,58 @@
+import subprocess
+import sys
 import unittest as ut
 
 
+def imported_modules(code):
+    """Runs `code` in a fresh interpreter and returns its sys.modules keys."""
+    out = subprocess.check_output([
+        sys.executable, "-c",
+        code + "\nimport sys\nprint(' '.join(sys.modules))"
+    ])
+    return set(out.decode().split())
+
+
 class Test_Import(ut.TestCase):
 
     def test_import(self):
         import geocat.ncomp
+
+    @ut.skipIf(sys.version_info < (3, 7), "requires PEP 562")
+    def test_import_is_lazy(self):
+        modules = imported_modules("import geocat.ncomp")
+        self.assertNotIn("dask", modules)
+        self.assertNotIn("xarray", modules)
+        self.assertNotIn("geocat.ncomp.linint2", modules)
+        self.assertNotIn("geocat.ncomp._ncomp", modules)
+
+    @ut.skipIf(sys.version_info < (3, 7), "requires PEP 562")
+    def test_numpy_input_does_not_import_dask(self):
+        if "dask.array" in imported_modules(
+                "import numpy as np\nimport xarray as xr\n"
+                "xr.DataArray(np.zeros(1))"):
+            self.skipTest("this xarray version imports dask itself")
+        modules = imported_modules(
+            "import numpy as np\n"
+            "import geocat.ncomp\n"
+            "geocat.ncomp.linint2(np.zeros((3, 4)), np.arange(4.0), "
+            "np.arange(3.0), 0, xi=np.arange(4.0), yi=np.arange(3.0))")
+        self.assertNotIn("dask.array", modules)
+
+    def test_submodule_import_keeps_functions(self):
+        modules = imported_modules("import geocat.ncomp.dataset\n"
+                                   "assert callable(geocat.ncomp.linint2)\n"
+                                   "import geocat.ncomp.linint2\n"
+                                   "import geocat.ncomp.rcm2rgrid\n"
+                                   "from geocat.ncomp import linint2\n"
+                                   "assert callable(linint2)\n"
+                                   "assert callable(geocat.ncomp.rcm2rgrid)")
+        self.assertIn("geocat.ncomp.linint2", modules)
+
+    def test_public_attributes(self):
+        import geocat.ncomp
+        for name in geocat.ncomp.__all__:
+            self.assertTrue(
+                callable(getattr(geocat.ncomp, name)) or name == "__version__")
+        self.assertIn("linint2_points", dir(geocat.ncomp))
+        with self.assertRaises(AttributeError):
+            geocat.ncomp.not_a_function
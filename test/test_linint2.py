@@ -11,6 +11,7 @@ n = 127
 xi = np.linspace(0, n, num=n // 2 + 1, dtype=np.float64)
 yi = np.linspace(0, n, num=n // 2 + 1, dtype=np.float64)
 yi_reverse = yi[::-1].copy()
+yi_non_monotonic = np.concatenate((yi[1::-1], yi[2:]))
 xo = np.linspace(xi.min(), xi.max(), num=xi.shape[0] * 2 - 1)
 yo = np.linspace(yi.min(), yi.max(), num=yi.shape[0] * 2 - 1)
 fi_np = np.random.rand(96, 3, len(yi), len(xi)).astype(np.float64)
@@ -249,10 +250,10 @@ class Test_linint2_numpy(ut.TestCase):
 class Test_linint2_non_monotonic(ut.TestCase):
 
     def test_linint2_non_monotonic_xr(self):
-        fi = xr.DataArray(fi_np[:, :, ::-1, :],
+        fi = xr.DataArray(fi_np,
                           dims=['time', 'level', 'lat', 'lon'],
                           coords={
-                              'lat': yi_reverse,
+                              'lat': yi_non_monotonic,
                               'lon': xi
                           }).chunk(chunks)
         with self.assertWarns(geocat.ncomp._ncomp.NcompWarning):
@@ -260,12 +261,331 @@ class Test_linint2_non_monotonic(ut.TestCase):
 
     def test_linint2_non_monotonic_np(self):
         with self.assertWarns(geocat.ncomp._ncomp.NcompWarning):
-            geocat.ncomp.linint2(fi_np[:, :, ::-1, :],
-                                 xo,
-                                 yo,
-                                 0,
-                                 xi=xi,
-                                 yi=yi_reverse)
+            geocat.ncomp.linint2(fi_np, xo, yo, 0, xi=xi, yi=yi_non_monotonic)
+
+
+class Test_linint2_descending(ut.TestCase):
+
+    def test_linint2_descending_yi(self):
+        expected = geocat.ncomp.linint2(fi_np, xo, yo, 0, xi=xi, yi=yi)
+        fo = geocat.ncomp.linint2(fi_np[:, :, ::-1, :],
+                                  xo,
+                                  yo,
+                                  0,
+                                  xi=xi,
+                                  yi=yi_reverse)
+        np.testing.assert_allclose(fo.values, expected.values, rtol=1e-12)
+
+    def test_linint2_descending_yo(self):
+        expected = geocat.ncomp.linint2(fi_np, xo, yo, 0, xi=xi, yi=yi)
+        fo = geocat.ncomp.linint2(fi_np, xo, yo[::-1], 0, xi=xi, yi=yi)
+        np.testing.assert_array_equal(fo.values, expected.values[..., ::-1, :])
+
+    def test_linint2_descending_cyclic_xr(self):
+        lon = np.arange(0, 360, 10.0)
+        xo_cyclic = np.linspace(-5, 365, 75)
+        fi = xr.DataArray(fi_np[:2, :, :, :lon.size],
+                          dims=['time', 'level', 'lat', 'lon'],
+                          coords={
+                              'lat': yi,
+                              'lon': lon
+                          })
+        expected = geocat.ncomp.linint2(fi, xo_cyclic, yo, 1)
+        fo = geocat.ncomp.linint2(fi[..., ::-1].chunk(), xo_cyclic[::-1], yo, 1)
+        np.testing.assert_allclose(fo.values,
+                                   expected.values[..., ::-1],
+                                   rtol=1e-12)
+        np.testing.assert_array_equal(fo.lon, xo_cyclic[::-1])
+
+
+class Test_linint2_regional(ut.TestCase):
+
+    lon = np.arange(0, 360, 2.0)
+    lat = np.linspace(-89, 89, 90)
+    fi = np.random.RandomState(0).random_sample((2, 90, 180))
+
+    def test_linint2_regional(self):
+        # a regional output grid is interpolated from the part of fi around
+        # it, with the same values as on a global output grid
+        fo_global = geocat.ncomp.linint2(self.fi,
+                                         self.lon,
+                                         self.lat,
+                                         1,
+                                         xi=self.lon,
+                                         yi=self.lat)
+        for icycx in (0, 1):
+            fo = geocat.ncomp.linint2(self.fi,
+                                      self.lon[10:21],
+                                      self.lat[50:61],
+                                      icycx,
+                                      xi=self.lon,
+                                      yi=self.lat)
+            np.testing.assert_array_equal(fo.values,
+                                          fo_global.values[..., 50:61, 10:21])
+
+    def test_linint2_regional_seam(self):
+        xo_seam = np.linspace(355, 365, 11)
+        fo = geocat.ncomp.linint2(self.fi,
+                                  xo_seam,
+                                  self.lat[50:61],
+                                  1,
+                                  xi=self.lon,
+                                  yi=self.lat)
+        self.assertFalse(np.isnan(fo.values).any())
+        np.testing.assert_allclose(fo.values[..., 5],
+                                   self.fi[:, 50:61, 0],
+                                   rtol=1e-12)
+
+
+class Test_linint2_target_mask(ut.TestCase):
+
+    lon = np.arange(0, 360, 2.0)
+    lat = np.linspace(-89, 89, 90)
+    fi = np.random.RandomState(0).random_sample((2, 90, 180))
+    xo = np.arange(0, 360, 1.0)
+    yo = np.linspace(-88, 88, 177)
+    # a disk of active cells, and a few scattered ones
+    y, x = np.meshgrid(np.arange(177), np.arange(360), indexing="ij")
+    mask = ((y - 120)**2 + (x - 300)**2 < 400) | ((y == 10) & (x % 97 == 0))
+
+    def setUp(self):
+        self.expected = geocat.ncomp.linint2(self.fi,
+                                             self.xo,
+                                             self.yo,
+                                             1,
+                                             xi=self.lon,
+                                             yi=self.lat).values
+
+    def test_linint2_target_mask_dense(self):
+        fo = geocat.ncomp.linint2(self.fi,
+                                  self.xo,
+                                  self.yo,
+                                  1,
+                                  xi=self.lon,
+                                  yi=self.lat,
+                                  target_mask=self.mask).values
+        np.testing.assert_array_equal(fo[:, self.mask],
+                                      self.expected[:, self.mask])
+        self.assertTrue(np.isnan(fo[:, ~self.mask]).all())
+
+    def test_linint2_target_mask_descending(self):
+        fo = geocat.ncomp.linint2(self.fi,
+                                  self.xo[::-1],
+                                  self.yo,
+                                  1,
+                                  xi=self.lon,
+                                  yi=self.lat,
+                                  target_mask=self.mask[:, ::-1]).values
+        np.testing.assert_array_equal(fo[..., ::-1][:, self.mask],
+                                      self.expected[:, self.mask])
+
+    def test_linint2_target_mask_compact(self):
+        cells = np.flatnonzero(self.mask)[::-1]
+        fi = xr.DataArray(self.fi,
+                          dims=("time", "lat", "lon"),
+                          coords={
+                              "time": [0, 1],
+                              "lat": self.lat,
+                              "lon": self.lon
+                          })
+        fo = geocat.ncomp.linint2(fi,
+                                  self.xo,
+                                  self.yo,
+                                  1,
+                                  target_mask=cells,
+                                  compact=True)
+        self.assertEqual(fo.dims, ("time", "cell"))
+        np.testing.assert_array_equal(fo.values,
+                                      self.expected.reshape(2, -1)[:, cells])
+        np.testing.assert_array_equal(fo.lon, self.xo[cells % self.xo.size])
+        np.testing.assert_array_equal(fo.lat, self.yo[cells // self.xo.size])
+
+    def test_linint2_target_mask_dask(self):
+        import dask.array as da
+
+        fo = geocat.ncomp.linint2(da.from_array(self.fi, chunks=(1, 90, 180)),
+                                  self.xo,
+                                  self.yo,
+                                  1,
+                                  xi=self.lon,
+                                  yi=self.lat,
+                                  target_mask=self.mask,
+                                  compact=True)
+        np.testing.assert_array_equal(fo.values, self.expected[:, self.mask])
+
+    def test_linint2_target_mask_int_empty(self):
+        import dask.array as da
+
+        fi = (self.fi * 100).astype(np.int32)
+        for data in (fi, da.from_array(fi, chunks=(1, 90, 180))):
+            fo = geocat.ncomp.linint2(data,
+                                      self.xo,
+                                      self.yo,
+                                      1,
+                                      xi=self.lon,
+                                      yi=self.lat,
+                                      target_mask=np.zeros_like(self.mask))
+            self.assertEqual(fo.dtype, np.float32)
+            self.assertTrue(np.isnan(fo.values).all())
+
+    def test_linint2_compact_without_mask(self):
+        with self.assertRaises(ValueError):
+            geocat.ncomp.linint2(self.fi,
+                                 self.xo,
+                                 self.yo,
+                                 1,
+                                 xi=self.lon,
+                                 yi=self.lat,
+                                 compact=True)
+
+    def test_linint2_target_mask_bad_shape(self):
+        with self.assertRaises(geocat.ncomp.DimensionError):
+            geocat.ncomp.linint2(self.fi,
+                                 self.xo,
+                                 self.yo,
+                                 1,
+                                 xi=self.lon,
+                                 yi=self.lat,
+                                 target_mask=self.mask[1:])
+
+
+class Test_linint2_nearest(ut.TestCase):
+
+    lon = np.arange(0, 360, 10.0)
+    lat = np.linspace(-85, 85, 18)
+    fi = np.random.RandomState(0).randint(0, 9, (2, 18, 36)).astype(np.int16)
+    xo = np.linspace(-180, 179, 100)
+    yo = np.linspace(-90, 90, 50)
+
+    def expected(self, fill):
+        # nearest neighbors by brute force, on the sphere along x
+        ix = np.argmin(np.abs((self.xo[:, None] - self.lon + 180) % 360 - 180),
+                       axis=1)
+        iy = np.argmin(np.abs(self.yo[:, None] - self.lat), axis=1)
+        fo = self.fi[:, iy][:, :, ix]
+        fo[:, (self.yo < self.lat[0]) | (self.yo > self.lat[-1])] = fill
+        return fo
+
+    def test_linint2_nearest_int(self):
+        fo = geocat.ncomp.linint2(self.fi,
+                                  self.xo,
+                                  self.yo,
+                                  1,
+                                  xi=self.lon,
+                                  yi=self.lat,
+                                  method="nearest")
+        self.assertEqual(fo.dtype, np.int16)
+        np.testing.assert_array_equal(fo.values,
+                                      self.expected(np.iinfo(np.int16).min))
+
+    def test_linint2_nearest_uint(self):
+        fi = self.fi.astype(np.uint8)
+        fo = geocat.ncomp.linint2(fi,
+                                  self.xo,
+                                  self.yo,
+                                  1,
+                                  xi=self.lon,
+                                  yi=self.lat,
+                                  method="nearest")
+        self.assertEqual(fo.dtype, np.uint8)
+        np.testing.assert_array_equal(fo.values, self.expected(255))
+
+    def test_linint2_nearest_msg(self):
+        fo = geocat.ncomp.linint2(self.fi,
+                                  self.xo,
+                                  self.yo[::-1],
+                                  1,
+                                  xi=self.lon,
+                                  yi=self.lat,
+                                  msg=-1,
+                                  method="nearest")
+        np.testing.assert_array_equal(fo.values[:, ::-1], self.expected(-1))
+
+    def test_linint2_nearest_float32(self):
+        fi = self.fi.astype(np.float32)
+        fi[0, 5, 5] = -99
+        fo = geocat.ncomp.linint2(fi,
+                                  self.lon + 5,
+                                  self.lat,
+                                  0,
+                                  xi=self.lon,
+                                  yi=self.lat,
+                                  msg=-99,
+                                  method="nearest").values
+        self.assertEqual(fo.dtype, np.float32)
+        self.assertTrue(np.isnan(fo[0, 5, 4]))
+        self.assertTrue(np.isnan(fo[..., -1]).all())
+        np.testing.assert_array_equal(fo[1, :, :-1], fi[1, :, 1:])
+
+    def test_linint2_nearest_dask_mask(self):
+        import dask.array as da
+
+        mask = np.zeros((self.yo.size, self.xo.size), dtype=bool)
+        mask[10:20, 30:90] = True
+        fo = geocat.ncomp.linint2(da.from_array(self.fi, chunks=(1, 18, 36)),
+                                  self.xo,
+                                  self.yo,
+                                  1,
+                                  xi=self.lon,
+                                  yi=self.lat,
+                                  msg=-1,
+                                  method="nearest",
+                                  target_mask=mask).values
+        self.assertEqual(fo.dtype, np.int16)
+        np.testing.assert_array_equal(fo[:, mask], self.expected(-1)[:, mask])
+        self.assertTrue((fo[:, ~mask] == -1).all())
+
+    def test_linint2_unknown_method(self):
+        with self.assertRaises(ValueError):
+            geocat.ncomp.linint2(self.fi,
+                                 self.xo,
+                                 self.yo,
+                                 1,
+                                 xi=self.lon,
+                                 yi=self.lat,
+                                 method="cubic")
+
+
+class Test_linint2_longitudes(ut.TestCase):
+
+    lon = np.arange(0, 360, 10.0)
+    fi = fi_np[:2, :, :, :36]
+
+    def test_linint2_longitudes_180(self):
+        xo_180 = np.linspace(-180, 175, 72)
+        # 0 to 175, then 180 to 355
+        xo_360 = np.roll(np.mod(xo_180, 360.0), -36)
+        expected = geocat.ncomp.linint2(self.fi,
+                                        xo_360,
+                                        yo,
+                                        1,
+                                        xi=self.lon,
+                                        yi=yi)
+        fo = geocat.ncomp.linint2(self.fi, xo_180, yo, 1, xi=self.lon, yi=yi)
+        np.testing.assert_array_equal(fo.values,
+                                      np.roll(expected.values, 36, axis=-1))
+
+    def test_linint2_longitudes_360(self):
+        lon_180 = self.lon - 180.0
+        fi = np.roll(self.fi, 18, axis=-1)
+        xo_360 = np.linspace(0, 355, 72)
+        expected = geocat.ncomp.linint2(self.fi,
+                                        xo_360,
+                                        yo,
+                                        1,
+                                        xi=self.lon,
+                                        yi=yi)
+        fo = geocat.ncomp.linint2(fi, xo_360, yo, 1, xi=lon_180, yi=yi)
+        np.testing.assert_allclose(fo.values, expected.values, rtol=1e-12)
+
+    def test_linint2_longitudes_not_cyclic(self):
+        fo = geocat.ncomp.linint2(self.fi,
+                                  np.array([-30.0, -20.0]),
+                                  yo,
+                                  0,
+                                  xi=self.lon,
+                                  yi=yi)
+        self.assertTrue(np.isnan(fo.values).all())
 
 
 class Test_linint2_non_contiguous(ut.TestCase):
@@ -296,3 +616,316 @@ class Test_linint2_non_contiguous(ut.TestCase):
                                   yi=yi_reverse[::-1])
         np.testing.assert_array_equal(fi[:, :, ::-1, :].values,
                                       fo[..., ::2, ::2].values)
+
+
+class Test_linint2_multi(ut.TestCase):
+    targets = [(xo, yo), (xi[1:-1:3] + 0.5, yi[2:-2:5] + 0.25), (xi, yi)]
+
+    def _check(self, fos, fi, msg=None, **kwargs):
+        self.assertEqual(len(fos), len(self.targets))
+        for fo, (x, y) in zip(fos, self.targets):
+            expected = geocat.ncomp.linint2(fi, x, y, 0, msg=msg, **kwargs)
+            self.assertEqual(expected.dtype, fo.dtype)
+            np.testing.assert_array_equal(expected.values, fo.values)
+
+    def test_linint2_multi(self):
+        fi = xr.DataArray(fi_np[:2],
+                          dims=['time', 'level', 'lat', 'lon'],
+                          coords={
+                              'lat': yi,
+                              'lon': xi
+                          })
+        fos = geocat.ncomp.linint2_multi(fi, self.targets, 0)
+        self._check(fos, fi)
+        self.assertEqual(fos[0].dims, fi.dims)
+
+    def test_linint2_multi_workers(self):
+        fos = geocat.ncomp.linint2_multi(fi_np[:2],
+                                         self.targets,
+                                         0,
+                                         xi=xi,
+                                         yi=yi,
+                                         workers=3)
+        self._check(fos, fi_np[:2], xi=xi, yi=yi)
+
+    def test_linint2_multi_msg(self):
+        fi = fi_np[:2].astype(np.float32)
+        fi[:, :, 10:15, 20:30] = -99
+        fos = geocat.ncomp.linint2_multi(fi,
+                                         self.targets,
+                                         0,
+                                         msg=np.float32(-99),
+                                         xi=xi,
+                                         yi=yi,
+                                         workers=2)
+        self._check(fos, fi, msg=np.float32(-99), xi=xi, yi=yi)
+        # the input is left as it was
+        self.assertTrue((fi[:, :, 10:15, 20:30] == -99).all())
+
+    def test_linint2_multi_scans_once(self):
+        import sys
+        from unittest import mock
+        from geocat.ncomp import engine
+        from geocat.ncomp._numpy_engine import _linint2
+
+        module = sys.modules["geocat.ncomp.linint2"]
+        fi = fi_np[:2].copy()
+        fi[:, :, 10:15, 20:30] = np.nan
+        seen = []
+
+        def scanning(*args):
+            raise AssertionError("the scanning kernel was called")
+
+        def filled(xi, yi, fi, xo, yo, icycx, msg):
+            # fi comes with its missing values set to msg already
+            seen.append((fi, msg))
+            self.assertFalse(np.isnan(fi).any())
+            return _linint2(xi, yi, fi, xo, yo, icycx, msg)
+
+        kernels = {"linint2": scanning, "linint2_filled": filled}
+        saved = {k: engine._kernels[k]["libncomp"] for k in kernels}
+        engine._kernels["linint2"]["libncomp"] = scanning
+        engine._kernels["linint2_filled"]["libncomp"] = filled
+        try:
+            with mock.patch.object(module, "_prepare",
+                                   wraps=module._prepare) as prepare:
+                fos = geocat.ncomp.linint2_multi(fi,
+                                                 self.targets,
+                                                 0,
+                                                 xi=xi,
+                                                 yi=yi,
+                                                 engine="libncomp",
+                                                 workers=3)
+        finally:
+            for k, impl in saved.items():
+                engine._kernels[k]["libncomp"] = impl
+        # fi is scanned for missing values once, for all target grids
+        self.assertEqual(1, prepare.call_count)
+        self.assertEqual(len(self.targets), len(seen))
+        # the kernels are given views of one prepared array
+        owners = {id(f if f.base is None else f.base) for f, _ in seen}
+        self.assertEqual(1, len(owners))
+        self._check(fos, fi, xi=xi, yi=yi)
+        self.assertTrue(np.isnan(fi[:, :, 10:15, 20:30]).all())
+
+    def test_linint2_multi_int(self):
+        fi = (fi_np[:2] * 1000).astype(np.int32)
+        fos = geocat.ncomp.linint2_multi(fi, self.targets, 0, xi=xi, yi=yi)
+        self._check(fos, fi, xi=xi, yi=yi)
+
+    def test_linint2_multi_dask(self):
+        fi = xr.DataArray(fi_np[:4],
+                          dims=['time', 'level', 'lat', 'lon'],
+                          coords={
+                              'lat': yi,
+                              'lon': xi
+                          }).chunk({'time': 1})
+        fos = geocat.ncomp.linint2_multi(fi, self.targets, 0)
+        self._check(fos, fi)
+
+
+class Test_linint2_pyramid(ut.TestCase):
+
+    lon = np.arange(0, 360, 1.0)
+    lat = np.linspace(-89.5, 89.5, 180)
+    fi = np.random.RandomState(0).random_sample((2, 180, 360))
+    # every other point of the level before
+    nested = [(np.arange(0, 360, 2.0), np.linspace(-88.5, 87.5, 89)),
+              (np.arange(0, 360, 4.0), np.linspace(-88.5, 87.5, 45)),
+              (np.arange(0, 360, 8.0), np.linspace(-88.5, 87.5, 23))]
+
+    def _direct(self, levels, fi=None):
+        fi = self.fi if fi is None else fi
+        return [
+            geocat.ncomp.linint2(fi, x, y, 1, xi=self.lon, yi=self.lat).values
+            for x, y in levels
+        ]
+
+    def test_linint2_pyramid_nested(self):
+        fos = geocat.ncomp.linint2_pyramid(self.fi,
+                                           self.nested,
+                                           1,
+                                           xi=self.lon,
+                                           yi=self.lat)
+        for fo, expected in zip(fos, self._direct(self.nested)):
+            np.testing.assert_allclose(fo.values, expected, rtol=1e-12)
+
+    def test_linint2_pyramid_not_nested(self):
+        levels = [(np.arange(0.5, 360, 2.0), np.arange(-88.5, 89, 2.0)),
+                  (np.arange(1.5, 360, 4.0), np.arange(-87.5, 88, 4.0))]
+        lat, lon = np.meshgrid(np.deg2rad(self.lat),
+                               np.deg2rad(self.lon),
+                               indexing="ij")
+        fi = np.cos(lat) * np.sin(2 * lon)
+        fos = geocat.ncomp.linint2_pyramid(fi,
+                                           levels,
+                                           1,
+                                           xi=self.lon,
+                                           yi=self.lat)
+        direct = self._direct(levels, fi)
+        np.testing.assert_array_equal(fos[0].values, direct[0])
+        # interpolated twice: close, but not the same
+        np.testing.assert_allclose(fos[1].values, direct[1], atol=1e-3)
+        self.assertFalse(np.array_equal(fos[1].values, direct[1]))
+        fos = geocat.ncomp.linint2_pyramid(fi,
+                                           levels,
+                                           1,
+                                           xi=self.lon,
+                                           yi=self.lat,
+                                           cascade=False)
+        for fo, expected in zip(fos, direct):
+            np.testing.assert_array_equal(fo.values, expected)
+
+    def test_linint2_pyramid_not_spanned(self):
+        # the second level extends past the first, and is interpolated from fi
+        levels = [(np.arange(100, 200, 1.5), np.arange(0, 40, 1.5)),
+                  (np.arange(90, 210, 3.0), np.arange(-10, 50, 3.0))]
+        fos = geocat.ncomp.linint2_pyramid(self.fi,
+                                           levels,
+                                           1,
+                                           xi=self.lon,
+                                           yi=self.lat)
+        for fo, expected in zip(fos, self._direct(levels)):
+            np.testing.assert_array_equal(fo.values, expected)
+
+    def test_linint2_pyramid_dask(self):
+        import dask.array as da
+
+        fi = xr.DataArray(self.fi,
+                          dims=("time", "lat", "lon"),
+                          coords={
+                              "lat": self.lat,
+                              "lon": self.lon
+                          }).chunk({"time": 1})
+        fos = geocat.ncomp.linint2_pyramid(fi, self.nested, 1)
+        for fo, expected in zip(fos, self._direct(self.nested)):
+            self.assertIsInstance(fo.data, da.Array)
+            self.assertEqual(fo.dims, fi.dims)
+            np.testing.assert_allclose(fo.values, expected, rtol=1e-12)
+
+
+class Test_linint2_dims(ut.TestCase):
+
+    lon = np.arange(0, 360, 10.0)
+    lat = np.linspace(-85, 85, 18)
+    # time last
+    fi = np.random.RandomState(0).random_sample((18, 36, 5))
+    xo = np.linspace(0, 350, 50)
+    yo = np.linspace(-80, 80, 30)
+
+    def setUp(self):
+        self.expected = geocat.ncomp.linint2(np.moveaxis(self.fi, -1, 0),
+                                             self.xo,
+                                             self.yo,
+                                             1,
+                                             xi=self.lon,
+                                             yi=self.lat).values
+
+    def test_linint2_dims_index(self):
+        fo = geocat.ncomp.linint2(self.fi,
+                                  self.xo,
+                                  self.yo,
+                                  1,
+                                  xi=self.lon,
+                                  yi=self.lat,
+                                  x_dim=1,
+                                  y_dim=0)
+        self.assertEqual(fo.shape, (30, 50, 5))
+        np.testing.assert_array_equal(fo.values,
+                                      np.moveaxis(self.expected, 0, -1))
+
+    def test_linint2_dims_name(self):
+        import dask.array as da
+
+        fi = xr.DataArray(self.fi,
+                          dims=("lat", "lon", "time"),
+                          coords={
+                              "lat": self.lat,
+                              "lon": self.lon
+                          })
+        for data in (fi, fi.chunk({"time": 2})):
+            fo = geocat.ncomp.linint2(data,
+                                      self.xo,
+                                      self.yo,
+                                      1,
+                                      x_dim="lon",
+                                      y_dim="lat")
+            self.assertEqual(fo.dims, ("lat", "lon", "time"))
+            self.assertEqual(isinstance(fo.data, da.Array),
+                             isinstance(data.data, da.Array))
+            np.testing.assert_array_equal(fo.values,
+                                          np.moveaxis(self.expected, 0, -1))
+            np.testing.assert_array_equal(fo.lon, self.xo)
+
+    def test_linint2_dims_staged(self):
+        from geocat.ncomp._staging import staged
+
+        fi = np.moveaxis(
+            np.random.RandomState(1).random_sample((4, 3, 5, 6)), 1, -1)
+        fo = staged(lambda block: block[..., ::-1, :] * 2,
+                    fi,
+                    nbytes=fi.itemsize * 5 * 6 * 2)
+        np.testing.assert_array_equal(fo, fi[..., ::-1, :] * 2)
+
+    def test_linint2_dims_unknown(self):
+        with self.assertRaises(geocat.ncomp.DimensionError):
+            geocat.ncomp.linint2(self.fi,
+                                 self.xo,
+                                 self.yo,
+                                 1,
+                                 xi=self.lon,
+                                 yi=self.lat,
+                                 x_dim="lon")
+        with self.assertRaises(geocat.ncomp.DimensionError):
+            geocat.ncomp.linint2(self.fi,
+                                 self.xo,
+                                 self.yo,
+                                 1,
+                                 xi=self.lon,
+                                 yi=self.lat,
+                                 x_dim=0,
+                                 y_dim=0)
+
+
+class Test_linint2_staging(ut.TestCase):
+
+    def test_linint2_staging_memmap(self):
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp:
+            fi = np.memmap(os.path.join(tmp, "fi.dat"),
+                           dtype=np.float64,
+                           mode="w+",
+                           shape=fi_np.shape)
+            fi[:] = fi_np
+            # a strided view of a memory-mapped file
+            view = fi[::2, :, ::-1, :]
+            expected = geocat.ncomp.linint2(np.array(view),
+                                            xo,
+                                            yo,
+                                            0,
+                                            xi=xi,
+                                            yi=yi_reverse).values
+            for staging in (None, True, view[0, 0].nbytes * 5):
+                fo = geocat.ncomp.linint2(view,
+                                          xo,
+                                          yo,
+                                          0,
+                                          xi=xi,
+                                          yi=yi_reverse,
+                                          staging=staging)
+                np.testing.assert_array_equal(expected, fo.values)
+            del fi, view
+
+    def test_linint2_staging_empty(self):
+        fi = np.zeros((2, 0) + fi_np.shape[-2:])
+        for staging in (True, 8):
+            fo = geocat.ncomp.linint2(fi[:, :, ::-1],
+                                      xo,
+                                      yo,
+                                      0,
+                                      xi=xi,
+                                      yi=yi_reverse,
+                                      staging=staging)
+            self.assertEqual(fo.shape, (2, 0, yo.size, xo.size))
@@ -18,6 +18,7 @@ class BaseTestClass(metaclass=ABCMeta):
     _yi = np.linspace(0, _no, num=_ni, dtype=np.float64)
 
     _yi_reverse = _yi[::-1].copy()
+    _yi_non_monotonic = np.concatenate((_yi[1::-1], _yi[2:]))
     _xo = np.linspace(_xi.min(), _xi.max(), num=_no)
     _yo = np.linspace(_yi.min(), _yi.max(), num=_no)
     _fi_np = np.array([
@@ -133,10 +134,10 @@ class Test_linint2points_numpy(ut.TestCase, BaseTestClass):
 class Test_linint2points_non_monotonic(ut.TestCase, BaseTestClass):
 
     def test_linint2points_non_monotonic_xr(self):
-        fi = xr.DataArray(self._fi_np[:, :, ::-1, :],
+        fi = xr.DataArray(self._fi_np,
                           dims=['time', 'level', 'lat', 'lon'],
                           coords={
-                              'lat': self._yi_reverse,
+                              'lat': self._yi_non_monotonic,
                               'lon': self._xi
                           }).chunk(self._chunks)
         with self.assertWarns(geocat.ncomp._ncomp.NcompWarning):
@@ -144,12 +145,31 @@ class Test_linint2points_non_monotonic(ut.TestCase, BaseTestClass):
 
     def test_linint2points_non_monotonic_np(self):
         with self.assertWarns(geocat.ncomp._ncomp.NcompWarning):
-            geocat.ncomp.linint2_points(self._fi_np[:, :, ::-1, :],
+            geocat.ncomp.linint2_points(self._fi_np,
                                         self._xo,
                                         self._yo,
                                         0,
                                         xi=self._xi,
-                                        yi=self._yi_reverse)
+                                        yi=self._yi_non_monotonic)
+
+    def test_linint2points_descending(self):
+        expected = geocat.ncomp.linint2_points(self._fi_np,
+                                               self._xo,
+                                               self._yo,
+                                               0,
+                                               xi=self._xi,
+                                               yi=self._yi)
+        fo = geocat.ncomp.linint2_points(self._fi_np[..., ::-1, ::-1],
+                                         self._xo,
+                                         self._yo,
+                                         0,
+                                         xi=self._xi[::-1],
+                                         yi=self._yi_reverse)
+        # the points on the edges of the grid differ: like xi[0], the first
+        # value of a decreasing xi is inside the grid and its last is not
+        np.testing.assert_allclose(fo[..., 1:-1],
+                                   expected[..., 1:-1],
+                                   rtol=1e-12)
 
 
 class Test_linint2points_float64(ut.TestCase, BaseTestClass):
@@ -241,6 +261,91 @@ class Test_linint2points_float64(ut.TestCase, BaseTestClass):
         # Below test cases (would require corrections though)
 
 
+class Test_linint2points_reorder(ut.TestCase, BaseTestClass):
+
+    def test_linint2points_reorder(self):
+        rng = np.random.RandomState(0)
+        xo = rng.uniform(self._xi.min(), self._xi.max(), 50)
+        yo = rng.uniform(self._yi.min(), self._yi.max(), 50)
+        expected = geocat.ncomp.linint2_points(self._fi_np_msg_nan,
+                                               xo,
+                                               yo,
+                                               0,
+                                               xi=self._xi,
+                                               yi=self._yi)
+        for reorder in ("morton", "hilbert"):
+            fo = geocat.ncomp.linint2_points(self._fi_np_msg_nan,
+                                             xo,
+                                             yo,
+                                             0,
+                                             xi=self._xi,
+                                             yi=self._yi,
+                                             reorder=reorder)
+            np.testing.assert_array_equal(expected.values, fo.values)
+
+    def test_linint2points_reorder_unknown(self):
+        with self.assertRaises(ValueError):
+            geocat.ncomp.linint2_points(self._fi_np,
+                                        self._xo,
+                                        self._yo,
+                                        0,
+                                        xi=self._xi,
+                                        yi=self._yi,
+                                        reorder="peano")
+
+
+class Test_linint2points_nearest(ut.TestCase):
+
+    xi = np.arange(4) * 2.0
+    fi = np.arange(16, dtype=np.int32).reshape(4, 4)
+
+    def test_linint2points_nearest(self):
+        xo = np.array([0.9, 1.1, 5.2, 6.0, 6.5, -1.0])
+        yo = np.array([0.0, 3.1, 6.0, 2.0, 0.0, 0.0])
+        fo = geocat.ncomp.linint2_points(self.fi,
+                                         xo,
+                                         yo,
+                                         0,
+                                         xi=self.xi,
+                                         yi=self.xi,
+                                         method="nearest",
+                                         msg=-1)
+        self.assertEqual(fo.dtype, np.int32)
+        np.testing.assert_array_equal(fo.values, [0, 9, 15, 7, -1, -1])
+
+    def test_linint2points_nearest_cyclic(self):
+        fo = geocat.ncomp.linint2_points(self.fi,
+                                         np.array([7.9, -1.1]),
+                                         np.array([0.0, 0.0]),
+                                         1,
+                                         xi=self.xi,
+                                         yi=self.xi,
+                                         method="nearest")
+        np.testing.assert_array_equal(fo.values, [0, 3])
+
+
+class Test_linint2points_staging(ut.TestCase, BaseTestClass):
+
+    def test_linint2points_staging(self):
+        # a strided view of a stack of fields
+        fi = np.stack((self._fi_np, 2 * self._fi_np), axis=-3)[..., ::-1, :, :]
+        expected = geocat.ncomp.linint2_points(np.ascontiguousarray(fi),
+                                               self._xo,
+                                               self._yo,
+                                               0,
+                                               xi=self._xi,
+                                               yi=self._yi)
+        for staging in (None, True, fi[0, 0, 0].nbytes):
+            fo = geocat.ncomp.linint2_points(fi,
+                                             self._xo,
+                                             self._yo,
+                                             0,
+                                             xi=self._xi,
+                                             yi=self._yi,
+                                             staging=staging)
+            np.testing.assert_array_equal(expected.values, fo.values)
+
+
 #
 # class Test_linint2points_dask(ut.TestCase, BaseTestClass):
 #     def test_linint2points_chunked_leftmost(self):
@@ -193,3 +193,37 @@ class Test_rcm2points(ut.TestCase):
                           lon,
                           opt=2,
                           msg=msg32))
+
+    def test_rcm2points_reorder(self):
+        lat_pts = np.asarray([3.0, 1.0, 4.5, 2.0, 1.5])
+        lon_pts = np.asarray([3.0, 1.0, 1.5, 2.0, 4.5])
+        for opt in (0, 2):
+            expected = gn.rcm2points(lat2d, lon2d, fi_nan, lat_pts, lon_pts,
+                                     opt)
+            for reorder in ("morton", "hilbert"):
+                nt.assert_array_equal(
+                    expected,
+                    gn.rcm2points(lat2d,
+                                  lon2d,
+                                  fi_nan,
+                                  lat_pts,
+                                  lon_pts,
+                                  opt,
+                                  reorder=reorder))
+
+    def test_rcm2points_staging(self):
+        lat_pts = np.asarray([3.0, 1.0, 4.5, 2.0, 1.5])
+        lon_pts = np.asarray([3.0, 1.0, 1.5, 2.0, 4.5])
+        fi = np.stack((fi_nan, fi_nom), axis=-1)[..., ::-1, :, :]
+        fi = np.moveaxis(fi, -1, 0)[..., ::-1, :]
+        expected = gn.rcm2points(lat2d, lon2d, np.ascontiguousarray(fi),
+                                 lat_pts, lon_pts)
+        for staging in (None, True, fi_nom[0].nbytes):
+            nt.assert_array_equal(
+                expected,
+                gn.rcm2points(lat2d,
+                              lon2d,
+                              fi,
+                              lat_pts,
+                              lon_pts,
+                              staging=staging))
@@ -102,3 +102,231 @@ class Test_rcm2rgrid(ut.TestCase):
                          lat,
                          lon,
                          msg=msg32))
+
+
+class Test_rcm2rgrid_raster(ut.TestCase):
+
+    def test_rcm2rgrid_raster_descending(self):
+        fo = gn.rcm2rgrid(lat2d,
+                          lon2d,
+                          fi_nom.astype(np.float64),
+                          lat[::-1],
+                          lon[::-1],
+                          engine="raster")
+        nt.assert_array_almost_equal(fo_nom_expected[..., ::-1, ::-1], fo)
+
+    def test_rcm2rgrid_raster_nom(self):
+        nt.assert_array_almost_equal(
+            fo_nom_expected,
+            gn.rcm2rgrid(lat2d,
+                         lon2d,
+                         fi_nom.astype(np.float64),
+                         lat,
+                         lon,
+                         engine="raster"))
+
+    def test_rcm2rgrid_raster_msg(self):
+        fo = gn.rcm2rgrid(lat2d,
+                          lon2d,
+                          fi_msg.astype(np.float32),
+                          lat,
+                          lon,
+                          msg=msg32,
+                          engine="raster").values
+        self.assertEqual(fo.dtype, np.float32)
+        # no gap-filling: the missing center point is interpolated from the
+        # corners of its cell instead
+        center = np.zeros(fo.shape, dtype=bool)
+        center[:, 1, 1] = True
+        nt.assert_array_almost_equal(fo_nom_expected[~center], fo[~center])
+        self.assertTrue(np.isfinite(fo[center]).all())
+
+    def test_rcm2rgrid_raster_rotated(self):
+        # a grid rotated by 30 degrees; the targets outside of it are missing
+        y, x = np.meshgrid(np.linspace(0, 10, 41),
+                           np.linspace(0, 10, 41),
+                           indexing="ij")
+        angle = np.deg2rad(30)
+        lat2d_r = 20 + x * np.sin(angle) + y * np.cos(angle)
+        lon2d_r = 100 + x * np.cos(angle) - y * np.sin(angle)
+        lat_r = np.linspace(18, 36, 37)
+        lon_r = np.linspace(90, 112, 45)
+        fo = gn.rcm2rgrid(lat2d_r,
+                          lon2d_r,
+                          lat2d_r,
+                          lat_r,
+                          lon_r,
+                          engine="raster").values
+
+        lat_t, lon_t = np.meshgrid(lat_r, lon_r, indexing="ij")
+        # local grid coordinates of the targets
+        dlat, dlon = lat_t - 20, lon_t - 100
+        x_t = dlon * np.cos(angle) + dlat * np.sin(angle)
+        y_t = dlat * np.cos(angle) - dlon * np.sin(angle)
+        eps = 1e-6
+        inside = ((x_t >= eps) & (x_t <= 10 - eps) & (y_t >= eps) &
+                  (y_t <= 10 - eps))
+        outside = ((x_t < -eps) | (x_t > 10 + eps) | (y_t < -eps) |
+                   (y_t > 10 + eps))
+        self.assertTrue(inside.sum() > 100)
+        self.assertTrue(np.isnan(fo[outside]).all())
+        # within the cell spacing of the linear field
+        nt.assert_allclose(fo[inside], lat_t[inside], atol=0.25)
+
+
+class Test_rcm2rgrid_tiled(ut.TestCase):
+    # a 20 degree rotated grid, and a target grid partly outside of it
+    y, x = np.meshgrid(np.arange(60) * 0.2, np.arange(70) * 0.2, indexing="ij")
+    lat2d = 10 + x * np.sin(np.deg2rad(20)) + y * np.cos(np.deg2rad(20))
+    lon2d = -120 + x * np.cos(np.deg2rad(20)) - y * np.sin(np.deg2rad(20))
+    fi = np.random.RandomState(0).random_sample((2, 60, 70))
+    lat1d = np.linspace(5, 30, 80)
+    lon1d = np.linspace(-130, -100, 90)
+
+    def test_rcm2rgrid_spatial_chunks(self):
+        import dask.array as da
+
+        expected = gn.rcm2rgrid(self.lat2d,
+                                self.lon2d,
+                                self.fi,
+                                self.lat1d,
+                                self.lon1d,
+                                engine="raster")
+        fo = gn.rcm2rgrid(self.lat2d,
+                          self.lon2d,
+                          da.from_array(self.fi, chunks=(1, 20, 35)),
+                          self.lat1d,
+                          self.lon1d,
+                          engine="raster")
+        self.assertEqual(fo.data.chunks[-2:], ((27, 27, 26), (45, 45)))
+        nt.assert_array_equal(expected.values, fo.values)
+
+    def test_rcm2rgrid_out_chunks(self):
+        import dask.array as da
+
+        expected = gn.rcm2rgrid(self.lat2d,
+                                self.lon2d,
+                                self.fi,
+                                self.lat1d,
+                                self.lon1d,
+                                engine="raster")
+        fo = gn.rcm2rgrid(self.lat2d,
+                          self.lon2d,
+                          da.from_array(self.fi),
+                          self.lat1d,
+                          self.lon1d,
+                          engine="raster",
+                          out_chunks=(25, 40))
+        self.assertEqual(fo.data.chunks[-2:], ((25, 25, 25, 5), (40, 40, 10)))
+        nt.assert_array_equal(expected.values, fo.values)
+
+    def test_rcm2rgrid_windows(self):
+        from geocat.ncomp._tiling import (curvilinear_window,
+                                          curvilinear_windows)
+
+        # the windows with the bounds computed once are those without
+        window = curvilinear_windows(self.lat2d, self.lon2d)
+        for lat in np.array_split(self.lat1d, 7):
+            for lon in np.array_split(self.lon1d, 5):
+                self.assertEqual(
+                    curvilinear_window(self.lat2d, self.lon2d, lat, lon),
+                    window(self.lat2d, self.lon2d, lat, lon))
+
+    def test_rcm2rgrid_north_to_south(self):
+        expected = gn.rcm2rgrid(self.lat2d,
+                                self.lon2d,
+                                self.fi,
+                                self.lat1d,
+                                self.lon1d,
+                                engine="raster")
+        fo = gn.rcm2rgrid(self.lat2d[::-1],
+                          self.lon2d[::-1],
+                          self.fi[:, ::-1],
+                          self.lat1d,
+                          self.lon1d,
+                          engine="raster")
+        nt.assert_array_equal(expected.values, fo.values)
+
+    def test_rcm2rgrid_bad_out_chunks(self):
+        import dask.array as da
+
+        with self.assertRaises(gn.ChunkError):
+            gn.rcm2rgrid(self.lat2d,
+                         self.lon2d,
+                         da.from_array(self.fi),
+                         self.lat1d,
+                         self.lon1d,
+                         out_chunks=(0, 10))
+
+    def test_rcm2rgrid_target_mask(self):
+        import dask.array as da
+
+        expected = gn.rcm2rgrid(self.lat2d,
+                                self.lon2d,
+                                self.fi,
+                                self.lat1d,
+                                self.lon1d,
+                                engine="raster").values
+        mask = np.zeros(expected.shape[-2:], dtype=bool)
+        mask[20:40, 30:50] = True
+        for fi in (self.fi, da.from_array(self.fi)):
+            fo = gn.rcm2rgrid(self.lat2d,
+                              self.lon2d,
+                              fi,
+                              self.lat1d[::-1],
+                              self.lon1d,
+                              engine="raster",
+                              target_mask=mask[::-1]).values
+            nt.assert_array_equal(fo[:, ::-1][:, mask], expected[:, mask])
+            self.assertTrue(np.isnan(fo[:, ::-1][:, ~mask]).all())
+            fo = gn.rcm2rgrid(self.lat2d,
+                              self.lon2d,
+                              fi,
+                              self.lat1d,
+                              self.lon1d,
+                              engine="raster",
+                              target_mask=np.flatnonzero(mask),
+                              compact=True).values
+            nt.assert_array_equal(fo, expected[:, mask])
+
+    def test_rcm2rgrid_dims(self):
+        expected = gn.rcm2rgrid(self.lat2d,
+                                self.lon2d,
+                                self.fi,
+                                self.lat1d,
+                                self.lon1d,
+                                engine="raster").values
+        fo = gn.rcm2rgrid(self.lat2d,
+                          self.lon2d,
+                          np.moveaxis(self.fi, 0, -1),
+                          self.lat1d,
+                          self.lon1d,
+                          engine="raster",
+                          x_dim=1,
+                          y_dim=0)
+        nt.assert_array_equal(fo.values, np.moveaxis(expected, 0, -1))
+
+    def test_rcm2rgrid_staging(self):
+        expected = gn.rcm2rgrid(self.lat2d,
+                                self.lon2d,
+                                self.fi,
+                                self.lat1d,
+                                self.lon1d,
+                                engine="raster")
+        fi = np.stack((self.fi, self.fi[::-1]))[:, :, ::2, ::2]
+        fo = gn.rcm2rgrid(self.lat2d[::2, ::2],
+                          self.lon2d[::2, ::2],
+                          fi,
+                          self.lat1d,
+                          self.lon1d,
+                          engine="raster",
+                          staging=self.fi[0].nbytes // 4)
+        nt.assert_array_equal(
+            fo.values,
+            gn.rcm2rgrid(self.lat2d[::2, ::2],
+                         self.lon2d[::2, ::2],
+                         np.ascontiguousarray(fi),
+                         self.lat1d,
+                         self.lon1d,
+                         engine="raster").values)
+        self.assertEqual(fo.shape, (2,) + expected.shape)
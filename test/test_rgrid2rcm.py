@@ -101,3 +101,213 @@ class Test_rgrid2rcm(ut.TestCase):
                          lat2d,
                          lon2d,
                          msg=msg32))
+
+
+class Test_rgrid2rcm_numpy(ut.TestCase):
+
+    def test_rgrid2rcm_numpy_nom(self):
+        nt.assert_array_almost_equal(
+            fo_nom_expected,
+            gn.rgrid2rcm(lat,
+                         lon,
+                         fi_nom.astype(np.float64),
+                         lat2d,
+                         lon2d,
+                         engine="numpy"))
+
+    def test_rgrid2rcm_numpy_nan(self):
+        nt.assert_array_almost_equal(
+            fo_nan_expected,
+            gn.rgrid2rcm(lat,
+                         lon,
+                         fi_nan.astype(np.float32),
+                         lat2d,
+                         lon2d,
+                         engine="numpy"))
+
+    def test_rgrid2rcm_numpy_msg(self):
+        nt.assert_array_almost_equal(
+            fo_msg_expected,
+            gn.rgrid2rcm(lat,
+                         lon,
+                         fi_msg.astype(np.float64),
+                         lat2d,
+                         lon2d,
+                         msg=msg64,
+                         engine="numpy"))
+
+    def test_rgrid2rcm_numpy_cached_weights(self):
+        from geocat.ncomp import _numpy_engine
+
+        _numpy_engine._rgrid2rcm_cache.clear()
+        first = gn.rgrid2rcm(lat, lon, fi_nom, lat2d, lon2d, engine="numpy")
+        self.assertEqual(len(_numpy_engine._rgrid2rcm_cache), 1)
+        # the weights are reused for another field on the same grids
+        second = gn.rgrid2rcm(lat, lon, fi_nan, lat2d, lon2d, engine="numpy")
+        self.assertEqual(len(_numpy_engine._rgrid2rcm_cache), 1)
+        nt.assert_array_almost_equal(fo_nom_expected, first)
+        nt.assert_array_almost_equal(fo_nan_expected, second)
+
+    def test_rgrid2rcm_numpy_cache_threads(self):
+        import threading
+        from geocat.ncomp import _numpy_engine
+
+        errors = []
+
+        def regrid(shift):
+            try:
+                for i in range(20):
+                    # more grid pairs than cache slots, so entries are evicted
+                    gn.rgrid2rcm(lat,
+                                 lon,
+                                 fi_nom,
+                                 lat2d + (shift + i) % 7 * 0.1,
+                                 lon2d,
+                                 engine="numpy")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=regrid, args=(k,)) for k in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        self.assertLessEqual(len(_numpy_engine._rgrid2rcm_cache),
+                             _numpy_engine._RGRID2RCM_CACHE_SIZE)
+
+    def test_rgrid2rcm_numpy_outside(self):
+        fo = gn.rgrid2rcm(lat, lon, fi_nom, lat2d + 3.5, lon2d,
+                          engine="numpy").values
+        # only the first column of the shifted grid is within the source grid
+        self.assertTrue(np.isfinite(fo[..., 0]).all())
+        self.assertTrue(np.isnan(fo[..., 1:]).all())
+
+
+class Test_rgrid2rcm_regional(ut.TestCase):
+
+    def test_rgrid2rcm_regional(self):
+        # a small curvilinear grid is interpolated from the part of fi
+        # around it, with the same values as from all of fi
+        lat1d = np.linspace(-60, 60, 61)
+        lon1d = np.linspace(0, 358, 180)
+        fi = np.random.RandomState(0).random_sample((2, 61, 180))
+        lat_r, lon_r = np.meshgrid(np.linspace(10, 20, 7),
+                                   np.linspace(100, 120, 9),
+                                   indexing="ij")
+        lat_r = lat_r + 0.5 * np.sin(lon_r)
+        fo = gn.rgrid2rcm(lat1d, lon1d, fi, lat_r, lon_r, engine="numpy")
+        nt.assert_array_equal(
+            fo,
+            gn.rgrid2rcm(lat1d[30:],
+                         lon1d,
+                         fi[..., 30:, :],
+                         lat_r,
+                         lon_r,
+                         engine="numpy"))
+
+
+class Test_rgrid2rcm_tiled(ut.TestCase):
+    lat1d = np.linspace(0, 40, 50)
+    lon1d = np.linspace(-140, -90, 60)
+    fi = np.random.RandomState(0).random_sample((2, 50, 60))
+    # a 20 degree rotated grid, partly outside of the source grid
+    y, x = np.meshgrid(np.arange(40) * 0.5, np.arange(45) * 0.5, indexing="ij")
+    lat2d = 10 + x * np.sin(np.deg2rad(20)) + y * np.cos(np.deg2rad(20))
+    lon2d = -120 + x * np.cos(np.deg2rad(20)) - y * np.sin(np.deg2rad(20))
+
+    def test_rgrid2rcm_spatial_chunks(self):
+        import dask.array as da
+
+        expected = gn.rgrid2rcm(self.lat1d,
+                                self.lon1d,
+                                self.fi,
+                                self.lat2d,
+                                self.lon2d,
+                                engine="numpy")
+        fo = gn.rgrid2rcm(self.lat1d,
+                          self.lon1d,
+                          da.from_array(self.fi, chunks=(1, 25, 20)),
+                          self.lat2d,
+                          self.lon2d,
+                          engine="numpy")
+        self.assertEqual(fo.data.chunks[-2:], ((20, 20), (15, 15, 15)))
+        nt.assert_array_equal(expected.values, fo.values)
+
+    def test_rgrid2rcm_out_chunks(self):
+        import dask.array as da
+
+        expected = gn.rgrid2rcm(self.lat1d,
+                                self.lon1d,
+                                self.fi,
+                                self.lat2d,
+                                self.lon2d,
+                                engine="numpy")
+        fo = gn.rgrid2rcm(self.lat1d,
+                          self.lon1d,
+                          da.from_array(self.fi),
+                          self.lat2d,
+                          self.lon2d,
+                          engine="numpy",
+                          out_chunks=(16, 45))
+        self.assertEqual(fo.data.chunks[-2:], ((16, 16, 8), (45,)))
+        nt.assert_array_equal(expected.values, fo.values)
+
+    def test_rgrid2rcm_target_mask(self):
+        import dask.array as da
+
+        expected = gn.rgrid2rcm(self.lat1d,
+                                self.lon1d,
+                                self.fi,
+                                self.lat2d,
+                                self.lon2d,
+                                engine="numpy").values
+        cells = np.array([5, 900, 17, 1799])
+        for fi in (self.fi, da.from_array(self.fi)):
+            fo = gn.rgrid2rcm(self.lat1d,
+                              self.lon1d,
+                              fi,
+                              self.lat2d,
+                              self.lon2d,
+                              engine="numpy",
+                              target_mask=cells).values
+            active = np.zeros(self.lat2d.size, dtype=bool)
+            active[cells] = True
+            active = active.reshape(self.lat2d.shape)
+            nt.assert_array_equal(fo[:, active], expected[:, active])
+            self.assertTrue(np.isnan(fo[:, ~active]).all())
+            fo = gn.rgrid2rcm(self.lat1d,
+                              self.lon1d,
+                              fi,
+                              self.lat2d,
+                              self.lon2d,
+                              engine="numpy",
+                              target_mask=cells,
+                              compact=True).values
+            nt.assert_array_equal(fo, expected.reshape(2, -1)[:, cells])
+
+    def test_rgrid2rcm_staging(self):
+        fi = np.moveaxis(self.fi, 0, -1).copy()
+        expected = gn.rgrid2rcm(self.lat1d,
+                                self.lon1d,
+                                self.fi,
+                                self.lat2d,
+                                self.lon2d,
+                                engine="numpy")
+        for staging in (None, False, self.fi[0].nbytes):
+            fo = gn.rgrid2rcm(self.lat1d,
+                              self.lon1d,
+                              np.moveaxis(fi, -1, 0),
+                              self.lat2d,
+                              self.lon2d,
+                              engine="numpy",
+                              staging=staging)
+            nt.assert_array_equal(expected.values, fo.values)
+        with self.assertRaises(ValueError):
+            gn.rgrid2rcm(self.lat1d,
+                         self.lon1d,
+                         self.fi,
+                         self.lat2d,
+                         self.lon2d,
+                         engine="numpy",
+                         staging=0)
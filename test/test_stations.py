@@ -0,0 +1,108 @@
+import numpy as np
+import xarray as xr
+import geocat.ncomp
+
+import unittest as ut
+
+rng = np.random.RandomState(0)
+
+yi = np.linspace(20, 50, num=31)
+xi = np.linspace(230, 290, num=61)
+lat2d, lon2d = np.meshgrid(yi, xi, indexing="ij")
+fi_np = rng.random_sample((3, yi.size, xi.size))
+fi_np[rng.random_sample(fi_np.shape) < 0.1] = np.nan
+fi_msg = np.where(np.isnan(fi_np), -99.0, fi_np)
+
+n = 50
+ids = ["S{:03d}".format(i) for i in range(n)]
+lat = rng.uniform(21, 49, n)
+lon = rng.uniform(231, 289, n)
+
+
+class Test_StationInterpolator(ut.TestCase):
+
+    def test_bilinear(self):
+        interp = geocat.ncomp.StationInterpolator(lat2d, lon2d, "bilinear")
+        interp.add(ids, lat, lon)
+        expected = geocat.ncomp.linint2_points(fi_np, lon, lat, 0, xi=xi, yi=yi)
+        fo = interp(fi_np)
+        self.assertEqual(ids, list(fo.station.values))
+        np.testing.assert_allclose(fo.values, expected.values, equal_nan=True)
+
+    def test_idw(self):
+        interp = geocat.ncomp.StationInterpolator(lat2d, lon2d)
+        interp.add(ids, lat, lon)
+        expected = geocat.ncomp.rcm2points(lat2d, lon2d, fi_np, lat, lon, 0)
+        np.testing.assert_allclose(interp(fi_np).values,
+                                   expected.values,
+                                   equal_nan=True)
+
+    def test_msg(self):
+        interp = geocat.ncomp.StationInterpolator(lat2d, lon2d)
+        interp.add(ids, lat, lon)
+        np.testing.assert_array_equal(
+            interp(fi_np).values,
+            interp(fi_msg, msg=-99.0).values)
+
+    def test_grid_point(self):
+        interp = geocat.ncomp.StationInterpolator(lat2d, lon2d)
+        interp.add(["A"], lat2d[5, 7], lon2d[5, 7] - 360)
+        fo = interp(fi_np).values[:, 0]
+        valid = ~np.isnan(fi_np[:, 5, 7])
+        np.testing.assert_allclose(fo[valid], fi_np[valid, 5, 7])
+        # a missing grid point is filled from the rest of the cell
+        self.assertFalse(np.isnan(fo).any())
+
+    def test_outside(self):
+        interp = geocat.ncomp.StationInterpolator(lat2d, lon2d)
+        interp.add(["A"], [60.0], [250.0])
+        self.assertTrue(np.isnan(interp(fi_np).values).all())
+
+    def test_add_remove(self):
+        interp = geocat.ncomp.StationInterpolator(lat2d, lon2d)
+        interp.add(ids, lat, lon)
+        expected = interp(fi_np)
+
+        interp.remove(ids[:10])
+        self.assertEqual(n - 10, len(interp))
+        self.assertNotIn(ids[0], interp)
+        np.testing.assert_array_equal(
+            interp(fi_np).values, expected.values[:, 10:])
+
+        interp.add(ids[:10], lat[:10], lon[:10])
+        fo = interp(fi_np)
+        self.assertEqual(ids[10:] + ids[:10], fo.station.values.tolist())
+        np.testing.assert_array_equal(
+            fo.sel(station=ids).values, expected.values)
+
+        with self.assertRaises(KeyError):
+            interp.remove(["not a station"])
+
+    def test_station_ids(self):
+        interp = geocat.ncomp.StationInterpolator(lat2d, lon2d)
+        interp.add([1, "A", (2, 3)], lat[:3], lon[:3])
+        self.assertEqual([1, "A", (2, 3)], interp.station_ids)
+        interp.remove(1)
+        interp.remove([(2, 3)])
+        self.assertEqual(["A"], interp.station_ids)
+        with self.assertRaises(TypeError):
+            interp.add([[4]], lat[:1], lon[:1])
+
+    def test_station_ids_dataarray(self):
+        data_vars = {"lat": ("station", lat), "lon": ("station", lon)}
+        stations = xr.Dataset(data_vars, coords={"id": ("station", ids)})
+        interp = geocat.ncomp.StationInterpolator(lat2d, lon2d)
+        interp.add(stations.id, stations.lat, stations.lon)
+        self.assertEqual(ids, interp.station_ids)
+        interp.remove(stations.id[:10])
+        interp.remove(stations.id[10])
+        self.assertEqual(ids[11:], interp.station_ids)
+
+    def test_dataarray(self):
+        interp = geocat.ncomp.StationInterpolator(xr.DataArray(lat2d),
+                                                  xr.DataArray(lon2d))
+        interp.add(ids, lat, lon)
+        fi = xr.DataArray(fi_np.astype(np.float32), dims=["time", "lat", "lon"])
+        fo = interp(fi)
+        self.assertEqual(("time", "station"), fo.dims)
+        self.assertEqual(np.float32, fo.dtype)
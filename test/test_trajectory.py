@@ -0,0 +1,159 @@
+import numpy as np
+import xarray as xr
+import geocat.ncomp
+
+import unittest as ut
+
+rng = np.random.RandomState(0)
+
+ti = np.arange(5) * 6.0
+xi = np.linspace(0, 350, num=36)
+yi = np.linspace(-85, 85, num=18)
+fi_np = rng.random_sample((ti.size, 2, yi.size, xi.size))
+fi_np[rng.random_sample(fi_np.shape) < 0.05] = np.nan
+
+n = 40
+xo = rng.uniform(-5, 360, n)
+yo = rng.uniform(-88, 88, n)
+to = rng.uniform(-1, 25, n)
+
+# curvilinear grid of the first 20 longitudes
+lat2d, lon2d = np.meshgrid(yi, xi[:20], indexing="ij")
+lat_pts = rng.uniform(-80, 80, n)
+lon_pts = rng.uniform(0, 180, n)
+
+
+def per_sample(interpolate, t):
+    """Interpolates each sample separately at the time levels around it and
+    then linearly in time, as the trajectory functions do at once."""
+    fo = np.full((fi_np.shape[1], t.size), np.nan)
+    for k in range(t.size):
+        if not ti[0] <= t[k] <= ti[-1]:
+            continue
+        i = min(int(t[k] // 6), ti.size - 2)
+        w = (t[k] - ti[i]) / 6
+        f0 = interpolate(fi_np[i], k)
+        f1 = interpolate(fi_np[i + 1], k)
+        fo[:, k] = f0 if w == 0 else f1 if w == 1 else (1 - w) * f0 + w * f1
+    return fo
+
+
+class Test_linint2_points_trajectory(ut.TestCase):
+
+    def interpolate(self, fi, k):
+        return geocat.ncomp.linint2_points(fi,
+                                           xo[k:k + 1],
+                                           yo[k:k + 1],
+                                           1,
+                                           xi=xi,
+                                           yi=yi).values[:, 0]
+
+    def test_linear(self):
+        fo = geocat.ncomp.linint2_points_trajectory(fi_np,
+                                                    to,
+                                                    xo,
+                                                    yo,
+                                                    1,
+                                                    ti=ti,
+                                                    xi=xi,
+                                                    yi=yi)
+        self.assertEqual((2, n), fo.shape)
+        np.testing.assert_allclose(fo.values,
+                                   per_sample(self.interpolate, to),
+                                   equal_nan=True)
+
+    def test_nearest(self):
+        fo = geocat.ncomp.linint2_points_trajectory(fi_np,
+                                                    to,
+                                                    xo,
+                                                    yo,
+                                                    1,
+                                                    ti=ti,
+                                                    xi=xi,
+                                                    yi=yi,
+                                                    time_interp="nearest")
+        t = np.where((to >= ti[0]) & (to <= ti[-1]), np.round(to / 6) * 6, to)
+        np.testing.assert_allclose(fo.values,
+                                   per_sample(self.interpolate, t),
+                                   equal_nan=True)
+
+    def test_dataarray_datetime(self):
+        time = np.datetime64("2000-01-01") + ti.astype("timedelta64[h]")
+        fi = xr.DataArray(fi_np,
+                          dims=["time", "level", "lat", "lon"],
+                          coords={
+                              "time": time,
+                              "lat": yi,
+                              "lon": xi
+                          })
+        minutes = np.round(to * 60)
+        t = np.datetime64("2000-01-01") + minutes.astype("timedelta64[m]")
+        fo = geocat.ncomp.linint2_points_trajectory(fi, t, xo, yo, 1)
+        np.testing.assert_allclose(fo.values,
+                                   per_sample(self.interpolate, minutes / 60),
+                                   equal_nan=True)
+
+    def test_engine(self):
+        fo = geocat.ncomp.linint2_points_trajectory(fi_np,
+                                                    to,
+                                                    xo,
+                                                    yo,
+                                                    1,
+                                                    ti=ti,
+                                                    xi=xi,
+                                                    yi=yi,
+                                                    engine="numpy")
+        np.testing.assert_allclose(fo.values,
+                                   per_sample(self.interpolate, to),
+                                   equal_nan=True)
+
+    def test_coordinates_required(self):
+        with self.assertRaises(geocat.ncomp.CoordinateError):
+            geocat.ncomp.linint2_points_trajectory(fi_np, to, xo, yo, 1)
+
+
+class Test_rcm2points_trajectory(ut.TestCase):
+
+    def interpolate(self, fi, k):
+        return geocat.ncomp.rcm2points(lat2d, lon2d, fi[..., :20],
+                                       lat_pts[k:k + 1],
+                                       lon_pts[k:k + 1]).values[:, 0]
+
+    def test_linear(self):
+        fo = geocat.ncomp.rcm2points_trajectory(lat2d,
+                                                lon2d,
+                                                fi_np[..., :20],
+                                                to,
+                                                lat_pts,
+                                                lon_pts,
+                                                ti=ti)
+        self.assertEqual((2, n), fo.shape)
+        np.testing.assert_allclose(fo.values,
+                                   per_sample(self.interpolate, to),
+                                   equal_nan=True)
+
+    def test_single_kernel_call(self):
+        from geocat.ncomp import engine
+
+        calls = []
+
+        def kernel(*args):
+            calls.append(args)
+            return engine.get_kernel("rcm2points")(*args)
+
+        engine.register_engine("rcm2points", "test", kernel)
+        try:
+            fo = geocat.ncomp.rcm2points_trajectory(lat2d,
+                                                    lon2d,
+                                                    fi_np[..., :20],
+                                                    to,
+                                                    lat_pts,
+                                                    lon_pts,
+                                                    ti=ti,
+                                                    engine="test")
+        finally:
+            del engine._kernels["rcm2points"]["test"]
+        self.assertEqual(1, len(calls))
+        np.testing.assert_allclose(fo.values,
+                                   per_sample(self.interpolate, to),
+                                   equal_nan=True)